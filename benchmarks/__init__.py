@@ -0,0 +1,322 @@
+'''
+The Benchmarks Module
+
+Runs the complete pipeline (compile -> build_cfg -> the CFG analysis -> each analysis
+of every function) over the benchmark cases, usually generated by the SolidityGenerator,
+and records the wall-clock time, the CPU time and the peak memory of every phase into a
+machine-readable results file, which can be compared against a stored baseline.
+
+The timings are taken over untraced runs (the minimum over the repeats), and the peak
+memory over a separate run with tracemalloc enabled, as tracing slows down the
+allocations and would skew the timings.
+'''
+import os
+import json
+import time
+import platform
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from compiler import SolCompiler
+from control_flow_graph import ControlFlowGraph
+from instrumentation.metrics import metrics
+
+# the version of the results file format
+RESULTS_FORMAT = 1
+
+# the analyses run by default (the abstract collecting semantics also needs the APRON jars)
+DEFAULT_ANALYSES = ('collecting_semantics', 'sparse_interval')
+
+
+def run_collecting_semantics(cfg: ControlFlowGraph, starting_node: str, ending_node: str, runner) -> None:
+    from static_analysis.collecting_semantics import CollectingSemanticsAnalysis
+
+    CollectingSemanticsAnalysis(cfg, starting_node, ending_node).compute()
+
+
+def run_abstract_collecting_semantics(cfg: ControlFlowGraph, starting_node: str, ending_node: str, runner) -> None:
+    # imported lazily, as it needs jpype
+    from java_wrapper import start_jvm
+    from static_analysis.abstract_collecting_semantics import AbstractCollectingSemanticsAnalysis
+
+    # (the JVM is started once, the class path of the later runs is ignored)
+    if runner.apron_class_path is not None:
+        start_jvm(runner.apron_class_path.split(os.pathsep))
+
+    AbstractCollectingSemanticsAnalysis(cfg, starting_node, ending_node, None).compute()
+
+
+def run_sparse_interval(cfg: ControlFlowGraph, starting_node: str, ending_node: str, runner) -> None:
+    from static_analysis.sparse_interval import SparseIntervalAnalysis
+
+    SparseIntervalAnalysis(cfg, starting_node, ending_node).compute()
+
+
+def run_ssa(cfg: ControlFlowGraph, starting_node: str, ending_node: str, runner) -> None:
+    from static_analysis.ssa import SSAForm
+
+    SSAForm(cfg, starting_node, ending_node).build()
+
+
+def run_live_variables(cfg: ControlFlowGraph, starting_node: str, ending_node: str, runner) -> None:
+    from static_analysis.dataflow_analysis.live_variables import LiveVariablesAnalysis
+
+    LiveVariablesAnalysis(cfg, starting_node, ending_node).compute()
+
+
+# mapping of the analysis name to the function running it over a function's CFG
+ANALYSES = {
+    'collecting_semantics': run_collecting_semantics,
+    'abstract_collecting_semantics': run_abstract_collecting_semantics,
+    'sparse_interval': run_sparse_interval,
+    'ssa': run_ssa,
+    'live_variables': run_live_variables
+}
+
+
+class BenchmarkRunner(object):
+    '''
+    Class running the benchmark cases and collecting the results
+    '''
+
+    def __init__(self, analyses: Iterable[str] = DEFAULT_ANALYSES, repeat=1, trace_memory=True,
+                 apron_class_path: str = None):
+        '''
+        Constructor
+        '''
+
+        for analysis in analyses:
+            if analysis not in ANALYSES:
+                raise Exception(f'Unknown analysis {analysis}!')
+
+        self.analyses = list(analyses)
+
+        # the number of timed runs of every case (the minimum is kept)
+        self.repeat = repeat
+
+        # if enabled, an additional traced run records the peak memory of the phases
+        self.trace_memory = trace_memory
+
+        # the class path of the APRON jars (for the abstract collecting semantics), as a list
+        # of jars separated by os.pathsep (SAFPY_APRON_CLASSPATH or the default ones, if not given)
+        self.apron_class_path = apron_class_path
+
+        # mapping of the case name to its results
+        self.cases = dict()
+
+    def run_case(self, name: str, source: str, ast: dict = None, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        '''
+        Run a benchmark case, from its source (or from its precompiled AST, skipping the compile phase)
+        '''
+
+        phases = dict()
+
+        for _ in range(self.repeat):
+            metrics.reset()
+            run_phases, size = self.__run(source, ast, False)
+
+            for phase, (wall_time, cpu_time, _) in run_phases.items():
+                best = phases.setdefault(
+                    phase, {'wall': wall_time, 'cpu': cpu_time, 'peak_memory': None})
+                best['wall'] = min(best['wall'], wall_time)
+                best['cpu'] = min(best['cpu'], cpu_time)
+
+        case_metrics = metrics.to_dict()
+
+        if self.trace_memory:
+            run_phases, _ = self.__run(source, ast, True)
+            for phase, (_, _, peak_memory) in run_phases.items():
+                phases[phase]['peak_memory'] = peak_memory
+
+        self.cases[name] = {
+            'params': params or dict(),
+            'size': size,
+            'phases': phases,
+            'metrics': case_metrics
+        }
+
+        return self.cases[name]
+
+    def run(self, cases: Iterable[Tuple[str, str, Dict[str, Any]]]) -> Dict[str, Any]:
+        '''
+        Run the (name, source, params) benchmark cases, and get the results
+        '''
+
+        for name, source, params in cases:
+            self.run_case(name, source, params=params)
+
+        return self.get_results()
+
+    def get_results(self) -> Dict[str, Any]:
+        '''
+        Get the results of the cases run so far, along with the environment they were run in
+        '''
+
+        return {
+            'format': RESULTS_FORMAT,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'analyses': self.analyses,
+            'repeat': self.repeat,
+            'cases': self.cases
+        }
+
+    def __run(self, source: str, ast: dict, trace_memory: bool) -> Tuple[Dict[str, Tuple[float, float, int]], Dict[str, int]]:
+        '''
+        Run the phases of a case once, and get their (wall time, cpu time, peak memory)
+        along with the size of the CFG
+        '''
+
+        phases = dict()
+        started_tracing = False
+
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+
+        try:
+            if ast is None:
+                ast = self.__measure(phases, 'compile', trace_memory,
+                                     lambda: self.__compile(source))
+
+            cfg = ControlFlowGraph(source, ast)
+            self.__measure(phases, 'cfg.build', trace_memory, cfg.build_cfg)
+
+            functions = self.__get_functions(cfg)
+
+            self.__measure(phases, 'cfg.analysis', trace_memory,
+                           lambda: [cfg.get_analysis(entry, exit) for entry, exit in functions])
+
+            for analysis in self.analyses:
+                run_analysis = ANALYSES[analysis]
+                self.__measure(phases, f'analysis.{analysis}', trace_memory,
+                               lambda: [run_analysis(cfg, entry, exit, self) for entry, exit in functions])
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        size = {
+            'functions': len(functions),
+            'nodes': len(cfg.cfg_metadata.node_table),
+            'edges': sum(len(node.next_nodes) for node in cfg.cfg_metadata.node_table.values())
+        }
+
+        return phases, size
+
+    @staticmethod
+    def __measure(phases: Dict[str, Tuple[float, float, int]], phase: str, trace_memory: bool,
+                  function: Callable[[], Any]) -> Any:
+        '''
+        Run a phase, and record its wall time, cpu time and peak memory (if traced)
+        '''
+
+        if trace_memory:
+            tracemalloc.reset_peak()
+            base_memory = tracemalloc.get_traced_memory()[0]
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        result = function()
+
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+
+        peak_memory = tracemalloc.get_traced_memory()[1] - base_memory if trace_memory \
+            else None
+
+        phases[phase] = (wall_time, cpu_time, peak_memory)
+
+        return result
+
+    @staticmethod
+    def __compile(source: str) -> dict:
+        '''
+        Compile the source and get the AST of the source unit
+        '''
+
+        output = SolCompiler(source).compile()
+
+        return output.get_ast(output.get_contracts_list()[0])
+
+    @staticmethod
+    def __get_functions(cfg: ControlFlowGraph) -> List[Tuple[str, str]]:
+        '''
+        Get the (entry, exit) node ids of the functions of the CFG
+        (the entry and exit nodes of a function are created in pairs, hence share the suffix)
+        '''
+
+        functions = list()
+        for node_id in cfg.cfg_metadata.node_table:
+            if node_id.startswith('FunctionEntry_'):
+                functions.append(
+                    (node_id, 'FunctionExit_' + node_id[len('FunctionEntry_'):]))
+
+        return functions
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    '''
+    Save the results of a benchmark run
+    '''
+
+    with open(path, 'w', encoding='utf8') as f:
+        json.dump(results, f, indent=4, sort_keys=True)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    '''
+    Load the results of a benchmark run (e.g., the baseline)
+    '''
+
+    with open(path, 'r', encoding='utf8') as f:
+        results = json.load(f)
+
+    if results.get('format', None) != RESULTS_FORMAT:
+        raise Exception(
+            f'Unsupported benchmark results format {results.get("format", None)}!')
+
+    return results
+
+
+def compare_results(results: Dict[str, Any], baseline: Dict[str, Any], tolerance=0.2,
+                    min_time=0.005) -> List[Dict[str, Any]]:
+    '''
+    Compare the results against a baseline, and get the regressions, i.e., the phases
+    of the cases in both runs, whose wall time or peak memory grew by more than the tolerance
+    (the phases faster than min_time seconds in the baseline are too noisy to compare)
+    '''
+
+    regressions = list()
+
+    for name, case in results['cases'].items():
+        baseline_case = baseline['cases'].get(name, None)
+        if baseline_case is None:
+            continue
+
+        for phase, values in case['phases'].items():
+            baseline_values = baseline_case['phases'].get(phase, None)
+            if baseline_values is None:
+                continue
+
+            for metric in ('wall', 'peak_memory'):
+                current, previous = values.get(
+                    metric, None), baseline_values.get(metric, None)
+
+                if current is None or previous is None or previous <= 0:
+                    continue
+                if metric == 'wall' and previous < min_time:
+                    continue
+
+                if current > previous * (1 + tolerance):
+                    regressions.append({
+                        'case': name,
+                        'phase': phase,
+                        'metric': metric,
+                        'baseline': previous,
+                        'current': current,
+                        'ratio': current / previous
+                    })
+
+    return regressions
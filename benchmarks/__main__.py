@@ -0,0 +1,75 @@
+'''
+Run the benchmark suite
+
+    python -m benchmarks --output results.json [--baseline baseline.json]
+
+exits with status 1 if any phase regressed against the baseline.
+'''
+import sys
+import argparse
+from benchmarks import BenchmarkRunner, DEFAULT_ANALYSES, ANALYSES, save_results, load_results, compare_results
+from benchmarks.generator import SolidityGenerator
+
+# the default suite: (name, generator parameters)
+SUITE = [
+    ('straight-line', dict(statements=50, nesting_depth=0, fan_out=1)),
+    ('branches', dict(statements=50, nesting_depth=0, fan_out=4)),
+    ('loops', dict(statements=50, nesting_depth=1, fan_out=2)),
+    ('nested-loops', dict(statements=50, nesting_depth=3, fan_out=2)),
+    ('many-functions', dict(functions=20, statements=20, nesting_depth=1, fan_out=2)),
+    ('many-variables', dict(statements=50, nesting_depth=1, fan_out=2, variables=16))
+]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Run the safpy benchmark suite')
+    parser.add_argument('--output', default='benchmark-results.json',
+                        help='the results file to write')
+    parser.add_argument('--baseline', default=None,
+                        help='the results file to compare against')
+    parser.add_argument('--analyses', nargs='+', default=list(DEFAULT_ANALYSES),
+                        choices=sorted(ANALYSES.keys()))
+    parser.add_argument('--cases', nargs='+', default=None,
+                        help='the cases of the suite to run (all, if not specified)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='the relative growth tolerated before a phase is a regression')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the traced run measuring the peak memory')
+    parser.add_argument('--apron-class-path', default=None,
+                        help='the APRON jars, separated by the path separator (see java_wrapper)')
+    args = parser.parse_args(argv)
+
+    runner = BenchmarkRunner(args.analyses, args.repeat, not args.no_memory,
+                             args.apron_class_path)
+
+    for name, params in SUITE:
+        if args.cases is not None and name not in args.cases:
+            continue
+
+        generator = SolidityGenerator(**params)
+        case = runner.run_case(name, generator.generate(),
+                               params=generator.get_params())
+
+        print(f'{name}: ' + ', '.join(f'{phase} {values["wall"]:.3f}s'
+                                      for phase, values in case['phases'].items()))
+
+    results = runner.get_results()
+    save_results(results, args.output)
+
+    if args.baseline is None:
+        return 0
+
+    regressions = compare_results(
+        results, load_results(args.baseline), args.tolerance)
+
+    for regression in regressions:
+        print('REGRESSION {case} {phase} {metric}: {baseline} -> {current} ({ratio:.2f}x)'.format(
+            **regression))
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
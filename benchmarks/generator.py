@@ -0,0 +1,193 @@
+'''
+The Synthetic Solidity Program Generator
+
+Generates parameterized Solidity sources for the benchmarks: a single contract with a
+given number of functions, each with a statement budget filled by a repeating pattern of
+nested loops, if / else chains and plain assignments over a set of integer variables.
+The shape of the program is fully determined by the parameters (the seed only picks the
+operands, operators and constants), so that the sources of a scaling series only differ
+in the varied parameter. All the loops are bounded by constants, hence every generated
+program terminates, and the concrete collecting semantics reaches its fixed point.
+'''
+import random
+from typing import Any, Dict, List, Tuple
+
+
+class SolidityGenerator(object):
+    '''
+    Class generating synthetic Solidity programs
+    '''
+
+    # the operators of the generated assignments (no division, to never divide by zero)
+    OPERATORS = ('+', '-', '*')
+
+    # the operators of the generated branch conditions
+    COMPARATORS = ('<', '<=', '>', '>=', '==', '!=')
+
+    def __init__(self, functions=1, statements=10, nesting_depth=1, fan_out=2, variables=4,
+                 constant_range: Tuple[int, int] = (0, 10), loop_bound=3, seed=0,
+                 pragma='^0.4.24'):
+        '''
+        Constructor
+        '''
+
+        if nesting_depth < 0 or fan_out < 1 or variables < 1 or statements < 1:
+            raise Exception(
+                'The statements, fan-out and variables must be positive and the nesting depth non-negative!')
+
+        if constant_range[0] > constant_range[1]:
+            raise Exception(f'Invalid constant range {constant_range}!')
+
+        # the number of functions, and the number of statements in each of them
+        self.functions = functions
+        self.statements = statements
+
+        # the depth of the loop nests, and the number of branches of the if / else chains
+        self.nesting_depth = nesting_depth
+        self.fan_out = fan_out
+
+        # the number of integer variables of each function,
+        # and the range of the constants (initial values, operands and conditions)
+        self.variables = variables
+        self.constant_range = constant_range
+
+        # the number of iterations of every loop
+        self.loop_bound = loop_bound
+
+        self.seed = seed
+        self.pragma = pragma
+
+    def get_params(self) -> Dict[str, Any]:
+        '''
+        Get the parameters of the generator (e.g., to record along with the benchmark results)
+        '''
+
+        return {
+            'functions': self.functions,
+            'statements': self.statements,
+            'nesting_depth': self.nesting_depth,
+            'fan_out': self.fan_out,
+            'variables': self.variables,
+            'constant_range': list(self.constant_range),
+            'loop_bound': self.loop_bound,
+            'seed': self.seed
+        }
+
+    def generate(self) -> str:
+        '''
+        Generate the source of the program
+        '''
+
+        rng = random.Random(self.seed)
+
+        lines = [f'pragma solidity {self.pragma};', '', 'contract Benchmark {']
+        for i in range(self.functions):
+            if i > 0:
+                lines.append('')
+            lines.extend(self.__generate_function(f'f{i}', rng))
+        lines.append('}')
+
+        return '\n'.join(lines) + '\n'
+
+    def __generate_function(self, name: str, rng: random.Random) -> List[str]:
+        '''
+        Generate a function: the variable declarations followed by
+        the pattern of loops, branches and assignments, till the statement budget is used
+        '''
+
+        lines = [f'    function {name}() public {{']
+        indent = ' ' * 8
+
+        # the variables and the loop counters (one per nesting level)
+        for i in range(self.variables):
+            lines.append(f'{indent}int v{i} = {self.__get_constant(rng)};')
+        for depth in range(self.nesting_depth):
+            lines.append(f'{indent}int i{depth} = 0;')
+
+        budget = [self.statements]
+        kinds = ('loop', 'branch', 'assign') if self.nesting_depth > 0 else (
+            'branch', 'assign')
+
+        unit = 0
+        while budget[0] > 0:
+            kind = kinds[unit % len(kinds)]
+            unit += 1
+
+            if kind == 'loop':
+                lines.extend(self.__generate_loop(0, indent, rng, budget))
+            elif kind == 'branch':
+                lines.extend(self.__generate_branch(
+                    0, indent, rng, budget))
+            else:
+                lines.append(indent + self.__generate_assignment(rng, budget))
+
+        lines.append('    }')
+
+        return lines
+
+    def __generate_loop(self, depth: int, indent: str, rng: random.Random, budget: List[int]) -> List[str]:
+        '''
+        Generate a loop nest from the given depth, the innermost loop
+        holding an assignment (the counters are reset before every inner loop)
+        '''
+
+        counter = f'i{depth}'
+        lines = [f'{indent}{counter} = 0;',
+                 f'{indent}while ({counter} < {self.loop_bound}) {{']
+        budget[0] -= 1
+
+        inner_indent = indent + ' ' * 4
+        if depth + 1 < self.nesting_depth:
+            lines.extend(self.__generate_loop(
+                depth + 1, inner_indent, rng, budget))
+        else:
+            lines.append(inner_indent +
+                         self.__generate_assignment(rng, budget))
+
+        lines.append(f'{inner_indent}{counter} = {counter} + 1;')
+        lines.append(f'{indent}}}')
+        budget[0] -= 1
+
+        return lines
+
+    def __generate_branch(self, branch: int, indent: str, rng: random.Random, budget: List[int]) -> List[str]:
+        '''
+        Generate an if / else chain of fan-out branches (nested in the else blocks),
+        each holding an assignment
+        '''
+
+        inner_indent = indent + ' ' * 4
+
+        # the last branch of the chain is a plain block
+        if branch == self.fan_out - 1:
+            return [inner_indent + self.__generate_assignment(rng, budget)] if branch > 0 \
+                else [indent + self.__generate_assignment(rng, budget)]
+
+        variable = f'v{rng.randrange(self.variables)}'
+        condition = f'{variable} {rng.choice(SolidityGenerator.COMPARATORS)} {self.__get_constant(rng)}'
+
+        prefix = inner_indent if branch > 0 else indent
+        lines = [f'{prefix}if ({condition}) {{',
+                 f'{prefix}    {self.__generate_assignment(rng, budget)}',
+                 f'{prefix}}} else {{']
+        lines.extend(self.__generate_branch(
+            branch + 1, prefix, rng, budget))
+        lines.append(f'{prefix}}}')
+
+        return lines
+
+    def __generate_assignment(self, rng: random.Random, budget: List[int]) -> str:
+        '''
+        Generate an assignment of a binary operation over a variable and a constant
+        '''
+
+        budget[0] -= 1
+
+        target = f'v{rng.randrange(self.variables)}'
+        operand = f'v{rng.randrange(self.variables)}'
+        operator = rng.choice(SolidityGenerator.OPERATORS)
+
+        return f'{target} = {operand} {operator} {self.__get_constant(rng)};'
+
+    def __get_constant(self, rng: random.Random) -> int:
+        return rng.randint(*self.constant_range)
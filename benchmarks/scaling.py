@@ -0,0 +1,202 @@
+'''
+The Scaling Harness
+
+Runs the pipeline stages over geometrically growing generated inputs (a series varies one
+parameter of the SolidityGenerator, e.g., the statements from 10 to 10,000, or the loop
+nesting depth from 1 to 8), fits the empirical complexity of every stage as the exponent
+of the log-log least squares line of its wall time against the varied parameter, and
+checks the exponent and the wall time of the largest input against the configured bounds,
+so that a stage turning quadratic (or slower) fails the run.
+
+    python -m benchmarks.scaling [--series statements nesting] [--output scaling.json]
+
+exits with status 1 if any bound is violated.
+'''
+import sys
+import math
+import json
+import argparse
+from typing import Any, Dict, Iterable, List, Tuple
+from benchmarks import BenchmarkRunner
+from benchmarks.generator import SolidityGenerator
+
+
+class ScalingSeries(object):
+    '''
+    Class representing a series of inputs, varying a parameter of the generator
+    '''
+
+    def __init__(self, name: str, parameter: str, values: List[int], params: Dict[str, Any] = None,
+                 bounds: Dict[str, Tuple[float, float]] = None):
+        '''
+        Constructor
+        '''
+
+        self.name = name
+
+        # the varied parameter of the generator, its values, and the fixed parameters
+        self.parameter = parameter
+        self.values = values
+        self.params = params or dict()
+
+        # mapping of the stage to its (maximum exponent, wall time budget of the largest input)
+        self.bounds = bounds or dict()
+
+    def get_generators(self) -> Iterable[Tuple[int, SolidityGenerator]]:
+        '''
+        Get the generators of the inputs of the series
+        '''
+
+        for value in self.values:
+            yield value, SolidityGenerator(**dict(self.params, **{self.parameter: value}))
+
+
+# the default series (the concrete collecting semantics is only bounded on the statements,
+# as its cost is exponential in the nesting depth by design: the loop bound to the power of the depth)
+SERIES = {
+    'statements': ScalingSeries('statements', 'statements', [10, 32, 100, 316, 1000, 3162, 10000],
+                                dict(nesting_depth=1, fan_out=2), {
+                                    'cfg.build': (1.3, 10.0),
+                                    'cfg.analysis': (1.3, 10.0),
+                                    'analysis.sparse_interval': (1.5, 30.0),
+                                    'analysis.collecting_semantics': (1.5, 60.0)
+                                }),
+    'nesting': ScalingSeries('nesting', 'nesting_depth', [1, 2, 4, 8],
+                             dict(statements=64, fan_out=2, loop_bound=2), {
+                                 'cfg.build': (1.5, 1.0),
+                                 'cfg.analysis': (1.5, 1.0),
+                                 'analysis.sparse_interval': (1.5, 5.0)
+                             })
+}
+
+
+def fit_exponent(points: List[Tuple[float, float]]) -> float:
+    '''
+    Fit the exponent k of time ~ c * size^k, as the slope of
+    the least squares line through the (log size, log time) points
+    '''
+
+    if len(points) < 2:
+        raise Exception('At least two points are needed to fit the exponent!')
+
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(time) for _, time in points]
+
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        raise Exception('The sizes of the points must differ to fit the exponent!')
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+class ScalingHarness(object):
+    '''
+    Class running the scaling series and checking their bounds
+    '''
+
+    def __init__(self, analyses: Iterable[str] = ('collecting_semantics', 'sparse_interval'), repeat=1,
+                 min_time=0.001):
+        '''
+        Constructor
+        '''
+
+        self.runner = BenchmarkRunner(analyses, repeat, trace_memory=False)
+
+        # the points faster than this (seconds) are dominated by noise, hence not fitted
+        self.min_time = min_time
+
+    def run_series(self, series: ScalingSeries) -> Dict[str, List[Tuple[int, float]]]:
+        '''
+        Run a series, and get the (parameter value, wall time) points of every stage
+        '''
+
+        points = dict()
+
+        for value, generator in series.get_generators():
+            case = self.runner.run_case(f'{series.name}-{value}', generator.generate(),
+                                        params=generator.get_params())
+
+            for stage, values in case['phases'].items():
+                points.setdefault(stage, list()).append((value, values['wall']))
+
+        return points
+
+    def check_series(self, series: ScalingSeries, points: Dict[str, List[Tuple[int, float]]]) -> Dict[str, Dict[str, Any]]:
+        '''
+        Fit the exponent of every stage of a series, and check it along with
+        the wall time of the largest input against the bounds of the stage
+        '''
+
+        report = dict()
+
+        for stage, stage_points in points.items():
+            fitted = [(size, time) for size, time in stage_points
+                      if time >= self.min_time]
+            exponent = fit_exponent(fitted) if len(fitted) >= 3 else None
+            largest_time = stage_points[-1][1]
+
+            violations = list()
+            if stage in series.bounds:
+                max_exponent, budget = series.bounds[stage]
+
+                if exponent is not None and exponent > max_exponent:
+                    violations.append(
+                        f'exponent {exponent:.2f} > {max_exponent}')
+                if largest_time > budget:
+                    violations.append(
+                        f'time {largest_time:.3f}s > {budget}s at {series.parameter}={stage_points[-1][0]}')
+
+            report[stage] = {
+                'points': stage_points,
+                'exponent': exponent,
+                'bounds': series.bounds.get(stage, None),
+                'violations': violations
+            }
+
+        return report
+
+    def run(self, series_list: Iterable[ScalingSeries]) -> Dict[str, Dict[str, Any]]:
+        '''
+        Run and check the series
+        '''
+
+        return {series.name: self.check_series(series, self.run_series(series))
+                for series in series_list}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.scaling',
+                                     description='Check the empirical complexity of the safpy pipeline stages')
+    parser.add_argument('--series', nargs='+', default=list(SERIES.keys()),
+                        choices=sorted(SERIES.keys()))
+    parser.add_argument('--analyses', nargs='+',
+                        default=['collecting_semantics', 'sparse_interval'])
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--output', default=None,
+                        help='the file to write the report to (JSON)')
+    args = parser.parse_args(argv)
+
+    harness = ScalingHarness(args.analyses, args.repeat)
+    report = harness.run(SERIES[name] for name in args.series)
+
+    failed = False
+    for series_name, stages in report.items():
+        for stage, result in stages.items():
+            exponent = 'n/a' if result['exponent'] is None else f'{result["exponent"]:.2f}'
+            status = ('FAIL ' + '; '.join(result['violations'])
+                      ) if result['violations'] else 'ok'
+            print(f'{series_name} {stage}: exponent {exponent} {status}')
+            failed = failed or bool(result['violations'])
+
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf8') as f:
+            json.dump(report, f, indent=4)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
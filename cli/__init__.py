@@ -0,0 +1,774 @@
+'''
+The Corpus Driver
+
+Runs compile -> CFG -> the selected analyses over every function of a corpus of
+Solidity sources (files, directories, globs, JSONL manifests or the source units of
+a project compiled at once), in a process pool (or in a thread pool sharing a single JVM),
+and streams one JSON result per function (as a JSONL line) as soon as its source
+is analysed. A partial output can be resumed: the sources whose results are all
+in the output are skipped, and the results of the partially written ones are dropped.
+'''
+import os
+import sys
+import glob
+import json
+import time
+import hashlib
+from fractions import Fraction
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, TextIO, Tuple
+from control_flow_graph import ControlFlowGraph
+
+# the extension of the Solidity sources collected from the directories
+SOURCE_EXTENSION = '.sol'
+
+# the options the results of an analysis depend on (part of the keys of the stored results)
+RESULT_OPTIONS = ('constants', 'budget', 'accelerate_loops')
+
+
+def run_collecting_semantics(cfg: ControlFlowGraph, starting_node: str, ending_node: str,
+                             options: Dict[str, Any]) -> Dict[str, Any]:
+    from static_analysis.collecting_semantics import CollectingSemanticsAnalysis
+
+    # under a budget, the analysis degrades along the ladder (and is flagged as degraded)
+    if options.get('budget', None):
+        return run_budgeted_analysis(cfg, starting_node, ending_node, 'collecting_semantics', options)
+
+    checkpointer = get_checkpointer(
+        cfg, starting_node, 'collecting_semantics', options)
+
+    analysis = CollectingSemanticsAnalysis(
+        cfg, starting_node, ending_node, profiler=get_profiler(options), checkpointer=checkpointer,
+        accelerate_loops=options.get('accelerate_loops', False))
+    register_constants(analysis.constant_registry, options, 'collecting_semantics')
+    analysis.compute()
+
+    return analysis.point_state.export_results()
+
+
+def run_abstract_collecting_semantics(cfg: ControlFlowGraph, starting_node: str, ending_node: str,
+                                      options: Dict[str, Any]) -> Dict[str, Any]:
+    # imported lazily, as it needs jpype (the JVM itself is only started by the first APRON call)
+    from static_analysis.abstract_collecting_semantics import AbstractCollectingSemanticsAnalysis
+
+    if options.get('budget', None):
+        return run_budgeted_analysis(cfg, starting_node, ending_node, 'abstract_collecting_semantics', options)
+
+    checkpointer = get_checkpointer(
+        cfg, starting_node, 'abstract_collecting_semantics', options)
+
+    analysis = AbstractCollectingSemanticsAnalysis(cfg, starting_node, ending_node, None,
+                                                   profiler=get_profiler(options), checkpointer=checkpointer,
+                                                   accelerate_loops=options.get('accelerate_loops', False))
+    register_constants(analysis.constant_registry, options, 'abstract_collecting_semantics')
+    analysis.compute()
+
+    return analysis.point_state.export_results()
+
+
+def run_budgeted_analysis(cfg: ControlFlowGraph, starting_node: str, ending_node: str, analysis: str,
+                          options: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    Run the (concrete or abstract) collecting semantics under the budget of the options, degrading along
+    its ladder (see static_analysis.degradation), with the memory profiler and the loop acceleration
+    (the checkpoints are not taken, as every level would resume from the checkpoints of the previous one)
+    '''
+
+    from static_analysis.budget import AnalysisBudget
+    from static_analysis.degradation import ABSTRACT_LEVELS, LEVELS, BudgetedAnalysis
+
+    if options.get('checkpoint_dir', None) is not None:
+        raise Exception('The checkpoints are not taken under a budget!')
+
+    levels = ABSTRACT_LEVELS if analysis == 'abstract_collecting_semantics' else LEVELS
+    budgeted_analysis = BudgetedAnalysis(cfg, starting_node, ending_node, AnalysisBudget(**options['budget']),
+                                         get_constants(options, analysis), levels,
+                                         {'profiler': get_profiler(options),
+                                          'accelerate_loops': options.get('accelerate_loops', False)})
+    budgeted_analysis.compute()
+
+    return budgeted_analysis.export_results()
+
+
+def run_sparse_interval(cfg: ControlFlowGraph, starting_node: str, ending_node: str,
+                        options: Dict[str, Any]) -> Dict[str, Any]:
+    from static_analysis.sparse_interval import SparseIntervalAnalysis
+
+    analysis = SparseIntervalAnalysis(cfg, starting_node, ending_node)
+    register_constants(analysis.constant_registry, options, 'sparse_interval')
+    analysis.compute()
+
+    return analysis.get_results()
+
+
+def run_live_variables(cfg: ControlFlowGraph, starting_node: str, ending_node: str,
+                       options: Dict[str, Any]) -> Dict[str, Any]:
+    from static_analysis.dataflow_analysis.live_variables import LiveVariablesAnalysis
+
+    analysis = LiveVariablesAnalysis(cfg, starting_node, ending_node)
+    analysis.compute()
+
+    return analysis.get_results()
+
+
+# mapping of the analysis name to the function running it over a function's CFG
+ANALYSES = {
+    'collecting_semantics': run_collecting_semantics,
+    'abstract_collecting_semantics': run_abstract_collecting_semantics,
+    'sparse_interval': run_sparse_interval,
+    'live_variables': run_live_variables
+}
+
+
+def get_checkpointer(cfg: ControlFlowGraph, starting_node: str, analysis: str, options: Dict[str, Any]) -> Any:
+    '''
+    Get the checkpointer of the analysis of a function (None, if the checkpoints are not enabled),
+    its file being named after the AST, the function, the analysis and the constants,
+    so that the rerun of a preempted analysis resumes from its checkpoint
+    '''
+
+    directory = options.get('checkpoint_dir', None)
+    if directory is None:
+        return None
+
+    from storage import get_ast_hash
+    from static_analysis.checkpoint import Checkpointer
+
+    os.makedirs(directory, exist_ok=True)
+
+    constants = json.dumps(options.get('constants', dict()), sort_keys=True, default=str)
+    # (the summaries of the accelerated loops change the intermediate states, hence their own checkpoints)
+    if options.get('accelerate_loops', False):
+        analysis = f'{analysis}+accelerated'
+    key = hashlib.sha256(
+        f'{get_ast_hash(cfg.ast)}|{starting_node}|{analysis}|{constants}'.encode('utf8')).hexdigest()
+
+    return Checkpointer(os.path.join(directory, f'{key}.ckpt'), options.get('checkpoint_interval', 60.0))
+
+
+def get_store(options: Dict[str, Any]) -> Any:
+    '''
+    Get the store of the CFGs and the analysis results (None, if not enabled),
+    opened by every caller, as the SQLite connections are not shared across threads
+    '''
+
+    path = options.get('store', None)
+    if path is None:
+        return None
+
+    from storage import ResultStore
+
+    return ResultStore(path, options.get('store_backend', 'directory'))
+
+
+def run_stored_analysis(cfg: ControlFlowGraph, starting_node: str, ending_node: str, function_key: str,
+                        analysis: str, options: Dict[str, Any], store: Any = None, builder: Any = None) -> Any:
+    '''
+    Run an analysis of a function, returning its (JSON) results, reused from the store
+    if stored for the same AST, function and options, and stored otherwise.
+    With the incremental CFG builder of the source, the results of the previous version
+    of the source are reused if the function is unchanged.
+    '''
+
+    if store is None:
+        return to_json(ANALYSES[analysis](cfg, starting_node, ending_node, options))
+
+    config = {'function': function_key,
+              'options': {name: options.get(name, None) for name in RESULT_OPTIONS}}
+
+    def compute(cfg: ControlFlowGraph, starting_node: str, ending_node: str) -> Any:
+        results = store.load_results(cfg.ast, analysis, config)
+        if results is None:
+            results = to_json(ANALYSES[analysis](cfg, starting_node, ending_node, options))
+            store.save_results(cfg.ast, analysis, config, results)
+
+        return results
+
+    if builder is None:
+        return compute(cfg, starting_node, ending_node)
+
+    name = json.dumps([analysis, config['options']], sort_keys=True, default=str)
+
+    return builder.get_result(function_key, name, compute)
+
+
+def get_profiler(options: Dict[str, Any]) -> Any:
+    '''
+    Get the memory profiler enforcing the memory ceiling of the analysis of a function
+    (None, if no ceiling is given)
+    '''
+
+    ceiling = options.get('memory_ceiling', None)
+    if ceiling is None:
+        return None
+
+    from instrumentation.memory import MemoryProfiler
+
+    return MemoryProfiler(ceiling, options.get('on_memory_ceiling', 'degrade'))
+
+
+def register_constants(constant_registry: Any, options: Dict[str, Any], analysis: str) -> None:
+    '''
+    Register the values of the constants (e.g., the function parameters) given in the options,
+    in the form the analysis takes them (see get_constants)
+    '''
+
+    for name, value in get_constants(options, analysis).items():
+        constant_registry.register_variable(name, value)
+
+
+def get_constants(options: Dict[str, Any], analysis: str) -> Dict[str, Any]:
+    '''
+    Get the values of the constants given in the options (ints, or (lower, upper) ranges, see parse_constant)
+    in the form the analysis takes them: strings (or pairs of strings) for the abstract collecting
+    semantics, and single ints for the collecting semantics, which do not take ranges
+    '''
+
+    constants = options.get('constants', dict())
+
+    if analysis == 'abstract_collecting_semantics':
+        return {name: tuple(str(bound) for bound in value) if isinstance(value, tuple) else str(value)
+                for name, value in constants.items()}
+
+    if analysis == 'collecting_semantics':
+        ranges = [name for name, value in constants.items() if isinstance(value, tuple)]
+        if ranges:
+            raise Exception(f'The collecting semantics take a single value per constant, '
+                            f'not the ranges of {", ".join(ranges)}!')
+
+    return constants
+
+
+def parse_constant(text: str) -> tuple:
+    '''
+    Parse a constant given as 'name=value' or 'name=lower:upper'
+    '''
+
+    if '=' not in text:
+        raise Exception(f'Invalid constant {text}, expected name=value or name=lower:upper!')
+
+    name, value = text.split('=', 1)
+
+    if ':' in value:
+        lower, upper = value.split(':', 1)
+        return name.strip(), (int(lower), int(upper))
+
+    return name.strip(), int(value)
+
+
+def to_json(value: Any) -> Any:
+    '''
+    Convert the results of an analysis into JSON serializable objects
+    (the sets are sorted lists, the intervals [inf, sup] pairs, and the infinities strings)
+    '''
+
+    if isinstance(value, dict):
+        return {str(key): to_json(child) for key, child in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((to_json(child) for child in value), key=repr)
+    if isinstance(value, (list, tuple)):
+        return [to_json(child) for child in value]
+    if isinstance(value, Fraction):
+        return str(value)
+    if isinstance(value, float) and value in (float('inf'), float('-inf')):
+        return 'inf' if value > 0 else '-inf'
+    if hasattr(value, 'inf') and hasattr(value, 'sup'):
+        return None if value.inf is None else [to_json(value.inf), to_json(value.sup)]
+
+    return value
+
+
+def collect_inputs(inputs: Iterable[str]) -> Iterator[Dict[str, str]]:
+    '''
+    Collect the sources to analyse, as tasks with an 'id' and a 'path' (or the 'source' itself),
+    from the given files, directories (recursively), glob patterns and JSONL manifests
+    (one {"id": ..., "path": ...} or {"id": ..., "source": ...} object per line)
+    '''
+
+    for entry in inputs:
+        if entry.endswith('.jsonl'):
+            with open(entry, 'r', encoding='utf8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+
+                    task = json.loads(line)
+                    if 'path' not in task and 'source' not in task:
+                        raise Exception(f'Manifest entry without a path or source in {entry}!')
+
+                    task.setdefault('id', task.get('path', None))
+                    yield task
+
+        elif os.path.isdir(entry):
+            for root, _, files in os.walk(entry):
+                for name in sorted(files):
+                    if name.endswith(SOURCE_EXTENSION):
+                        path = os.path.join(root, name)
+                        yield {'id': path, 'path': path}
+
+        elif os.path.isfile(entry):
+            yield {'id': entry, 'path': entry}
+
+        else:
+            paths = sorted(glob.glob(entry, recursive=True))
+            if not paths:
+                raise Exception(f'No sources found for {entry}!')
+
+            for path in paths:
+                yield {'id': path, 'path': path}
+
+
+def collect_project(root: str, entries: Iterable[str] = None,
+                    remappings: Iterable[str] = None) -> Iterator[Dict[str, Any]]:
+    '''
+    Compile a project at once (the entry sources, every source of the project if not given,
+    along with their imports), and get a task per entry source, with its AST
+    (the imported sources, e.g., the libraries, are compiled but not analysed)
+    '''
+
+    from compiler.project import ProjectCompiler
+
+    compiler = ProjectCompiler(root, remappings)
+    output = compiler.compile(entries or None)
+
+    for unit_name in sorted(set(compiler.entries)):
+        yield {'id': unit_name, 'source': output.get_source_code(unit_name), 'ast': output.get_ast(unit_name)}
+
+
+def compile_task(task: Dict[str, str]) -> Tuple[str, dict]:
+    '''
+    Read (if given by path) and compile the source of a task (unless already compiled),
+    and get the source along with its AST
+    '''
+
+    # the sources of a project are compiled beforehand (see collect_project)
+    if 'ast' in task:
+        return task['source'], task['ast']
+
+    # imported here, as the compiler loads the solc bindings
+    from compiler import SolCompiler
+
+    if 'source' in task:
+        source = task['source']
+    else:
+        with open(task['path'], 'r', encoding='utf8') as f:
+            source = f.read()
+
+    output = SolCompiler(source).compile()
+
+    return source, output.get_ast(output.get_contracts_list()[0])
+
+
+def get_error_result(task: Dict[str, str], error: Exception, elapsed: float) -> Dict[str, Any]:
+    '''
+    Get the result of a source which failed before its functions could be analysed
+    '''
+
+    return {
+        'id': task['id'],
+        'function': None,
+        'functions_total': 1,
+        'status': 'error',
+        'error': f'{type(error).__name__}: {error}',
+        'elapsed': elapsed
+    }
+
+
+def analyze_function(task: Dict[str, str], cfg: ControlFlowGraph, function_key: str, functions_total: int,
+                     analyses: List[str], options: Dict[str, Any], builder: Any = None) -> Dict[str, Any]:
+    '''
+    Run the analyses over a function of a compiled source, returning its result
+    (reusing the stored results of the analyses, with a store, see get_store and load_cfg)
+    '''
+
+    start = time.perf_counter()
+    store = get_store(options)
+    result = {
+        'id': task['id'],
+        'function': function_key,
+        'functions_total': functions_total,
+        'status': 'ok',
+        'analyses': dict()
+    }
+
+    try:
+        entry_id, exit_id = cfg.get_function_entry(function_key)
+
+        for analysis in analyses:
+            result['analyses'][analysis] = run_stored_analysis(
+                cfg, entry_id, exit_id, function_key, analysis, options, store, builder)
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f'{type(e).__name__}: {e}'
+    finally:
+        if store is not None:
+            store.close()
+
+    result['elapsed'] = time.perf_counter() - start
+
+    return result
+
+
+def get_empty_result(task: Dict[str, str], elapsed: float) -> Dict[str, Any]:
+    '''
+    Get the result of a source without any (implemented) function, which still gets a line, to be resumable
+    '''
+
+    return {
+        'id': task['id'],
+        'function': None,
+        'functions_total': 1,
+        'status': 'ok',
+        'analyses': dict(),
+        'elapsed': elapsed
+    }
+
+
+def load_cfg(task: Dict[str, str], source: str, ast: dict,
+             options: Dict[str, Any]) -> Tuple[ControlFlowGraph, bool, Any]:
+    '''
+    Get the CFG of a compiled source, whether it was reloaded and its incremental CFG builder.
+    With a store (see get_store), the CFG stored for the same AST is reloaded (with its built functions),
+    and otherwise, the incremental CFG builder stored for the source (see control_flow_graph.functions.incremental)
+    rebuilds only the functions changed since its previous version, and reuses the results of the others
+    '''
+
+    store = get_store(options)
+    if store is None:
+        return ControlFlowGraph(source, ast), False, None
+
+    from control_flow_graph.functions.incremental import IncrementalCFGBuilder
+
+    try:
+        cfg = store.load_cfg(ast)
+        if cfg is not None:
+            return cfg, True, None
+
+        # (built in the current process, as the sources are already analysed in a pool)
+        builder = store.load_builder(task['id']) or IncrementalCFGBuilder(processes=1)
+    finally:
+        store.close()
+
+    try:
+        return builder.build(source, ast), False, builder
+    except Exception:
+        # (a function failing to build is reported by its analysis, failing to build it again)
+        return ControlFlowGraph(source, ast), False, None
+
+
+def save_cfg(task: Dict[str, str], cfg: ControlFlowGraph, builder: Any, options: Dict[str, Any]) -> None:
+    '''
+    Store the CFG of a compiled source, along with its incremental CFG builder (if a store is enabled)
+    '''
+
+    store = get_store(options)
+    if store is not None:
+        try:
+            store.save_cfg(cfg)
+            if builder is not None:
+                store.save_builder(task['id'], builder)
+        finally:
+            store.close()
+
+
+def analyze_ast(task: Dict[str, str], source: str, ast: dict, analyses: List[str],
+                options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    '''
+    Run the analyses over each function of a compiled source, returning one result per function.
+    With a store (see get_store), the CFG stored for the same AST is reloaded instead of built again,
+    and the CFG is stored along with the results of the analyses otherwise (only the functions changed
+    since the previous version of the source being rebuilt and re-analysed, see load_cfg).
+
+    This is a module level function, so that it can be run in a process pool.
+    '''
+
+    start = time.perf_counter()
+
+    try:
+        cfg, stored, builder = load_cfg(task, source, ast, options)
+        function_keys = list(cfg.index_functions().keys())
+    except Exception as e:
+        return [get_error_result(task, e, time.perf_counter() - start)]
+
+    results = [analyze_function(task, cfg, function_key, len(function_keys), analyses, options, builder)
+               for function_key in function_keys]
+
+    # (along with the functions built by the analyses, and the results cached by the builder)
+    if not stored:
+        save_cfg(task, cfg, builder, options)
+
+    if not results:
+        results.append(get_empty_result(task, time.perf_counter() - start))
+
+    return results
+
+
+def analyze_source(task: Dict[str, str], analyses: List[str], options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    '''
+    Compile a source and run the analyses over each of its functions, returning one result per
+    function (or a single result without a function, if the source does not compile).
+
+    This is a module level function, so that it can be run in a process pool.
+    '''
+
+    start = time.perf_counter()
+
+    try:
+        source, ast = compile_task(task)
+    except Exception as e:
+        return [get_error_result(task, e, time.perf_counter() - start)]
+
+    return analyze_ast(task, source, ast, analyses, options)
+
+
+def load_completed(path: str) -> Set[str]:
+    '''
+    Load the ids of the sources completely analysed in a (partial) output, and rewrite the output
+    without the results of the other (partially written) sources, so that they can be run again
+    '''
+
+    if not os.path.exists(path):
+        return set()
+
+    lines = dict()
+    with open(path, 'r', encoding='utf8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                # a line cut short by an interrupted run
+                continue
+            lines.setdefault(result['id'], list()).append((line if line.endswith('\n') else line + '\n',
+                                                          result['functions_total']))
+
+    completed = {source_id for source_id, results in lines.items()
+                 if len(results) == results[0][1]}
+
+    temp_path = f'{path}.resume'
+    with open(temp_path, 'w', encoding='utf8') as f:
+        for source_id in completed:
+            f.writelines(line for line, _ in lines[source_id])
+    os.replace(temp_path, path)
+
+    return completed
+
+
+class CorpusDriver(object):
+    '''
+    Class running the analyses over a corpus in a process pool, streaming the results
+    '''
+
+    def __init__(self, analyses: Iterable[str], processes=None, options: Dict[str, Any] = None,
+                 max_pending=None):
+        '''
+        Constructor
+        '''
+
+        for analysis in analyses:
+            if analysis not in ANALYSES:
+                raise Exception(f'Unknown analysis {analysis}!')
+
+        self.analyses = list(analyses)
+        self.processes = processes or os.cpu_count() or 1
+
+        # the options of the analyses (e.g., the constants, the budget)
+        self.options = options or dict()
+
+        # the number of sources submitted to the pool ahead of the completed ones
+        # (bounded, so that a large corpus is not loaded into memory at once)
+        self.max_pending = max_pending or self.processes * 4
+
+        # the number of sources and functions analysed, and of the failures
+        self.counts = {'sources': 0, 'functions': 0, 'errors': 0, 'skipped': 0}
+
+    def run(self, tasks: Iterable[Dict[str, str]], output: TextIO, skip: Set[str] = None,
+            on_result: Callable[[Dict[str, Any]], None] = None) -> Dict[str, int]:
+        '''
+        Analyse the sources, writing the results to the output as soon as each source
+        is analysed (the sources with the ids in skip are not analysed again)
+        '''
+
+        skip = skip or set()
+
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            # mapping of the pending futures to their task and submission time
+            pending = dict()
+
+            for task in tasks:
+                if task['id'] in skip:
+                    self.counts['skipped'] += 1
+                    continue
+
+                future = executor.submit(
+                    analyze_source, task, self.analyses, self.options)
+                pending[future] = (task, time.perf_counter())
+
+                if len(pending) >= self.max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    self.__write(done, pending, output, on_result)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                self.__write(done, pending, output, on_result)
+
+        return self.counts
+
+    def __write(self, futures: Iterable[Any], pending: Dict[Any, Tuple[Dict[str, str], float]], output: TextIO,
+                on_result: Callable[[Dict[str, Any]], None]) -> None:
+        '''
+        Write the results of the analysed sources (removing them from the pending ones),
+        all the lines of a source at once, or a single error line if its worker failed
+        (e.g., it was killed, or its result could not be sent back)
+        '''
+
+        for future in futures:
+            task, start = pending.pop(future)
+
+            try:
+                results = future.result()
+            except Exception as e:
+                results = [get_error_result(task, e, time.perf_counter() - start)]
+
+            output.write(''.join(json.dumps(result) + '\n' for result in results))
+            output.flush()
+
+            self.counts['sources'] += 1
+            for result in results:
+                if result['function'] is not None:
+                    self.counts['functions'] += 1
+                if result['status'] != 'ok':
+                    self.counts['errors'] += 1
+                if on_result is not None:
+                    on_result(result)
+
+
+class ThreadedDriver(object):
+    '''
+    Class running the analyses over a corpus in a thread pool, within a single process:
+    the functions of the sources are analysed concurrently, sharing a single JVM (JPype releases the GIL
+    during the Java calls, hence the APRON operations of the threads run in parallel), instead of
+    duplicating the JVM in every worker process. It pays off for the abstract collecting semantics,
+    the pure python analyses being serialized by the GIL.
+    '''
+
+    def __init__(self, analyses: Iterable[str], threads=None, options: Dict[str, Any] = None,
+                 max_pending=None):
+        '''
+        Constructor
+        '''
+
+        for analysis in analyses:
+            if analysis not in ANALYSES:
+                raise Exception(f'Unknown analysis {analysis}!')
+
+        self.analyses = list(analyses)
+        self.threads = threads or os.cpu_count() or 1
+
+        # the options of the analyses (e.g., the constants, the budget)
+        self.options = options or dict()
+
+        # the number of sources submitted to the pool ahead of the written ones
+        self.max_pending = max_pending or self.threads * 4
+
+        # the number of sources and functions analysed, and of the failures
+        self.counts = {'sources': 0, 'functions': 0, 'errors': 0, 'skipped': 0}
+
+    def run(self, tasks: Iterable[Dict[str, str]], output: TextIO, skip: Set[str] = None,
+            on_result: Callable[[Dict[str, Any]], None] = None) -> Dict[str, int]:
+        '''
+        Analyse the sources, writing the results of each source to the output (in the order
+        of the sources) once all its functions are analysed (the sources with the ids in skip
+        are not analysed again)
+        '''
+
+        skip = skip or set()
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            pending = deque()
+
+            for task in tasks:
+                if task['id'] in skip:
+                    self.counts['skipped'] += 1
+                    continue
+
+                pending.append(self.__submit(task, executor))
+
+                if len(pending) >= self.max_pending:
+                    self.__write(pending.popleft(), output, on_result)
+
+            while pending:
+                self.__write(pending.popleft(), output, on_result)
+
+        return self.counts
+
+    def __submit(self, task: Dict[str, str],
+                 executor: ThreadPoolExecutor) -> Tuple[Dict[str, str], float, List[Any], Any]:
+        '''
+        Compile a source and build the CFGs of its functions (in the calling thread, as the CFG is
+        shared by the analyses of the functions, which only read it), and submit the analysis
+        of each function to the pool (getting the futures of their results, or the result of the
+        source if it does not compile), along with the CFG and its builder to store once analysed
+        (None, if reloaded from the store, see load_cfg)
+        '''
+
+        start = time.perf_counter()
+
+        try:
+            source, ast = compile_task(task)
+            cfg, stored, builder = load_cfg(task, source, ast, self.options)
+            function_keys = list(cfg.index_functions().keys())
+        except Exception as e:
+            return task, start, [get_error_result(task, e, time.perf_counter() - start)], None
+
+        for function_key in function_keys:
+            try:
+                cfg.get_function_entry(function_key)
+            except Exception:
+                # (reported by the analysis of the function, failing to build it again)
+                pass
+
+        futures = [executor.submit(analyze_function, task, cfg, function_key, len(function_keys),
+                                   self.analyses, self.options, builder) for function_key in function_keys]
+
+        return task, start, futures, None if stored else (cfg, builder)
+
+    def __write(self, submitted: Tuple[Dict[str, str], float, List[Any], Any], output: TextIO,
+                on_result: Callable[[Dict[str, Any]], None]) -> None:
+        '''
+        Write the results of a source, all its lines at once
+        (and store its CFG, with the results cached by its builder)
+        '''
+
+        task, start, futures, unsaved = submitted
+
+        results = [future.result() if isinstance(future, Future) else future for future in futures]
+
+        if unsaved is not None:
+            save_cfg(task, *unsaved, self.options)
+
+        if not results:
+            results.append(get_empty_result(task, time.perf_counter() - start))
+
+        output.write(''.join(json.dumps(result) + '\n' for result in results))
+        output.flush()
+
+        self.counts['sources'] += 1
+        for result in results:
+            if result['function'] is not None:
+                self.counts['functions'] += 1
+            if result['status'] != 'ok':
+                self.counts['errors'] += 1
+            if on_result is not None:
+                on_result(result)
+
+
+def open_output(path: str = None, resume=False) -> TextIO:
+    '''
+    Open the output (stdout, if no path is given), for appending if resumed
+    '''
+
+    if path is None:
+        return sys.stdout
+
+    return open(path, 'a' if resume else 'w', encoding='utf8')
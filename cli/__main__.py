@@ -0,0 +1,169 @@
+'''
+Run the analyses over a corpus of Solidity sources
+
+    python -m cli contracts/ 'audits/**/*.sol' manifest.jsonl \\
+        --analyses sparse_interval --processes 16 --output results.jsonl [--resume]
+
+    python -m cli --project my-project/ contracts/Token.sol --remapping @openzeppelin/=lib/openzeppelin/
+
+With --pipeline, the sources are compiled (--compile-concurrency at a time) while the
+previous ones are analysed, and --ordered keeps the results in the order of the sources.
+With --threads, the functions are analysed in a thread pool of a single process,
+sharing one JVM instead of starting one per worker process.
+
+With --accelerate-loops, the collecting semantics summarize the loops with affine updates
+(see static_analysis.loop_acceleration) in closed form, instead of iterating them.
+
+With --memory-ceiling, the collecting semantics release the states of their past iterations
+once the memory (the traced python heap and the JVM heap) exceeds the ceiling, and fail
+if still above it (or right away, with --on-memory-ceiling abort).
+
+With --checkpoint-dir, the collecting semantics save their progress periodically,
+and resume from it when rerun (e.g., after the worker is preempted).
+
+With --store, the CFGs and the results of the analyses are stored (content-addressed by
+the AST, the function and the options), and reloaded by the later runs over the same sources
+instead of built and computed again. When a source is edited, only its changed functions
+are rebuilt and re-analysed (see control_flow_graph.functions.incremental).
+
+With a budget (--time-budget, --iteration-budget, --state-budget, --memory-budget), the
+collecting semantics degrade along their ladder (see static_analysis.degradation) when
+the budget is exceeded. The checkpoints are not taken under a budget.
+
+The APRON jars (for the abstract collecting semantics) are located through
+the SAFPY_APRON_CLASSPATH environment variable (see java_wrapper).
+'''
+import sys
+import json
+import argparse
+from cli import ANALYSES, CorpusDriver, ThreadedDriver, collect_inputs, collect_project, load_completed, open_output, parse_constant
+from pipeline import AnalysisPipeline
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m cli',
+                                     description='Analyse a corpus of Solidity sources')
+    parser.add_argument('inputs', nargs='*',
+                        help='source files, directories, glob patterns or JSONL manifests '
+                        '(the entry sources, with --project)')
+    parser.add_argument('--project', default=None,
+                        help='the root of a project, compiled at once along with the imports of the entry sources '
+                        '(every source of the project but the libraries, if none is given), of which only the entries are analysed')
+    parser.add_argument('--remapping', action='append', default=[],
+                        help='an import remapping of the project, as prefix=target')
+    parser.add_argument('--analyses', nargs='+', default=['sparse_interval'],
+                        choices=sorted(ANALYSES.keys()))
+    parser.add_argument('--processes', type=int, default=None,
+                        help='the number of worker processes (the number of CPUs, if not specified)')
+    parser.add_argument('--output', default=None,
+                        help='the JSONL file to write the results to (stdout, if not specified)')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip the sources already analysed in the output')
+    parser.add_argument('--constant', action='append', default=[],
+                        help='the value of a constant (e.g., a parameter), as name=value or name=lower:upper '
+                        '(the ranges are not taken by the collecting semantics)')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='compile the next sources while analysing the previous ones (see pipeline)')
+    parser.add_argument('--compile-concurrency', type=int, default=4,
+                        help='the number of concurrent compilations, with --pipeline')
+    parser.add_argument('--ordered', action='store_true',
+                        help='write the results in the order of the sources, with --pipeline')
+    parser.add_argument('--threads', type=int, default=None,
+                        help='analyse the functions in a pool of threads sharing one JVM, instead of processes')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='the wall time (seconds) of the collecting semantics of a function, before degrading')
+    parser.add_argument('--iteration-budget', type=int, default=None,
+                        help='the fixed point iterations of a function, before degrading')
+    parser.add_argument('--state-budget', type=int, default=None,
+                        help='the size of a state set, before degrading')
+    parser.add_argument('--memory-budget', type=int, default=None,
+                        help='the memory (bytes) a worker grows by in the collecting semantics of a function, before degrading')
+    parser.add_argument('--memory-ceiling', type=int, default=None,
+                        help='the memory (bytes of the traced python heap and the JVM heap) of the collecting '
+                        'semantics of a function, before releasing their past states and failing')
+    parser.add_argument('--on-memory-ceiling', choices=('degrade', 'abort'), default='degrade',
+                        help='whether to release the past states before failing, when the memory ceiling is hit')
+    parser.add_argument('--accelerate-loops', action='store_true',
+                        help='summarize the loops with affine updates in closed form, in the collecting semantics')
+    parser.add_argument('--checkpoint-dir', default=None,
+                        help='the directory of the checkpoints of the fixed point computations, '
+                        'resumed from when rerun after a preemption')
+    parser.add_argument('--checkpoint-interval', type=float, default=60.0,
+                        help='the wall time (seconds) between two checkpoints of a computation')
+    parser.add_argument('--store', default=None,
+                        help='the directory (or SQLite file) storing the CFGs and the results of the analyses, '
+                        'reloaded when the same sources are analysed again')
+    parser.add_argument('--store-backend', choices=('directory', 'sqlite'), default='directory',
+                        help='the backend of the store')
+    args = parser.parse_args(argv)
+
+    if args.resume and args.output is None:
+        parser.error('--resume requires --output')
+    if not args.inputs and args.project is None:
+        parser.error('the inputs are required without --project')
+    if args.threads is not None and args.pipeline:
+        parser.error('--threads and --pipeline are exclusive')
+
+    budget = {'wall_time': args.time_budget, 'iterations': args.iteration_budget,
+              'state_set_size': args.state_budget, 'memory': args.memory_budget}
+    budgeted = any(limit is not None for limit in budget.values())
+    if budgeted and args.checkpoint_dir is not None:
+        parser.error('--checkpoint-dir is not taken with a budget (the degraded levels would resume from its checkpoints)')
+
+    options = {'constants': dict(parse_constant(constant)
+                                 for constant in args.constant)}
+
+    if args.accelerate_loops:
+        options['accelerate_loops'] = True
+
+    if args.memory_ceiling is not None:
+        options['memory_ceiling'] = args.memory_ceiling
+        options['on_memory_ceiling'] = args.on_memory_ceiling
+
+    if args.checkpoint_dir is not None:
+        options['checkpoint_dir'] = args.checkpoint_dir
+        options['checkpoint_interval'] = args.checkpoint_interval
+
+    if budgeted:
+        options['budget'] = budget
+
+    if args.store is not None:
+        options['store'] = args.store
+        options['store_backend'] = args.store_backend
+
+    skip = load_completed(args.output) if args.resume else set()
+
+    if args.project is not None:
+        tasks = collect_project(args.project, args.inputs, args.remapping)
+    else:
+        tasks = collect_inputs(args.inputs)
+
+    output = open_output(args.output, args.resume)
+    try:
+        if args.pipeline:
+            def emit(results):
+                output.write(''.join(json.dumps(result) + '\n' for result in results))
+                output.flush()
+
+            driver = AnalysisPipeline(args.analyses, args.compile_concurrency, args.processes,
+                                      ordered=args.ordered, options=options)
+            counts = driver.run_sync(tasks, emit, skip)
+        elif args.threads is not None:
+            driver = ThreadedDriver(args.analyses, args.threads, options)
+            counts = driver.run(tasks, output, skip)
+        else:
+            driver = CorpusDriver(args.analyses, args.processes, options)
+            counts = driver.run(tasks, output, skip)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print('sources {sources}, functions {functions}, errors {errors}, skipped {skipped}'.format(
+        **counts), file=sys.stderr)
+
+    # the failures of individual sources are reported in the output (status 'error')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
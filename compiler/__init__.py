@@ -2,9 +2,14 @@
 SADA
 '''
 import solcx
+import threading
 from typing import Union
 from compiler.solc_selector import SolcSelector
 from compiler.output_generator import CompiledOutputGenerator
+from instrumentation.metrics import metrics
+
+# serializes the installations of solc, as the sources may be compiled concurrently (see pipeline)
+_install_lock = threading.Lock()
 
 
 class SolCompiler(object):
@@ -13,14 +18,20 @@ class SolCompiler(object):
         self.source_code = source_code
 
         solc_selector = SolcSelector()
-        solidity_pragma = self.extract_pragma(source_code)
-        self.solidity_version = solc_selector.install_solc_pragma_solc(
-            solidity_pragma)
+        with metrics.phase('compiler.pragma'):
+            solidity_pragma = self.extract_pragma(source_code)
+            self.solidity_version = solc_selector.install_solc_pragma_solc(
+                solidity_pragma, install=False)
+
+        with metrics.phase('compiler.install'), _install_lock:
+            solc_selector.install_solc_pragma_solc(solidity_pragma)
 
         solcx.set_solc_version(self.solidity_version)
 
     def compile(self):
-        self.compiled_output = CompiledOutputGenerator(self.source_code)
+        with metrics.phase('compiler.compile'):
+            self.compiled_output = CompiledOutputGenerator(
+                self.source_code, self.solidity_version)
         return self.compiled_output
 
     @staticmethod
@@ -29,6 +40,8 @@ class SolCompiler(object):
         Extract the Solidity Version Pragma from the source code
         '''
         for line_text in source_code.split('\n'):
+            # (the pragma may be indented)
+            line_text = line_text.strip()
             if line_text.startswith('pragma solidity'):
                 return line_text
         return None
@@ -4,6 +4,7 @@ sdfsd
 import solcx
 from copy import deepcopy
 from typing import List
+from instrumentation.metrics import metrics
 
 
 class CompiledOutputGenerator(object):
@@ -12,7 +13,9 @@ class CompiledOutputGenerator(object):
     '''
     OPTIONS = ['abi', 'bin', 'opcodes', 'asm']
 
-    def __init__(self, source_code):
+    def __init__(self, source_code, solc_version=None):
+        # the solc version to compile with (the global one set with solcx, if not specified)
+        self.__solc_version = solc_version
         self.__init_helper(source_code)
         '''
         Constructor to compile the source code and create a compiler object
@@ -22,7 +25,9 @@ class CompiledOutputGenerator(object):
         self.__source_code = source_code
 
         # compile the source code
-        self.__compiled_result = solcx.compile_source(self.__source_code)
+        # (passing the version explicitly, so that concurrent compilations do not race on the global one)
+        self.__compiled_result = solcx.compile_source(
+            self.__source_code, solc_version=self.__solc_version)
 
         # get the list of contracts present in the source code
         self.__contracts_list = self.__extract_modify_compiled_output()
@@ -32,7 +37,8 @@ class CompiledOutputGenerator(object):
         Get the AST of the contract.\\
         Apparently, it returns the complete AST of the Source File.
         '''
-        return deepcopy(self.__compiled_result.get(contract_name)['ast'])
+        with metrics.phase('compiler.ast'):
+            return deepcopy(self.__compiled_result.get(contract_name)['ast'])
 
     def get_source_code(self) -> str:
         return self.__source_code
@@ -0,0 +1,286 @@
+'''
+Project Compiler
+
+Compiles a multi-file Solidity project at once: the import graph of the entry sources is
+resolved locally (relative imports, remappings and paths relative to the project root),
+a solc version satisfying the pragmas of every source is selected, and the whole unit is
+compiled with a single solc standard JSON invocation. The output exposes the AST of every
+source unit, to build its CFG (see control_flow_graph).
+
+The source units are named by their path relative to the project root (with '/' separators),
+or by their absolute path if remapped to an absolute target (e.g., a library installed outside
+of the project), as solc names them when resolving the imports with the same remappings.
+'''
+import os
+import re
+import posixpath
+import solcx
+from typing import Dict, Iterable, List, Tuple, Union
+from compiler import SolCompiler, _install_lock
+from compiler.solc_selector import SolcSelector
+from instrumentation.metrics import metrics
+
+# RegEx to extract the path of the import directives, in any of their forms:
+# import "a.sol"; import "a.sol" as A; import * as A from "a.sol"; import {B, C as D} from "a.sol";
+IMPORT_REGEX = re.compile(
+    r'^\s*import\s+(?:[^;"\']*?\s+from\s+)?["\'](?P<path>[^"\']+)["\'][^;]*;', re.MULTILINE)
+
+# RegEx to strip the comments, so that commented out imports are not resolved
+COMMENT_REGEX = re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL)
+
+# the directories skipped when collecting the sources of a project
+EXCLUDED_DIRECTORIES = ('.git', 'node_modules')
+
+
+class ProjectCompiler(object):
+    '''
+    Class compiling a multi-file project through solc standard JSON
+    '''
+
+    def __init__(self, root: str, remappings: Union[Iterable[str], Dict[str, str]] = None):
+        '''
+        Constructor
+        '''
+
+        if not os.path.isdir(root):
+            raise Exception(f'Project root {root} is not a directory!')
+
+        self.root = os.path.abspath(root)
+
+        # the remappings, as (prefix, target) pairs, given either as 'prefix=target' strings or as a dict
+        if isinstance(remappings, dict):
+            remappings = [f'{prefix}={target}' for prefix,
+                          target in remappings.items()]
+        self.remappings = [self.parse_remapping(
+            remapping) for remapping in remappings or list()]
+
+        # the unit names of the entry sources (of the latest compilation)
+        self.entries = list()
+
+        # mapping of the source unit name to its source code, for the sources resolved so far
+        self.sources = dict()
+
+        self.solidity_version = None
+
+    def compile(self, entries: Iterable[str] = None) -> 'ProjectOutput':
+        '''
+        Compile the entry sources (paths relative to the root, or absolute ones; every source
+        of the project but the libraries, if not given) along with all the sources they import
+        '''
+
+        with metrics.phase('compiler.imports'):
+            if entries is None:
+                entries = self.collect_sources()
+            self.entries = [self.get_unit_name(entry) for entry in entries]
+            self.resolve_imports(self.entries)
+
+        solc_selector = SolcSelector()
+        with metrics.phase('compiler.pragma'):
+            pragmas = [pragma for pragma in (SolCompiler.extract_pragma(source)
+                                             for source in self.sources.values()) if pragma is not None]
+            self.solidity_version = solc_selector.install_solc_pragmas_solc(
+                pragmas, install=False)
+
+        with metrics.phase('compiler.install'), _install_lock:
+            solc_selector.install_solc_pragmas_solc(pragmas)
+
+        with metrics.phase('compiler.compile'):
+            output = solcx.compile_standard(self.get_standard_input(), base_path=self.root,
+                                            allow_paths=self.get_allowed_paths(), solc_version=self.solidity_version)
+
+        return ProjectOutput(self.sources, output)
+
+    def collect_sources(self) -> Iterable[str]:
+        '''
+        Collect the unit names of all the sources under the root,
+        but the libraries (the sources under the targets of the remappings)
+        '''
+
+        libraries = tuple(posixpath.normpath(target) + '/' for _, target in self.remappings)
+
+        for root, directories, files in os.walk(self.root):
+            directories[:] = sorted(directory for directory in directories
+                                    if directory not in EXCLUDED_DIRECTORIES)
+
+            for name in sorted(files):
+                if name.endswith('.sol'):
+                    unit_name = self.get_unit_name(os.path.join(root, name))
+                    if not unit_name.startswith(libraries):
+                        yield unit_name
+
+    def resolve_imports(self, entries: Iterable[str]) -> Dict[str, str]:
+        '''
+        Read the entry sources and, transitively, all the sources they import
+        '''
+
+        pending = [self.get_unit_name(entry) for entry in entries]
+
+        while pending:
+            unit_name = pending.pop()
+            if unit_name in self.sources:
+                continue
+
+            path = unit_name if os.path.isabs(unit_name) else os.path.join(self.root, *unit_name.split('/'))
+            if not os.path.isfile(path):
+                raise Exception(f'Source {unit_name} not found in {self.root}!')
+
+            with open(path, 'r', encoding='utf8') as f:
+                source = f.read()
+            self.sources[unit_name] = source
+
+            for import_path in self.extract_imports(source):
+                pending.append(self.resolve_import(unit_name, import_path))
+
+        return self.sources
+
+    def resolve_import(self, unit_name: str, import_path: str) -> str:
+        '''
+        Resolve the path of an import directive of a source unit into the imported unit name:
+        relative to the importing unit if it starts with '.', remapped otherwise (the longest matching prefix),
+        kept as is if remapped to an absolute target
+        '''
+
+        if import_path.startswith('./') or import_path.startswith('../'):
+            resolved = posixpath.normpath(posixpath.join(
+                posixpath.dirname(unit_name), import_path))
+        else:
+            resolved = import_path
+            prefixes = [(prefix, target) for prefix, target in self.remappings
+                        if import_path.startswith(prefix)]
+            if prefixes:
+                prefix, target = max(prefixes, key=lambda remapping: len(remapping[0]))
+                resolved = target + import_path[len(prefix):]
+            resolved = posixpath.normpath(resolved)
+
+            if os.path.isabs(resolved):
+                return resolved
+
+        if resolved.startswith('../'):
+            raise Exception(f'Import {import_path} of {unit_name} is outside of the project root!')
+
+        return resolved
+
+    def get_unit_name(self, path: str) -> str:
+        '''
+        Get the unit name of a source (a path relative to the root, or an absolute one)
+        '''
+
+        if os.path.isabs(path):
+            path = os.path.relpath(path, self.root)
+
+        return posixpath.normpath(path.replace(os.sep, '/'))
+
+    def get_allowed_paths(self) -> List[str]:
+        '''
+        Get the paths solc may read the sources from: the root, along with the absolute targets of the remappings
+        '''
+
+        return [self.root] + [target for _, target in self.remappings if os.path.isabs(target)]
+
+    def get_standard_input(self) -> dict:
+        '''
+        Get the standard JSON input compiling all the resolved sources
+        '''
+
+        return {
+            'language': 'Solidity',
+            'sources': {unit_name: {'content': source} for unit_name, source in sorted(self.sources.items())},
+            'settings': {
+                'remappings': [f'{prefix}={target}' for prefix, target in self.remappings],
+                'outputSelection': {
+                    '*': {
+                        '': ['ast'],
+                        '*': ['abi', 'evm.bytecode.object', 'evm.bytecode.opcodes']
+                    }
+                }
+            }
+        }
+
+    @staticmethod
+    def extract_imports(source_code: str) -> List[str]:
+        '''
+        Extract the paths of the import directives of the source code
+        '''
+
+        return [match.group('path') for match in IMPORT_REGEX.finditer(COMMENT_REGEX.sub('', source_code))]
+
+    @staticmethod
+    def parse_remapping(remapping: str) -> Tuple[str, str]:
+        '''
+        Parse a remapping given as 'prefix=target' (the context prefixes of solc are not supported)
+        '''
+
+        if '=' not in remapping:
+            raise Exception(f'Invalid remapping {remapping}, expected prefix=target!')
+
+        prefix, target = remapping.split('=', 1)
+        if ':' in prefix:
+            raise Exception(f'Context of remapping {remapping} not supported!')
+
+        return prefix.strip(), target.strip()
+
+
+class ProjectOutput(object):
+    '''
+    Class exposing the output of a project compilation, per source unit
+    '''
+
+    def __init__(self, sources: Dict[str, str], output: dict):
+        '''
+        Constructor
+        '''
+
+        self.__sources = dict(sources)
+        self.__output = output
+
+    def get_source_units(self) -> List[str]:
+        return sorted(self.__output.get('sources', dict()).keys())
+
+    def get_source_code(self, unit_name: str) -> str:
+        return self.__sources[unit_name]
+
+    def get_ast(self, unit_name: str) -> dict:
+        '''
+        Get the AST of a source unit
+        '''
+
+        if unit_name not in self.__output.get('sources', dict()):
+            raise Exception(f'Invalid Source Unit {unit_name}!')
+
+        return self.__output['sources'][unit_name]['ast']
+
+    def get_contracts_list(self, unit_name: str = None) -> List[str]:
+        '''
+        Get the contracts of a source unit (of every unit, as 'unit:contract', if not given)
+        '''
+
+        contracts = self.__output.get('contracts', dict())
+
+        if unit_name is not None:
+            return list(contracts.get(unit_name, dict()).keys())
+
+        return [f'{unit}:{contract}' for unit, unit_contracts in sorted(contracts.items())
+                for contract in unit_contracts]
+
+    def get_abi(self, unit_name: str, contract_name: str) -> list:
+        return self.__get_contract(unit_name, contract_name)['abi']
+
+    def get_byte_code(self, unit_name: str, contract_name: str) -> str:
+        return self.__get_contract(unit_name, contract_name)['evm']['bytecode']['object']
+
+    def get_opcodes(self, unit_name: str, contract_name: str) -> str:
+        return self.__get_contract(unit_name, contract_name)['evm']['bytecode']['opcodes']
+
+    def get_errors(self) -> List[dict]:
+        '''
+        Get the warnings (and other non fatal messages) of the compilation
+        '''
+
+        return self.__output.get('errors', list())
+
+    def __get_contract(self, unit_name: str, contract_name: str) -> dict:
+        contracts = self.__output.get('contracts', dict()).get(unit_name, dict())
+        if contract_name not in contracts:
+            raise Exception(f'Invalid Contract Name {unit_name}:{contract_name}!')
+
+        return contracts[contract_name]
@@ -7,6 +7,7 @@ Refactored and Documented on May 7, 2024 by Arnab Mukherjee
 import solcx
 import operator
 import re
+from typing import List
 
 
 class SolcSelector(object):
@@ -29,52 +30,19 @@ class SolcSelector(object):
 
     # install solidity compiler for version passed
     def install_solc_pragma_solc(self, version: str, install=True) -> str:
+        return self.install_solc_pragmas_solc([version], install)
 
-        # get rid of any whitespace at the start and end of the pragma
-        version = version.strip()
+    # install solidity compiler for the latest version satisfying all the pragmas passed
+    # (e.g., the pragmas of all the sources of a project)
+    def install_solc_pragmas_solc(self, versions: List[str], install=True) -> str:
 
-        # seperate if multiple versions are provided with an OR clause
-        comparator_set_range = [i.strip() for i in version.split('||')]
-
-        # RegEx to extract the solidity version components, including:
-        # operator, version, major, minor, patch
-        comparator_regex = re.compile(
-            r'(?P<operator>([<>]?=?|\^))(?P<version>(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+))')
-
-        # flag to denote whether a suitable compiler version is available or not
-        found_version_flag = False
-
-        # traverse through all version of solidity to find out the perfect match for given pragma
+        # traverse through all version of solidity to find out the perfect match for given pragmas
         # and install the solidity compiler binary
         for version_json in SolcSelector.solidity_versions:
 
-            # for all versions of solidity mentioned in pragma
-            for comparator_set in comparator_set_range:
-                # using RegEx, extract and generate dictionary of version information
-                # example dict: {'operator': '>=', 'version': '0.4.22', 'major': '0', 'minor': '4', 'patch': '22'}
-                # in this case, we obtain a list of such objects / dictionaries
-                comparators = [m.groupdict()
-                               for m in comparator_regex.finditer(comparator_set)]
-
-                # flag to check whether all comparators satisfy the current listed version (version_json)
-                comparator_set_flag = True
-
-                # check if the current selected version from out list of supported version
-                # is compatible with the given version (as extracted from the pragma)
-                for comparator in comparators:
-                    operator = comparator['operator']
-                    if not SolcSelector._compare_versions(version_json, comparator['version'], operator):
-                        # if version_json (our list item) does not satisfy the comparator version
-                        comparator_set_flag = False
-
-                # if compatibility of available version fails,
-                # activate range finding
-                if comparator_set_flag:
-                    found_version_flag = True
-
-            # if range is activated,validate support of version on py-solc-x
+            # if all the pragmas are satisfied, validate support of version on py-solc-x
             # and install, if required
-            if found_version_flag:
+            if all(SolcSelector._is_compatible(version_json, version) for version in versions):
                 SolcSelector._validate_version(version_json)
                 if install:
                     solcx.install_solc(version_json)
@@ -84,6 +52,37 @@ class SolcSelector(object):
         # if everything fails, error out that nothing supports
         raise ValueError("Compatible solc version does not exist")
 
+    @classmethod
+    def _is_compatible(cls, version_json: str, version: str) -> bool:
+
+        # get rid of any whitespace at the start and end of the pragma
+        version = version.strip()
+
+        # seperate if multiple versions are provided with an OR clause
+        comparator_set_range = [i.strip() for i in version.split('||')]
+
+        # RegEx to extract the solidity version components, including:
+        # operator, version, major, minor, patch
+        comparator_regex = re.compile(
+            r'(?P<operator>([<>]?=?|\^))(?P<version>(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+))')
+
+        # for all versions of solidity mentioned in pragma
+        for comparator_set in comparator_set_range:
+            # using RegEx, extract and generate dictionary of version information
+            # example dict: {'operator': '>=', 'version': '0.4.22', 'major': '0', 'minor': '4', 'patch': '22'}
+            # in this case, we obtain a list of such objects / dictionaries
+            comparators = [m.groupdict()
+                           for m in comparator_regex.finditer(comparator_set)]
+
+            # check if the current selected version from out list of supported version
+            # is compatible with the given version (as extracted from the pragma),
+            # i.e., if it satisfies all comparators of the set
+            if all(SolcSelector._compare_versions(version_json, comparator['version'], comparator['operator'])
+                   for comparator in comparators):
+                return True
+
+        return False
+
     @classmethod
     def _validate_version(cls, version: str) -> str:
         # append the version tag if not already present
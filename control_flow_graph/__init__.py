@@ -1,10 +1,17 @@
+from typing import Dict, Iterable, Tuple
 from graphviz import Digraph
 
 from control_flow_graph.node_processor import CFGMetadata
+from control_flow_graph.analysis import CFGAnalysis
+import control_flow_graph.functions as functions
+from instrumentation import get_logger, TRACE
+from instrumentation.metrics import metrics
 import control_flow_graph.node_processor.nodes as nodes
 from control_flow_graph.node_processor.nodes.extra_nodes.source.entry import SourceEntry
 from control_flow_graph.node_processor.nodes.extra_nodes.source.exit import SourceExit
 
+logger = get_logger('cfg')
+
 
 class ControlFlowGraph(object):
     '''
@@ -23,6 +30,14 @@ class ControlFlowGraph(object):
         # initialize the metadata handler
         self.cfg_metadata = CFGMetadata()
 
+        # cache of the CFG analyses, keyed by the (starting node, ending node) pair
+        self.analyses = dict()
+
+        # index of the function definitions (function key -> AST node),
+        # and the (entry, exit) node ids of the function CFGs built so far
+        self.function_index = None
+        self.function_cfgs = dict()
+
         # generate the entry and exit nodes
         self.entry_node = SourceEntry(dict(), None, None,
                                       None, self.cfg_metadata)
@@ -40,6 +55,19 @@ class ControlFlowGraph(object):
         '''
         Build the CFG recursively
         '''
+        # the cached analyses are stale once the graph is (re)built
+        self.analyses = dict()
+
+        with metrics.phase('cfg.build'):
+            self.__build_cfg()
+
+        self.__record_size()
+
+    def __build_cfg(self) -> None:
+        '''
+        Build the CFG recursively from the source unit
+        '''
+
         # obtain the AST's first node's type
         node_type = self.ast['nodeType']
 
@@ -55,7 +83,7 @@ class ControlFlowGraph(object):
 
         leaves = child_node.get_leaf_nodes()
 
-        print('ALL-LEAVES', leaves)
+        logger.debug('ALL-LEAVES %s', leaves)
 
         for leaf in leaves:
             node = self.cfg_metadata.get_node(leaf)
@@ -63,9 +91,89 @@ class ControlFlowGraph(object):
 
             self.exit_node.add_prev_node(leaf)
 
-    def generate_dot(self) -> str:
+    def __record_size(self) -> None:
         '''
-        Traverse the CFG and generate a Graphviz Digraph DOT file
+        Record the number of nodes and edges of the CFG
+        '''
+
+        if not metrics.enabled:
+            return
+
+        metrics.set_gauge('cfg.nodes', len(self.cfg_metadata.node_table))
+        metrics.set_gauge('cfg.edges', sum(len(node.next_nodes)
+                                           for node in self.cfg_metadata.node_table.values()))
+
+    def index_functions(self) -> Dict[str, dict]:
+        '''
+        Index the function definitions of the AST, without building their CFGs
+        '''
+
+        if self.function_index is None:
+            self.function_index = functions.index_functions(self.ast)
+
+        return self.function_index
+
+    def get_function_entry(self, function_key: str) -> Tuple[str, str]:
+        '''
+        Get the ids of the entry and exit nodes of a function, of the form
+        f'{contract}.{function}' (f'{contract}.{function}({types})' if overloaded),
+        building the CFG of the function on the first request
+        '''
+
+        if function_key not in self.function_cfgs:
+            self.build_function_cfgs([function_key], processes=1)
+
+        return self.function_cfgs[function_key]
+
+    def build_function_cfgs(self, function_keys: Iterable[str] = None, processes=None) -> None:
+        '''
+        Build the CFGs of the given functions (all the functions, if not specified)
+        in a process pool, and merge them into the CFG metadata
+        '''
+
+        index = self.index_functions()
+
+        if function_keys is None:
+            function_keys = index.keys()
+
+        # skip the functions which are already built
+        pending = list()
+        for function_key in function_keys:
+            if function_key not in index:
+                raise Exception(f'Function {function_key} not found!')
+            if function_key not in self.function_cfgs:
+                pending.append((function_key, index[function_key]))
+
+        with metrics.phase('cfg.build_functions'):
+            results = functions.build_functions(pending, processes)
+
+            for (function_key, _), (cfg_metadata, entry_id, exit_id) in zip(pending, results):
+                self.cfg_metadata.merge(cfg_metadata)
+                self.function_cfgs[function_key] = (entry_id, exit_id)
+
+        metrics.increment('cfg.functions_built', len(pending))
+        self.__record_size()
+
+    def get_analysis(self, starting_node: str, ending_node: str) -> CFGAnalysis:
+        '''
+        Get the dominance and loop structure of the CFG between two nodes,
+        computed on the first request and cached thereafter
+        '''
+
+        key = (starting_node, ending_node)
+
+        if key not in self.analyses:
+            analysis = CFGAnalysis(
+                self.cfg_metadata, starting_node, ending_node)
+            analysis.compute()
+            self.analyses[key] = analysis
+
+        return self.analyses[key]
+
+    def generate_dot(self, annotations: Dict[str, str] = None) -> str:
+        '''
+        Traverse the CFG and generate a Graphviz Digraph DOT file,
+        annotating the nodes with the given labels (e.g., the numbers of a ConvergenceTracer)
         '''
         graph = Digraph(comment='Control Flow Graph')
         visited = set()
@@ -84,13 +192,14 @@ class ControlFlowGraph(object):
             # get node instance / object
             node = cfg_metadata.get_node(node_id)
 
-            print(node_id)
+            logger.log(TRACE, '%s next: %s prev: %s', node_id,
+                       getattr(node, 'next_nodes', None),
+                       getattr(node, 'prev_nodes', None))
 
-            graph.node(node_id, label=node_id)
-
-            print(
-                getattr(node, 'next_nodes', None),
-                getattr(node, 'prev_nodes', None))
+            if annotations is not None and node_id in annotations:
+                graph.node(node_id, label=f'{node_id}\\n{annotations[node_id]}')
+            else:
+                graph.node(node_id, label=node_id)
 
             for child_id in node.next_nodes:
                 child_node = cfg_metadata.get_node(child_id)
@@ -104,9 +213,10 @@ class ControlFlowGraph(object):
 
         graph.render(filename='./gen/cfg.png')
 
-    def generate_dot_bottom_up(self) -> str:
+    def generate_dot_bottom_up(self, annotations: Dict[str, str] = None) -> str:
         '''
-        Traverse the CFG and generate a Graphviz Digraph DOT file
+        Traverse the CFG and generate a Graphviz Digraph DOT file,
+        annotating the nodes with the given labels (e.g., the numbers of a ConvergenceTracer)
         '''
         graph = Digraph(comment='Control Flow Graph')
         visited = set()
@@ -125,13 +235,14 @@ class ControlFlowGraph(object):
             # get node instance / object
             node = cfg_metadata.get_node(node_id)
 
-            print(node_id)
-
-            graph.node(node_id, label=node_id)
+            logger.log(TRACE, '%s next: %s prev: %s', node_id,
+                       getattr(node, 'next_nodes', None),
+                       getattr(node, 'prev_nodes', None))
 
-            print(
-                getattr(node, 'next_nodes', None),
-                getattr(node, 'prev_nodes', None))
+            if annotations is not None and node_id in annotations:
+                graph.node(node_id, label=f'{node_id}\\n{annotations[node_id]}')
+            else:
+                graph.node(node_id, label=node_id)
 
             for child_id in node.prev_nodes:
                 child_node = cfg_metadata.get_node(child_id)
@@ -0,0 +1,284 @@
+'''
+The CFG Analysis Module
+
+Computes the structural properties of the CFG between a starting and an ending node:
+the dominator and post-dominator trees, the dominance frontiers, the loop nesting forest
+and a weak topological ordering (WTO) of the nodes. The fixed point engines use them
+to select the widening points and the iteration order, and the SSA form is built on them.
+
+An instance is computed once per (starting node, ending node) pair,
+and cached on the ControlFlowGraph (see ControlFlowGraph.get_analysis).
+'''
+from typing import Dict, List, Set, Union
+from collections import defaultdict
+from control_flow_graph.node_processor import CFGMetadata
+from control_flow_graph.helpers import get_successors, get_predecessors_map, get_reverse_post_order
+from control_flow_graph.helpers import get_immediate_dominators, get_immediate_post_dominators, get_dominance_frontiers
+from control_flow_graph.analysis.objects import Loop, WTOComponent
+
+
+class CFGAnalysis(object):
+    '''
+    Class computing the dominance and loop structure of the CFG
+    '''
+
+    def __init__(self, cfg_metadata: CFGMetadata, starting_node: str, ending_node: str):
+        '''
+        Constructor
+        '''
+
+        self.cfg_metadata = cfg_metadata
+        self.starting_node = starting_node
+        self.ending_node = ending_node
+
+        # the nodes in reverse post-order, their positions, and the edges of the sub-graph
+        self.nodes = list()
+        self.rpo_position = dict()
+        self.successors = dict()
+        self.predecessors = dict()
+
+        # the dominator tree (immediate dominators and children) and the dominance frontiers
+        self.idom = dict()
+        self.dominator_children = defaultdict(list)
+        self.frontiers = dict()
+
+        # the post-dominator tree (immediate post-dominators and children)
+        self.ipdom = dict()
+        self.post_dominator_children = defaultdict(list)
+
+        # the loop nesting forest, as a mapping of the loop header to the loop,
+        # the outermost loops, and the innermost loop of every node
+        self.loops = dict()
+        self.root_loops = list()
+        self.node_loop = dict()
+
+        # the weak topological ordering of the nodes
+        self.wto = list()
+
+        # the pre and post DFS numbering of the dominator trees, for constant time queries
+        self.__dom_numbering = dict()
+        self.__post_dom_numbering = dict()
+
+    def compute(self) -> None:
+        '''
+        Compute the CFG analysis
+        '''
+
+        self.__compute_graph()
+        self.__compute_dominators()
+        self.__compute_post_dominators()
+        self.__compute_loops()
+
+        self.wto = self.__compute_wto_elements(None)
+
+    def dominates(self, dominator: str, node_id: str) -> bool:
+        '''
+        Check if a node dominates another (every node dominates itself)
+        '''
+
+        return self.__is_ancestor(self.__dom_numbering, dominator, node_id)
+
+    def post_dominates(self, post_dominator: str, node_id: str) -> bool:
+        '''
+        Check if a node post-dominates another (every node post-dominates itself)
+        '''
+
+        return self.__is_ancestor(self.__post_dom_numbering, post_dominator, node_id)
+
+    def get_loop(self, node_id: str) -> Union[Loop, None]:
+        '''
+        Get the innermost loop containing a node, if any
+        '''
+
+        return self.node_loop.get(node_id, None)
+
+    def is_loop_header(self, node_id: str) -> bool:
+        '''
+        Check if a node is the header of a loop
+        '''
+
+        return node_id in self.loops
+
+    def get_widening_points(self) -> Set[str]:
+        '''
+        Get the widening points, i.e., the loop headers
+        (which are also the heads of the WTO components)
+        '''
+
+        return set(self.loops.keys())
+
+    def get_wto(self) -> List[Union[str, WTOComponent]]:
+        '''
+        Get the weak topological ordering of the nodes
+        '''
+
+        return self.wto
+
+    def __compute_graph(self) -> None:
+        '''
+        Compute the nodes and edges of the sub-graph
+        '''
+
+        self.nodes = get_reverse_post_order(
+            self.cfg_metadata, self.starting_node, self.ending_node)
+        self.rpo_position = {node_id: i for i,
+                             node_id in enumerate(self.nodes)}
+
+        self.predecessors = get_predecessors_map(
+            self.cfg_metadata, self.starting_node, self.ending_node)
+        self.successors = {node_id: get_successors(self.cfg_metadata, node_id, self.ending_node)
+                           for node_id in self.nodes}
+
+    def __compute_dominators(self) -> None:
+        '''
+        Compute the dominator tree and the dominance frontiers
+        '''
+
+        self.idom = get_immediate_dominators(
+            self.cfg_metadata, self.starting_node, self.ending_node)
+        self.frontiers = get_dominance_frontiers(
+            self.cfg_metadata, self.starting_node, self.ending_node, self.idom)
+
+        # the children are listed in reverse post-order
+        for node_id in self.nodes:
+            if node_id != self.starting_node:
+                self.dominator_children[self.idom[node_id]].append(node_id)
+
+        self.__dom_numbering = self.__number_tree(
+            self.starting_node, self.dominator_children)
+
+    def __compute_post_dominators(self) -> None:
+        '''
+        Compute the post-dominator tree
+        '''
+
+        self.ipdom = get_immediate_post_dominators(
+            self.cfg_metadata, self.starting_node, self.ending_node)
+
+        if len(self.ipdom) == 0:
+            return
+
+        for node_id in reversed(self.nodes):
+            if node_id in self.ipdom and node_id != self.ending_node:
+                self.post_dominator_children[self.ipdom[node_id]].append(
+                    node_id)
+
+        self.__post_dom_numbering = self.__number_tree(
+            self.ending_node, self.post_dominator_children)
+
+    def __compute_loops(self) -> None:
+        '''
+        Compute the loop nesting forest from the back edges,
+        i.e., the edges whose target dominates their source.
+
+        The structured statements of Solidity always yield reducible graphs,
+        hence every cycle of the CFG is a natural loop.
+        '''
+
+        for node_id in self.nodes:
+            for child_id in self.successors[node_id]:
+                if not self.dominates(child_id, node_id):
+                    continue
+
+                # back edge, collect the natural loop of the header
+                if child_id not in self.loops:
+                    self.loops[child_id] = Loop(child_id)
+                loop = self.loops[child_id]
+                loop.latches.add(node_id)
+
+                # walk backwards from the latch till the header
+                worklist = [node_id]
+                while len(worklist) != 0:
+                    body_id = worklist.pop()
+                    if body_id in loop.nodes:
+                        continue
+
+                    loop.nodes.add(body_id)
+                    worklist.extend(self.predecessors[body_id])
+
+        # nest the loops, the parent of a loop is the smallest loop strictly containing it
+        ordered_loops = sorted(self.loops.values(),
+                               key=lambda loop: len(loop.nodes), reverse=True)
+        for i, loop in enumerate(ordered_loops):
+            for outer_loop in reversed(ordered_loops[:i]):
+                if loop.header in outer_loop.nodes:
+                    loop.parent = outer_loop
+                    break
+
+            if loop.parent is None:
+                self.root_loops.append(loop)
+            else:
+                loop.parent.children.append(loop)
+                loop.depth = loop.parent.depth + 1
+
+            # the loops are visited from the outermost, so the innermost loop is assigned last
+            for node_id in loop.nodes:
+                self.node_loop[node_id] = loop
+
+        # keep the nested loops in the order of their headers
+        self.root_loops.sort(key=lambda loop: self.rpo_position[loop.header])
+        for loop in self.loops.values():
+            loop.children.sort(
+                key=lambda child: self.rpo_position[child.header])
+
+    def __compute_wto_elements(self, loop: Union[Loop, None]) -> List[Union[str, WTOComponent]]:
+        '''
+        Compute the elements of the WTO of a loop body (or of the whole graph),
+        every nested loop being collapsed into a component headed by the loop header.
+
+        In a reducible graph, all the edges into a loop target the header,
+        hence ordering the elements by the reverse post-order of their nodes
+        (headers for the components) is a topological order of the collapsed body.
+        '''
+
+        # the nodes directly in the body, i.e., not inside a nested loop
+        members = [node_id for node_id in self.nodes
+                   if self.node_loop.get(node_id, None) is loop
+                   and (loop is None or node_id != loop.header)]
+        nested_loops = loop.children if loop is not None else self.root_loops
+
+        positioned = [(self.rpo_position[node_id], node_id)
+                      for node_id in members]
+        positioned += [(self.rpo_position[nested_loop.header],
+                        WTOComponent(nested_loop.header, self.__compute_wto_elements(nested_loop)))
+                       for nested_loop in nested_loops]
+        positioned.sort(key=lambda item: item[0])
+
+        return [element for _, element in positioned]
+
+    @staticmethod
+    def __number_tree(root: str, children: Dict[str, List[str]]) -> Dict[str, tuple]:
+        '''
+        Compute the pre and post DFS numbers of the nodes of a tree (iteratively)
+        '''
+
+        numbering = dict()
+        counter = 0
+        stack = [(root, True)]
+
+        while len(stack) != 0:
+            node_id, entering = stack.pop()
+
+            if entering:
+                numbering[node_id] = counter
+                stack.append((node_id, False))
+                for child_id in reversed(children[node_id]):
+                    stack.append((child_id, True))
+            else:
+                numbering[node_id] = (numbering[node_id], counter)
+
+            counter += 1
+
+        return numbering
+
+    @staticmethod
+    def __is_ancestor(numbering: Dict[str, tuple], ancestor: str, node_id: str) -> bool:
+        '''
+        Check if a node is an ancestor of another in a numbered tree
+        '''
+
+        if ancestor not in numbering or node_id not in numbering:
+            return False
+
+        return numbering[ancestor][0] <= numbering[node_id][0] and \
+            numbering[node_id][1] <= numbering[ancestor][1]
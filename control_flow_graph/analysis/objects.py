@@ -0,0 +1,68 @@
+'''
+Auxiliary Objects Module for the CFG Analysis
+'''
+from typing import List, Set, Union
+
+
+class Loop(object):
+    '''
+    Class representing a natural loop of the CFG, a node of the loop nesting forest
+    '''
+
+    def __init__(self, header: str):
+        '''
+        Constructor
+        '''
+
+        # the loop head, dominating all the nodes of the loop
+        self.header = header
+
+        # the nodes of the loop (including the header and the nested loops)
+        self.nodes = set([header])
+
+        # the sources of the back edges into the header
+        self.latches = set()
+
+        # the enclosing and nested loops in the loop nesting forest
+        self.parent = None
+        self.children = list()
+
+        # the nesting depth of the loop, outermost loops being at depth 1
+        self.depth = 1
+
+    def __repr__(self) -> str:
+        return f'Loop({self.header}, depth={self.depth}, nodes={len(self.nodes)})'
+
+
+class WTOComponent(object):
+    '''
+    Class representing a component of a weak topological ordering (WTO),
+    i.e., a head followed by the (nested) elements to be iterated till stable
+    '''
+
+    def __init__(self, head: str, elements: List[Union[str, 'WTOComponent']]):
+        '''
+        Constructor
+        '''
+
+        self.head = head
+        self.elements = elements
+
+    def get_nodes(self) -> Set[str]:
+        '''
+        Get all the nodes of the component, including the head
+        '''
+
+        nodes = set([self.head])
+        for element in self.elements:
+            if isinstance(element, WTOComponent):
+                nodes.update(element.get_nodes())
+            else:
+                nodes.add(element)
+
+        return nodes
+
+    def __repr__(self) -> str:
+        elements = ' '.join(repr(element) if isinstance(element, WTOComponent) else element
+                            for element in self.elements)
+        return f'({self.head} {elements})'
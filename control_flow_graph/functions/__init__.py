@@ -0,0 +1,164 @@
+'''
+The Function CFG Module
+
+Indexes the function definitions of the AST, and builds the CFG of each function
+separately (on demand, or eagerly in a process pool). Every function is built in
+its own metadata store, with the node ids namespaced by the function key, i.e.,
+f'{contract}.{function}:{node_type}_{n}' (the overloaded functions being keyed by their
+parameter types as well, i.e., f'{contract}.{function}({types})'), so the ids are stable
+irrespective of which functions are built and in what order, and across the compilations. The stores are then merged into the
+metadata store of the ControlFlowGraph.
+'''
+import json
+import hashlib
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from control_flow_graph.node_processor import CFGMetadata
+from control_flow_graph.node_processor.nodes import FunctionDefinition
+
+# the data locations of the parameter types, left out of the signatures of the overloaded functions
+DATA_LOCATIONS = ('memory', 'storage', 'calldata', 'pointer', 'ref')
+
+# the AST keys which do not affect the CFG (or the analyses), but differ between compilations
+NOISE_KEYS = ('id', 'src', 'scope', 'nameLocation',
+              'referencedDeclaration', 'overloadedDeclarations')
+
+
+def get_function_name(ast_node: dict) -> str:
+    '''
+    Get the name of a function definition,
+    naming the unnamed ones (constructors, fallback and receive functions) by their kind
+    '''
+
+    if ast_node.get('name', ''):
+        return ast_node['name']
+
+    if ast_node.get('isConstructor', False):
+        return 'constructor'
+
+    return ast_node.get('kind', None) or 'fallback'
+
+
+def get_parameter_types(ast_node: dict) -> str:
+    '''
+    Get the parameter types of a function definition, separated by commas
+    (without their data locations, e.g., 'uint256,bytes')
+    '''
+
+    types = list()
+
+    for parameter in (ast_node.get('parameters', None) or dict()).get('parameters', list()):
+        type_string = (parameter.get('typeDescriptions', None) or dict()).get('typeString', None) \
+            or (parameter.get('typeName', None) or dict()).get('name', '')
+
+        types.append(' '.join(word for word in type_string.split() if word not in DATA_LOCATIONS))
+
+    return ','.join(types)
+
+
+def index_functions(ast: dict) -> Dict[str, dict]:
+    '''
+    Index the (implemented) function definitions of the source unit,
+    as a mapping of the function key f'{contract}.{function}' to the AST node
+    (f'{contract}.{function}({types})' for the overloaded functions)
+    '''
+
+    definitions = list()
+
+    for contract in ast.get('nodes', list()):
+        if contract.get('nodeType', None) != 'ContractDefinition':
+            continue
+
+        for child in contract.get('nodes', list()):
+            # only the functions with a body have a CFG
+            if child.get('nodeType', None) != 'FunctionDefinition' or child.get('body', None) is None:
+                continue
+
+            definitions.append((f"{contract['name']}.{get_function_name(child)}", child))
+
+    # overloaded functions are told apart by their parameter types
+    # (unlike their AST ids, the same in every compilation of the source)
+    overloads = Counter(key for key, _ in definitions)
+
+    index = dict()
+    for key, child in definitions:
+        if overloads[key] > 1:
+            key = f'{key}({get_parameter_types(child)})'
+
+        index[key] = child
+
+    return index
+
+
+def get_structural_hash(ast_node: dict) -> str:
+    '''
+    Get the structural hash of an AST subtree, ignoring the noise keys
+    (ids and source locations), so that a function which is unchanged
+    by an edit elsewhere in the source keeps the same hash
+    '''
+
+    def strip(value: Any) -> Any:
+        '''
+        Recursively strip the noise keys from the AST
+        '''
+
+        if isinstance(value, dict):
+            return {key: strip(child) for key, child in value.items() if key not in NOISE_KEYS}
+        if isinstance(value, list):
+            return [strip(child) for child in value]
+        return value
+
+    canonical = json.dumps(strip(ast_node), sort_keys=True, separators=(',', ':'))
+
+    return hashlib.sha256(canonical.encode('utf8')).hexdigest()
+
+
+def extract_function(cfg_metadata: CFGMetadata, function_key: str) -> CFGMetadata:
+    '''
+    Extract the nodes of a function (built with the namespaced ids) into a new metadata store
+    '''
+
+    function_metadata = CFGMetadata(f'{function_key}:')
+
+    for node_id, node in cfg_metadata.node_table.items():
+        if node_id.startswith(function_metadata.id_prefix):
+            function_metadata.node_table[node_id] = node
+
+    return function_metadata
+
+
+def build_function(function_key: str, ast_node: dict) -> Tuple[CFGMetadata, str, str]:
+    '''
+    Build the CFG of a function in its own (namespaced) metadata store,
+    and return the store along with the ids of the function's entry and exit nodes.
+
+    This is a module level function, so that it can be run in a process pool.
+    '''
+
+    cfg_metadata = CFGMetadata(f'{function_key}:')
+
+    # the function is built detached from the source unit (no entry, previous or exit node)
+    function_node = FunctionDefinition(ast_node, None, None,
+                                       None, cfg_metadata)
+
+    entry_id = next(iter(function_node.next_nodes))
+    exit_id = next(iter(function_node.get_leaf_nodes()))
+
+    return cfg_metadata, entry_id, exit_id
+
+
+def build_functions(functions: List[Tuple[str, dict]], processes=None) -> List[Tuple[CFGMetadata, str, str]]:
+    '''
+    Build the CFGs of the functions in a process pool
+    (with processes=1, the functions are built in the current process)
+    '''
+
+    if processes == 1 or len(functions) <= 1:
+        return [build_function(key, ast_node) for key, ast_node in functions]
+
+    keys = [key for key, _ in functions]
+    ast_nodes = [ast_node for _, ast_node in functions]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(build_function, keys, ast_nodes))
@@ -0,0 +1,108 @@
+'''
+The Incremental CFG Builder
+
+Rebuilds the CFG of an edited source, reusing the subgraphs (and the cached analyses)
+of the functions whose AST subtree is structurally unchanged since the previous build,
+so that only the changed functions are rebuilt and re-analysed.
+'''
+from typing import Any, Callable, List
+from control_flow_graph import ControlFlowGraph
+import control_flow_graph.functions as functions
+
+
+class IncrementalCFGBuilder(object):
+    '''
+    Class building the per-function CFGs of successive versions of a source
+    '''
+
+    def __init__(self, processes=None):
+        '''
+        Constructor
+        '''
+
+        # the number of processes to build the changed functions with
+        self.processes = processes
+
+        # the latest built CFG
+        self.cfg = None
+
+        # mapping of the function key to the structural hash of its AST subtree
+        self.function_hashes = dict()
+
+        # mapping of the function key to the cached results of the analyses (name -> result)
+        self.function_results = dict()
+
+        # the functions rebuilt / reused by the latest build
+        self.changed_functions = list()
+        self.reused_functions = list()
+
+    def build(self, source: str, ast: dict) -> ControlFlowGraph:
+        '''
+        Build the CFGs of all the functions of the source,
+        reusing the unchanged functions of the previous build
+        '''
+
+        cfg = ControlFlowGraph(source, ast)
+        index = cfg.index_functions()
+        hashes = {function_key: functions.get_structural_hash(ast_node)
+                  for function_key, ast_node in index.items()}
+
+        self.changed_functions = list()
+        self.reused_functions = list()
+
+        for function_key in index:
+            if self.cfg is not None and self.function_hashes.get(function_key, None) == hashes[function_key]:
+                self.__reuse_function(cfg, function_key)
+                self.reused_functions.append(function_key)
+            else:
+                self.changed_functions.append(function_key)
+
+        # build the changed functions (in a process pool)
+        cfg.build_function_cfgs(self.changed_functions, self.processes)
+
+        # drop the results of the changed and removed functions
+        self.function_results = {function_key: results for function_key, results in self.function_results.items()
+                                 if function_key in self.reused_functions}
+
+        self.cfg = cfg
+        self.function_hashes = hashes
+
+        return cfg
+
+    def get_result(self, function_key: str, name: str, compute: Callable[[ControlFlowGraph, str, str], Any]) -> Any:
+        '''
+        Get the result of an analysis of a function, computing it as
+        compute(cfg, entry_node, exit_node) only if the function changed since it was last computed
+        '''
+
+        results = self.function_results.setdefault(function_key, dict())
+
+        if name not in results:
+            entry_id, exit_id = self.cfg.get_function_entry(function_key)
+            results[name] = compute(self.cfg, entry_id, exit_id)
+
+        return results[name]
+
+    def get_changed_functions(self) -> List[str]:
+        '''
+        Get the functions rebuilt by the latest build
+        '''
+
+        return self.changed_functions
+
+    def __reuse_function(self, cfg: ControlFlowGraph, function_key: str) -> None:
+        '''
+        Move the subgraph and the cached CFG analysis of an unchanged function
+        from the previous CFG to the new one
+        '''
+
+        entry_id, exit_id = self.cfg.function_cfgs[function_key]
+
+        cfg.cfg_metadata.merge(functions.extract_function(
+            self.cfg.cfg_metadata, function_key))
+        cfg.function_cfgs[function_key] = (entry_id, exit_id)
+
+        analysis = self.cfg.analyses.get((entry_id, exit_id), None)
+        if analysis is not None:
+            analysis.cfg_metadata = cfg.cfg_metadata
+            cfg.analyses[(entry_id, exit_id)] = analysis
@@ -0,0 +1,217 @@
+'''
+The CFG Helpers Module
+
+Provides graph traversal utilities shared by the analyses running over the CFG.
+All traversals are iterative, so deep graphs do not hit the recursion limit.
+'''
+from typing import Callable, List, Dict, Set
+from control_flow_graph.node_processor import CFGMetadata
+
+
+def get_successors(cfg_metadata: CFGMetadata, node_id: str, ending_node: str) -> List[str]:
+    '''
+    Get the successors of a node, treating the ending node as a sink
+    '''
+
+    # the traversal of the analyses stops at the ending node
+    if node_id == ending_node:
+        return list()
+
+    return list(cfg_metadata.get_node(node_id).next_nodes.keys())
+
+
+def get_reachable_nodes(cfg_metadata: CFGMetadata, starting_node: str, ending_node: str) -> List[str]:
+    '''
+    Get the nodes reachable from the starting node (in DFS pre-order),
+    without traversing past the ending node
+    '''
+
+    visited, order = set(), list()
+    stack = [starting_node]
+
+    while len(stack) != 0:
+        node_id = stack.pop()
+
+        if node_id in visited:
+            continue
+
+        # add to visited set and record the order
+        visited.add(node_id)
+        order.append(node_id)
+
+        # push the successors in reverse, so that they are visited in order
+        for child_id in reversed(get_successors(cfg_metadata, node_id, ending_node)):
+            if child_id not in visited:
+                stack.append(child_id)
+
+    return order
+
+
+def get_predecessors_map(cfg_metadata: CFGMetadata, starting_node: str, ending_node: str) -> Dict[str, List[str]]:
+    '''
+    Get the mapping of node id to its predecessors,
+    restricted to the sub-graph reachable from the starting node
+    '''
+
+    nodes = get_reachable_nodes(cfg_metadata, starting_node, ending_node)
+    predecessors = {node_id: list() for node_id in nodes}
+
+    for node_id in nodes:
+        for child_id in get_successors(cfg_metadata, node_id, ending_node):
+            predecessors[child_id].append(node_id)
+
+    return predecessors
+
+
+def get_post_order(cfg_metadata: CFGMetadata, starting_node: str, ending_node: str) -> List[str]:
+    '''
+    Get the DFS post-order of the nodes reachable from the starting node
+    '''
+
+    return _get_post_order(starting_node, lambda node_id: get_successors(cfg_metadata, node_id, ending_node))
+
+
+def get_reverse_post_order(cfg_metadata: CFGMetadata, starting_node: str, ending_node: str) -> List[str]:
+    '''
+    Get the reverse post-order (RPO) of the nodes reachable from the starting node.
+    In RPO, every node appears before its successors, except along back edges.
+    '''
+
+    return list(reversed(get_post_order(cfg_metadata, starting_node, ending_node)))
+
+
+def get_immediate_dominators(cfg_metadata: CFGMetadata, starting_node: str, ending_node: str) -> Dict[str, str]:
+    '''
+    Get the immediate dominator of every node reachable from the starting node,
+    using the iterative algorithm of Cooper, Harvey and Kennedy.
+    The starting node is its own immediate dominator.
+    '''
+
+    order = get_reverse_post_order(cfg_metadata, starting_node, ending_node)
+    predecessors = get_predecessors_map(
+        cfg_metadata, starting_node, ending_node)
+
+    return _get_immediate_dominators(order, predecessors)
+
+
+def get_immediate_post_dominators(cfg_metadata: CFGMetadata, starting_node: str, ending_node: str) -> Dict[str, str]:
+    '''
+    Get the immediate post-dominator of every node reachable from the starting node,
+    i.e., the immediate dominators over the reversed graph rooted at the ending node.
+    The nodes which cannot reach the ending node (e.g., infinite loops) are left out.
+    '''
+
+    predecessors = get_predecessors_map(
+        cfg_metadata, starting_node, ending_node)
+
+    if ending_node not in predecessors:
+        return dict()
+
+    # the successors in the reversed graph are the predecessors, and vice versa
+    order = list(reversed(_get_post_order(
+        ending_node, lambda node_id: predecessors[node_id])))
+    reverse_predecessors = {node_id: get_successors(cfg_metadata, node_id, ending_node)
+                            for node_id in order}
+
+    return _get_immediate_dominators(order, reverse_predecessors)
+
+
+def get_dominance_frontiers(cfg_metadata: CFGMetadata, starting_node: str, ending_node: str,
+                            idom: Dict[str, str] = None) -> Dict[str, Set[str]]:
+    '''
+    Get the dominance frontier of every node reachable from the starting node
+    '''
+
+    if idom is None:
+        idom = get_immediate_dominators(
+            cfg_metadata, starting_node, ending_node)
+
+    predecessors = get_predecessors_map(
+        cfg_metadata, starting_node, ending_node)
+    frontiers = {node_id: set() for node_id in predecessors}
+
+    for node_id, prev_nodes in predecessors.items():
+        # only the join points can be in a dominance frontier
+        if len(prev_nodes) < 2:
+            continue
+
+        for prev_id in prev_nodes:
+            runner = prev_id
+            while runner != idom[node_id]:
+                frontiers[runner].add(node_id)
+                runner = idom[runner]
+
+    return frontiers
+
+
+def _get_post_order(root: str, get_children: Callable[[str], List[str]]) -> List[str]:
+    '''
+    Get the DFS post-order of the nodes reachable from the root,
+    with the children of a node given by the callable
+    '''
+
+    visited, order = set([root]), list()
+
+    # each stack frame holds the node id and the iterator over its children
+    stack = [(root, iter(get_children(root)))]
+
+    while len(stack) != 0:
+        node_id, children = stack[-1]
+
+        # descend into the first unvisited child, if any
+        for child_id in children:
+            if child_id not in visited:
+                visited.add(child_id)
+                stack.append((child_id, iter(get_children(child_id))))
+                break
+        else:
+            # all the children are done, hence the node is finished
+            stack.pop()
+            order.append(node_id)
+
+    return order
+
+
+def _get_immediate_dominators(order: List[str], predecessors: Dict[str, List[str]]) -> Dict[str, str]:
+    '''
+    The iterative algorithm of Cooper, Harvey and Kennedy,
+    over the nodes in reverse post-order (the first node being the root)
+    '''
+
+    root = order[0]
+
+    # the position of the nodes in the reverse post-order
+    position = {node_id: i for i, node_id in enumerate(order)}
+
+    idom = {root: root}
+
+    def intersect(finger_1: str, finger_2: str) -> str:
+        '''
+        Walk up the dominator tree from both the nodes till they meet
+        '''
+
+        while finger_1 != finger_2:
+            while position[finger_1] > position[finger_2]:
+                finger_1 = idom[finger_1]
+            while position[finger_2] > position[finger_1]:
+                finger_2 = idom[finger_2]
+
+        return finger_1
+
+    changed = True
+    while changed:
+        changed = False
+
+        for node_id in order[1:]:
+            # start with any processed predecessor, and intersect with the rest
+            processed = [prev_id for prev_id in predecessors[node_id]
+                         if prev_id in idom]
+            new_idom = processed[0]
+            for prev_id in processed[1:]:
+                new_idom = intersect(prev_id, new_idom)
+
+            if idom.get(node_id, None) != new_idom:
+                idom[node_id] = new_idom
+                changed = True
+
+    return idom
@@ -115,7 +115,7 @@ class CFGMetadata(object):
     Metadata Container Class Definition
     '''
 
-    def __init__(self):
+    def __init__(self, id_prefix=''):
         # this contains the mapping of Node ID to node object
         self.node_table = dict()
 
@@ -123,13 +123,17 @@ class CFGMetadata(object):
         # the count of that type of nodes
         self.node_count = defaultdict(int)
 
+        # the prefix of the node ids, to namespace the nodes of the graphs
+        # built separately (e.g., per function) and merged later
+        self.id_prefix = id_prefix
+
     def register_node(self, node_pointer: NodeInterface, node_type: str) -> str:
         '''
         Register and Return the Node's Given ID
         '''
 
         # generate the node id (starts from 0)
-        node_id = f'{node_type}_{self.node_count[node_type]}'
+        node_id = f'{self.id_prefix}{node_type}_{self.node_count[node_type]}'
 
         # and increment the node type count
         self.node_count[node_type] += 1
@@ -147,6 +151,20 @@ class CFGMetadata(object):
 
         return self.node_table.get(node_id, None)
 
+    def merge(self, cfg_metadata: 'CFGMetadata') -> None:
+        '''
+        Merge the nodes of another metadata store into this one
+        (the node ids of both the stores need to be disjoint, i.e., differently prefixed)
+        '''
+
+        for node_id, node in cfg_metadata.node_table.items():
+            if node_id in self.node_table:
+                raise Exception(f'Node with id {node_id} already registered!')
+
+            # the node now resolves its neighbours through this store
+            node.cfg_metadata = self
+            self.node_table[node_id] = node
+
 
 class Node(NodeInterface):
     '''
@@ -186,7 +204,7 @@ class Node(NodeInterface):
 
         # set the source map in the form (s:l:i)
         # s = start index, l = length, i = index
-        self.src_map = (int(i) for i in ast_node['src'].split(':')) \
+        self.src_map = tuple(int(i) for i in ast_node['src'].split(':')) \
             if 'src' in ast_node else None
 
         # set the ast id, if available
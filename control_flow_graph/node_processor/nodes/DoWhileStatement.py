@@ -7,6 +7,9 @@ import control_flow_graph.node_processor.nodes as nodes
 from control_flow_graph.node_processor.nodes.extra_nodes.do_while_loop.entry import DoWhileLoopEntry
 from control_flow_graph.node_processor.nodes.extra_nodes.do_while_loop.join import DoWhileLoopJoin
 from control_flow_graph.node_processor.nodes.extra_nodes.do_while_loop.continuee import DoWhileLoopContinue
+from instrumentation import get_logger, TRACE
+
+logger = get_logger('cfg')
 
 
 class DoWhileStatement(Node):
@@ -31,7 +34,7 @@ class DoWhileStatement(Node):
         # obtain a CFG ID of the form f'{node_type}_{n}'
         self.cfg_id = cfg_metadata.register_node(self, self.node_type)
 
-        print(f'Processing CFG Node {self.cfg_id}')
+        logger.log(TRACE, 'Processing CFG Node %s', self.cfg_id)
 
         # node specific metadata
         self.condition = ast_node.get('condition', dict())
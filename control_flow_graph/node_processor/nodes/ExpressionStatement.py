@@ -5,6 +5,9 @@ from control_flow_graph.node_processor import CFGMetadata
 from control_flow_graph.node_processor import BasicBlockTypes
 from control_flow_graph.node_processor import Node
 import control_flow_graph.node_processor.nodes as nodes
+from instrumentation import get_logger, TRACE
+
+logger = get_logger('cfg')
 
 
 class ExpressionStatement(Node):
@@ -32,7 +35,7 @@ class ExpressionStatement(Node):
         # obtain a CFG ID of the form f'{node_type}_{n}'
         self.cfg_id = cfg_metadata.register_node(self, self.node_type)
 
-        print(f'Processing CFG Node {self.cfg_id}')
+        logger.log(TRACE, 'Processing CFG Node %s', self.cfg_id)
 
         # node specific metadata
         # exported symbols from the source unit
@@ -6,6 +6,9 @@ from control_flow_graph.node_processor import Node, BasicBlockTypes
 import control_flow_graph.node_processor.nodes as nodes
 from control_flow_graph.node_processor.nodes.extra_nodes.function.entry import FunctionEntry
 from control_flow_graph.node_processor.nodes.extra_nodes.function.exit import FunctionExit
+from instrumentation import get_logger, TRACE
+
+logger = get_logger('cfg')
 
 
 class FunctionDefinition(Node):
@@ -33,7 +36,7 @@ class FunctionDefinition(Node):
         # obtain a CFG ID of the form f'{node_type}_{n}'
         self.cfg_id = cfg_metadata.register_node(self, self.node_type)
 
-        print(f'Processing CFG Node {self.cfg_id}')
+        logger.log(TRACE, 'Processing CFG Node %s', self.cfg_id)
 
         # node specific metadata
         self.documentation = ast_node.get('documentation', None)
@@ -68,7 +71,7 @@ class FunctionDefinition(Node):
             # obtain the child node's type
             child_node_type = statement['nodeType']
 
-            print(child_node_type)
+            logger.log(TRACE, 'Function body statement %s', child_node_type)
 
             # obtain the child node's constructor
             childConstructor = getattr(nodes, child_node_type, Node)
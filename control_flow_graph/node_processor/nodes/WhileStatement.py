@@ -6,6 +6,9 @@ from control_flow_graph.node_processor import Node, BasicBlockTypes
 import control_flow_graph.node_processor.nodes as nodes
 from control_flow_graph.node_processor.nodes.extra_nodes.while_loop.join import WhileLoopJoin
 from control_flow_graph.node_processor.nodes.extra_nodes.while_loop.continuee import WhileLoopContinue
+from instrumentation import get_logger, TRACE
+
+logger = get_logger('cfg')
 
 
 class WhileStatement(Node):
@@ -30,7 +33,7 @@ class WhileStatement(Node):
         # obtain a CFG ID of the form f'{node_type}_{n}'
         self.cfg_id = cfg_metadata.register_node(self, self.node_type)
 
-        print(f'Processing CFG Node {self.cfg_id}')
+        logger.log(TRACE, 'Processing CFG Node %s', self.cfg_id)
 
         # node specific metadata
         self.condition = ast_node.get('condition', dict())
@@ -87,7 +90,7 @@ class WhileStatement(Node):
                 to_link = body_prev_statement if len(
                     prev_leaves) == 0 else next(iter(prev_leaves))
 
-                print("TOLINK", body_prev_statement, to_link, prev_leaves)
+                logger.log(TRACE, 'TOLINK %s %s %s', body_prev_statement, to_link, prev_leaves)
 
                 # 3. link the leaf node's next as the current child node
                 self.cfg_metadata.get_node(
@@ -4,6 +4,9 @@ Class definition for the DoWhileLoopJoin CFG (Extra) node
 from control_flow_graph.node_processor import CFGMetadata
 from control_flow_graph.node_processor import BasicBlockTypes
 from control_flow_graph.node_processor import Node
+from instrumentation import get_logger, TRACE
+
+logger = get_logger('cfg')
 
 
 class DoWhileLoopJoin(Node):
@@ -31,7 +34,7 @@ class DoWhileLoopJoin(Node):
         # obtain a CFG ID of the form f'{node_type}_{n}'
         self.cfg_id = cfg_metadata.register_node(self, self.node_type)
 
-        print(f'Processing CFG Node {self.cfg_id}')
+        logger.log(TRACE, 'Processing CFG Node %s', self.cfg_id)
 
     def get_leaf_nodes(self) -> set:
         '''
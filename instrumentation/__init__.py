@@ -0,0 +1,71 @@
+'''
+The Instrumentation Module
+
+Provides the logging layer of safpy, built on the standard logging module.
+Every subsystem logs to its own logger under the 'safpy' namespace:
+
+    safpy.cfg        - CFG construction and rendering
+    safpy.semantics  - concrete collecting semantics
+    safpy.abstract   - abstract (interval) collecting semantics
+    safpy.dataflow   - dataflow analyses
+    safpy.pipeline   - asynchronous compilation and analysis pipeline
+
+Nothing is emitted unless logging is configured (see configure_logging). The
+per-node / per-iteration trace points log at the TRACE level (below DEBUG),
+and the ones formatting expensive objects (e.g., APRON boxes) are guarded by
+logger.isEnabledFor, so disabled trace points cost a single level check.
+
+The timings and counters of the phases are recorded by the metrics module
+(see instrumentation.metrics).
+'''
+import sys
+import logging
+from typing import Iterable, TextIO, Union
+
+# the trace level, for the per-node and per-iteration messages
+TRACE = 5
+logging.addLevelName(TRACE, 'TRACE')
+
+# the root logger of safpy, silent by default
+ROOT_LOGGER_NAME = 'safpy'
+logging.getLogger(ROOT_LOGGER_NAME).addHandler(logging.NullHandler())
+logging.getLogger(ROOT_LOGGER_NAME).setLevel(logging.WARNING)
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    '''
+    Get the logger of a subsystem
+    '''
+
+    return logging.getLogger(f'{ROOT_LOGGER_NAME}.{subsystem}')
+
+
+def configure_logging(level: Union[int, str] = logging.INFO, subsystems: Iterable[str] = None,
+                      stream: TextIO = None) -> None:
+    '''
+    Configure the logging of safpy, at the given level (e.g., 'DEBUG' or 'TRACE'),
+    either for all the subsystems or only the given ones
+    '''
+
+    if isinstance(level, str):
+        level = TRACE if level.upper() == 'TRACE' else logging.getLevelName(
+            level.upper())
+
+    root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+
+    # replace the handlers of a previous configuration
+    for handler in list(root_logger.handlers):
+        if not isinstance(handler, logging.NullHandler):
+            root_logger.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root_logger.addHandler(handler)
+
+    if subsystems is None:
+        root_logger.setLevel(level)
+    else:
+        for subsystem in subsystems:
+            get_logger(subsystem).setLevel(level)
@@ -0,0 +1,180 @@
+'''
+The Convergence Tracer
+
+Traces the convergence of the fixed point computation of the (concrete or abstract)
+collecting semantics: for every evaluation of a node, whether its entry state changed
+since its previous evaluation, the size and width of the state (as measured by the
+PointState of the engine), and the time spent in the transfer function of the node.
+The changes are grouped by the rounds of the components (loops) of the WTO, numbered
+in their order of computation across all the components (the engines mark the start
+and the end of every round), as the nodes of a component are evaluated once per round.
+
+The summary ranks the hot nodes (the ones which keep changing, or take the most time),
+which are usually the heads of the loops needing widening thresholds or restructuring,
+and the per node numbers can be annotated on the CFG (see ControlFlowGraph.generate_dot).
+'''
+from typing import Any, Dict, List, Set
+
+
+class NodeTrace(object):
+    '''
+    Class representing the convergence trace of a node
+    '''
+
+    def __init__(self, node_id: str, node_type: str):
+        '''
+        Constructor
+        '''
+
+        self.node_id = node_id
+        self.node_type = node_type
+
+        # the number of evaluations of the node, and how many of them changed its entry state
+        self.evaluations = 0
+        self.changes = 0
+
+        # the latest round in which the entry state changed
+        self.last_change = 0
+
+        # the total time spent in the transfer function of the node (seconds)
+        self.transfer_time = 0.0
+
+        # the latest and largest size and width of the entry state
+        self.size = 0
+        self.max_size = 0
+        self.width = 0
+        self.max_width = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        '''
+        Get the trace of the node as a plain python object
+        '''
+
+        return {
+            'node_type': self.node_type,
+            'evaluations': self.evaluations,
+            'changes': self.changes,
+            'last_change': self.last_change,
+            'transfer_time': self.transfer_time,
+            'size': self.size,
+            'max_size': self.max_size,
+            'width': self.width,
+            'max_width': self.max_width
+        }
+
+
+class ConvergenceTracer(object):
+    '''
+    Class tracing the convergence of a fixed point computation
+    '''
+
+    # the orderings of the hot node ranking
+    RANKINGS = {
+        'changes': lambda trace: (trace.changes, trace.transfer_time),
+        'evaluations': lambda trace: (trace.evaluations, trace.transfer_time),
+        'time': lambda trace: (trace.transfer_time, trace.changes),
+        'width': lambda trace: (trace.max_width, trace.changes),
+        'size': lambda trace: (trace.max_size, trace.changes)
+    }
+
+    def __init__(self):
+        '''
+        Constructor
+        '''
+
+        # mapping of the node id to its trace
+        self.nodes = dict()
+
+        # mapping of the round to the head of its component and the nodes whose entry state
+        # changed in that round (the round 0 gathers the evaluations outside of any component)
+        self.rounds = {0: {'head': None, 'changed_nodes': set()}}
+
+        # the rounds in progress, of the (nested) components being computed
+        self.round_stack = [0]
+
+    def start_round(self, head: str) -> int:
+        '''
+        Start a round of the component with the given head, getting its number
+        '''
+
+        round_number = len(self.rounds)
+        self.rounds[round_number] = {'head': head, 'changed_nodes': set()}
+        self.round_stack.append(round_number)
+
+        return round_number
+
+    def end_round(self) -> None:
+        '''
+        End the latest round started, back to the round of the enclosing component (if any)
+        '''
+
+        self.round_stack.pop()
+
+    def record(self, node_id: str, node_type: str, changed: bool,
+               size: int, width: float, transfer_time: float) -> None:
+        '''
+        Record an evaluation of a node, in the current round
+        '''
+
+        trace = self.nodes.get(node_id, None)
+        if trace is None:
+            trace = self.nodes[node_id] = NodeTrace(node_id, node_type)
+
+        trace.evaluations += 1
+        trace.transfer_time += transfer_time
+        trace.size = size
+        trace.max_size = max(trace.max_size, size)
+        trace.width = width
+        trace.max_width = max(trace.max_width, width)
+
+        if changed:
+            round_number = self.round_stack[-1]
+
+            trace.changes += 1
+            trace.last_change = round_number
+            self.rounds[round_number]['changed_nodes'].add(node_id)
+
+    def get_changed_nodes(self, round_number: int) -> Set[str]:
+        '''
+        Get the nodes whose entry state changed in a round
+        '''
+
+        return self.rounds[round_number]['changed_nodes'] if round_number in self.rounds else set()
+
+    def get_hot_nodes(self, top=10, rank_by='changes') -> List[NodeTrace]:
+        '''
+        Get the hottest nodes, ranked by the number of changes (default),
+        evaluations, the transfer time, or the width or size of the state
+        '''
+
+        if rank_by not in ConvergenceTracer.RANKINGS:
+            raise Exception(f'Unknown ranking {rank_by}!')
+
+        ranked = sorted(self.nodes.values(),
+                        key=ConvergenceTracer.RANKINGS[rank_by], reverse=True)
+
+        return ranked[:top]
+
+    def get_summary(self, top=10, rank_by='changes') -> Dict[str, Any]:
+        '''
+        Get the summary of the convergence, with the hot node ranking
+        '''
+
+        return {
+            'rounds': len(self.rounds) - 1,
+            'evaluations': sum(trace.evaluations for trace in self.nodes.values()),
+            'transfer_time': sum(trace.transfer_time for trace in self.nodes.values()),
+            'changed_nodes': {round_number: {'head': details['head'], 'nodes': sorted(details['changed_nodes'])}
+                              for round_number, details in sorted(self.rounds.items())},
+            'hot_nodes': [dict(node_id=trace.node_id, **trace.to_dict())
+                          for trace in self.get_hot_nodes(top, rank_by)]
+        }
+
+    def get_dot_annotations(self) -> Dict[str, str]:
+        '''
+        Get the per node numbers as labels to annotate the CFG with
+        '''
+
+        return {node_id: f'evals={trace.evaluations} changes={trace.changes}\\n'
+                         f'time={trace.transfer_time * 1000:.3f}ms size={trace.max_size} width={trace.max_width}'
+                for node_id, trace in self.nodes.items()}
@@ -0,0 +1,278 @@
+'''
+The Memory Profiler
+
+The memory profiling mode of the analysis pipeline, reporting:
+
+    - the python heap usage of every phase (tracemalloc snapshots, grouped by module)
+    - the number and the estimated size of the live states of every node of a PointState
+    - the JVM heap usage and the GC activity, for the APRON side (if the JVM is started)
+
+and enforcing a memory ceiling (the python heap traced by tracemalloc, which the profiler starts
+tracing as soon as a ceiling is set, plus the used JVM heap), checked by the engines after every
+fixed point round. When the ceiling is hit,
+the profiler either aborts the analysis with a MemoryCeilingExceeded exception, or degrades
+gracefully: the states of the past iterations (which the fixed point check does not need)
+are released, and the analysis only aborts if it is still above the ceiling after that.
+'''
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Union
+
+
+class MemoryCeilingExceeded(Exception):
+    '''
+    Exception raised when the memory of an analysis exceeds the ceiling
+    '''
+
+    def __init__(self, used: int, ceiling: int):
+        super(MemoryCeilingExceeded, self).__init__(
+            f'Memory ceiling exceeded: {used} bytes used, ceiling is {ceiling} bytes!')
+
+        self.used = used
+        self.ceiling = ceiling
+
+
+class MemoryProfiler(object):
+    '''
+    Class profiling the memory of the phases of the analysis pipeline
+    '''
+
+    def __init__(self, ceiling: int = None, on_ceiling='degrade', top=10, frames=1):
+        '''
+        Constructor
+        '''
+
+        if on_ceiling not in ('abort', 'degrade'):
+            raise Exception(f'Unknown memory ceiling policy {on_ceiling}!')
+
+        # the memory ceiling (bytes), and what to do when it is hit ('abort' or 'degrade')
+        self.ceiling = ceiling
+        self.on_ceiling = on_ceiling
+
+        # the number of modules reported per phase,
+        # and the number of frames tracemalloc records per allocation
+        self.top = top
+        self.frames = frames
+
+        # mapping of the phase name to its memory report
+        self.phases = dict()
+
+        # mapping of the analysis name to the memory usage of its point state
+        self.point_states = dict()
+
+        # the number of times the states were released to stay under the ceiling
+        self.degradations = 0
+
+        self.started_tracing = False
+
+        # the python heap is only counted against the ceiling while traced
+        if self.ceiling is not None:
+            self.start()
+
+    def start(self) -> None:
+        '''
+        Start tracing the python allocations
+        '''
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+
+    def stop(self) -> None:
+        '''
+        Stop tracing the python allocations (if started by the profiler)
+        '''
+
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        '''
+        Profile the memory of the enclosed block as a phase
+        '''
+
+        self.start()
+
+        tracemalloc.reset_peak()
+        before = self.__take_snapshot()
+        jvm_before = get_jvm_memory()
+
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            after = self.__take_snapshot()
+
+            modules = dict()
+            for statistic in after.compare_to(before, 'filename'):
+                module = _get_module_name(
+                    statistic.traceback[0].filename)
+                modules[module] = modules.get(
+                    module, 0) + statistic.size_diff
+
+            report = {
+                'current': current,
+                'peak': peak,
+                'allocated': sum(modules.values()),
+                'modules': sorted(modules.items(), key=lambda item: item[1], reverse=True)[:self.top]
+            }
+
+            jvm_after = get_jvm_memory()
+            if jvm_after is not None:
+                report['jvm'] = jvm_after
+                if jvm_before is not None:
+                    report['jvm']['gc_collections'] = {name: count - jvm_before['gc'].get(name, (0, 0))[0]
+                                                       for name, (count, _) in jvm_after['gc'].items()}
+
+            self.phases[name] = report
+
+    def record_point_state(self, name: str, point_state: Any) -> Dict[str, Any]:
+        '''
+        Record the number and the estimated size of the live states of every node of a PointState
+        '''
+
+        nodes = point_state.get_memory_usage()
+
+        self.point_states[name] = {
+            'states': sum(usage['states'] for usage in nodes.values()),
+            'size': sum(usage['size'] or 0 for usage in nodes.values()),
+            'nodes': nodes
+        }
+
+        return self.point_states[name]
+
+    def get_used_memory(self) -> int:
+        '''
+        Get the memory counted against the ceiling: the traced python heap
+        (if tracing) along with the used JVM heap (if the JVM is started)
+        '''
+
+        used = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+        jvm = get_jvm_memory()
+        if jvm is not None:
+            used += jvm['heap_used']
+
+        return used
+
+    def check(self, point_state: Any) -> None:
+        '''
+        Check the memory ceiling (called by the engines after every fixed point round),
+        releasing the past states of the point state, or aborting, if it is hit
+        '''
+
+        if self.ceiling is None:
+            return
+
+        used = self.get_used_memory()
+        if used <= self.ceiling:
+            return
+
+        if self.on_ceiling == 'degrade':
+            point_state.release_history()
+            self.degradations += 1
+
+            used = self.get_used_memory()
+            if used <= self.ceiling:
+                return
+
+        raise MemoryCeilingExceeded(used, self.ceiling)
+
+    def get_report(self) -> Dict[str, Any]:
+        '''
+        Get the memory report of the profiled phases and point states
+        '''
+
+        return {
+            'ceiling': self.ceiling,
+            'degradations': self.degradations,
+            'phases': self.phases,
+            'point_states': self.point_states,
+            'jvm': get_jvm_memory()
+        }
+
+    def __take_snapshot(self) -> tracemalloc.Snapshot:
+        '''
+        Take a snapshot of the python heap, excluding the allocations of tracemalloc itself
+        '''
+
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>')))
+
+
+def get_jvm_memory() -> Union[Dict[str, Any], None]:
+    '''
+    Get the heap usage and the GC activity (collection count and time in ms per collector)
+    of the JVM, through its management beans, or None if the JVM is not started
+    '''
+
+    # the JVM is only inspected if already loaded and started (by the java wrapper)
+    jpype = sys.modules.get('jpype', None)
+    if jpype is None or not jpype.isJVMStarted():
+        return None
+
+    ManagementFactory = jpype.JClass('java.lang.management.ManagementFactory')
+
+    heap = ManagementFactory.getMemoryMXBean().getHeapMemoryUsage()
+    gc = {str(bean.getName()): (int(bean.getCollectionCount()), int(bean.getCollectionTime()))
+          for bean in ManagementFactory.getGarbageCollectorMXBeans()}
+
+    return {
+        'heap_used': int(heap.getUsed()),
+        'heap_committed': int(heap.getCommitted()),
+        'heap_max': int(heap.getMax()),
+        'gc': gc
+    }
+
+
+def estimate_state_set_size(state_set: set) -> int:
+    '''
+    Estimate the size of a (concrete) state set: the set along with its state tuples
+    (the values are mostly small ints and strings, shared between the tuples, hence not counted)
+    '''
+
+    return sys.getsizeof(state_set) + sum(sys.getsizeof(state_tuple) for state_tuple in state_set)
+
+
+def _get_module_name(filename: str) -> str:
+    '''
+    Get the dotted module name of a source file, relative to the longest matching entry of sys.path
+    '''
+
+    filename = os.path.abspath(filename)
+
+    prefixes = [os.path.abspath(path) for path in sys.path if path]
+    prefixes = [prefix for prefix in prefixes
+                if filename.startswith(prefix + os.sep)]
+    if not prefixes:
+        return filename
+
+    relative = filename[len(max(prefixes, key=len)) + 1:]
+    module, _ = os.path.splitext(relative)
+    module = module.replace(os.sep, '.')
+
+    return module[:-len('.__init__')] if module.endswith('.__init__') else module
+
+
+def get_process_memory() -> int:
+    '''
+    Get the resident memory of the process in bytes (the python heap along with the JVM,
+    as it runs in the same process), falling back to the peak resident memory if the
+    current one is not available on the platform
+    '''
+
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        # the peak resident memory, in kilobytes on linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
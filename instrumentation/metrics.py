@@ -0,0 +1,334 @@
+'''
+The Metrics Module
+
+Records the wall-clock and CPU time spent in each phase of a run (pragma resolution,
+solc install, compilation, AST fetch, CFG build, variable registration, fixed point rounds)
+along with the counters (nodes, edges, transfer function calls per node type, APRON calls,
+joins) and the distributions (e.g., state set sizes) of the run, exposed as a python object,
+a JSON report and a Prometheus textfile (for the node exporter's textfile collector).
+
+The subsystems record into the shared `metrics` instance of this module, i.e.,
+
+    with metrics.phase('cfg.build'):
+        ...
+    metrics.increment('semantics.transfer', node_type='IfStatement')
+
+The phases and counters are keyed by a dotted name, prefixed with the subsystem,
+and an optional set of labels. A phase includes the time of the other phases run within
+it (e.g., the fixpoint includes its rounds), but not the time of its own nested runs
+(e.g., the rounds of an inner loop, within a round of the enclosing loop), so that
+the time of a phase sums to the time spent in it, without counting any of it twice. The recording is thread-safe, as the analyses of several
+threads (sharing the JVM) record into the same instance.
+'''
+import os
+import re
+import json
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+
+# the prefix of the Prometheus metric names
+PROMETHEUS_PREFIX = 'safpy'
+
+
+class Metrics(object):
+    '''
+    Class recording the phase timings, counters and distributions of a run
+    '''
+
+    def __init__(self, enabled=True):
+        '''
+        Constructor
+        '''
+
+        # if disabled, nothing is recorded (every hook returns right away)
+        self.enabled = enabled
+
+        # the lock of the records (the read-modify-write of a record is not atomic)
+        self.lock = threading.Lock()
+
+        # the per thread stack of the phase runs in progress
+        self.local = threading.local()
+
+        self.reset()
+
+    def reset(self) -> None:
+        '''
+        Drop everything recorded so far
+        '''
+
+        # mapping of (name, labels) to [runs, wall time, cpu time, max wall time]
+        self.phases = dict()
+
+        # mapping of (name, labels) to the counter value
+        self.counters = dict()
+
+        # mapping of (name, labels) to the gauge value (the latest value set)
+        self.gauges = dict()
+
+        # mapping of (name, labels) to [count, sum, min, max] of the observed values
+        self.distributions = dict()
+
+    @contextmanager
+    def phase(self, name: str, **labels) -> Iterator[None]:
+        '''
+        Time the enclosed block as a run of a phase
+        (excluding the time of the runs of the same phase nested in it)
+        '''
+
+        if not self.enabled:
+            yield
+            return
+
+        stack = getattr(self.local, 'phases', None)
+        if stack is None:
+            stack = self.local.phases = list()
+
+        # the key of the run, and the wall and cpu time of the runs of the same phase nested in it
+        run = [_get_key(name, labels), 0.0, 0.0]
+        stack.append(run)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.process_time() - cpu_start
+            stack.pop()
+
+            # excluded from the closest enclosing run of the same phase
+            for parent in reversed(stack):
+                if parent[0] == run[0]:
+                    parent[1] += wall_time
+                    parent[2] += cpu_time
+                    break
+
+            self.add_phase_time(name, wall_time - run[1], cpu_time - run[2], **labels)
+
+    def add_phase_time(self, name: str, wall_time: float, cpu_time: float, **labels) -> None:
+        '''
+        Record a run of a phase, timed by the caller
+        '''
+
+        if not self.enabled:
+            return
+
+        key = _get_key(name, labels)
+
+        with self.lock:
+            record = self.phases.get(key, None)
+
+            if record is None:
+                self.phases[key] = [1, wall_time, cpu_time, wall_time]
+            else:
+                record[0] += 1
+                record[1] += wall_time
+                record[2] += cpu_time
+                record[3] = max(record[3], wall_time)
+
+    def increment(self, name: str, value=1, **labels) -> None:
+        '''
+        Increment a counter
+        '''
+
+        if not self.enabled:
+            return
+
+        key = _get_key(name, labels)
+
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        '''
+        Set a gauge (a value which is not accumulated, e.g., the size of the latest CFG)
+        '''
+
+        if not self.enabled:
+            return
+
+        self.gauges[_get_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        '''
+        Observe a value of a distribution (e.g., the size of a state set)
+        '''
+
+        if not self.enabled:
+            return
+
+        key = _get_key(name, labels)
+
+        with self.lock:
+            record = self.distributions.get(key, None)
+
+            if record is None:
+                self.distributions[key] = [1, value, value, value]
+            else:
+                record[0] += 1
+                record[1] += value
+                record[2] = min(record[2], value)
+                record[3] = max(record[3], value)
+
+    def get_phase(self, name: str, **labels) -> Dict[str, float]:
+        '''
+        Get the timings of a phase (zero, if never run)
+        '''
+
+        runs, wall_time, cpu_time, max_wall_time = self.phases.get(
+            _get_key(name, labels), (0, 0.0, 0.0, 0.0))
+
+        return {'runs': runs, 'wall': wall_time, 'cpu': cpu_time, 'max_wall': max_wall_time}
+
+    def get_counter(self, name: str, **labels) -> int:
+        '''
+        Get the value of a counter (zero, if never incremented)
+        '''
+
+        return self.counters.get(_get_key(name, labels), 0)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        '''
+        Get the recorded metrics as plain python objects,
+        keyed by the name and labels, formatted as 'name{label=value,...}'
+        '''
+
+        return {
+            'phases': {_format_key(key): {'runs': runs, 'wall': wall_time, 'cpu': cpu_time, 'max_wall': max_wall_time}
+                       for key, (runs, wall_time, cpu_time, max_wall_time) in self.phases.items()},
+            'counters': {_format_key(key): value for key, value in self.counters.items()},
+            'gauges': {_format_key(key): value for key, value in self.gauges.items()},
+            'distributions': {_format_key(key): {'count': count, 'sum': total, 'min': minimum, 'max': maximum}
+                              for key, (count, total, minimum, maximum) in self.distributions.items()}
+        }
+
+    def to_json(self, path: str = None) -> str:
+        '''
+        Get the JSON report of the recorded metrics, and write it to a file if a path is given
+        '''
+
+        report = json.dumps(self.to_dict(), indent=4, sort_keys=True)
+
+        if path is not None:
+            _write_atomic(path, report)
+
+        return report
+
+    def to_prometheus(self) -> str:
+        '''
+        Get the recorded metrics in the Prometheus text exposition format
+        '''
+
+        families = dict()
+
+        def add(metric_name: str, metric_type: str, labels: Tuple[Tuple[str, str]], value: float) -> None:
+            '''
+            Add a sample to its metric family
+            '''
+
+            family = families.setdefault(metric_name, (metric_type, list()))
+            family[1].append((labels, value))
+
+        for (name, labels), (runs, wall_time, cpu_time, max_wall_time) in self.phases.items():
+            labels = (('phase', name),) + labels
+            add('phase_runs_total', 'counter', labels, runs)
+            add('phase_wall_seconds_total', 'counter', labels, wall_time)
+            add('phase_cpu_seconds_total', 'counter', labels, cpu_time)
+            add('phase_max_wall_seconds', 'gauge', labels, max_wall_time)
+
+        for (name, labels), value in self.counters.items():
+            add(f'{_sanitize(name)}_total', 'counter', labels, value)
+
+        for (name, labels), value in self.gauges.items():
+            add(_sanitize(name), 'gauge', labels, value)
+
+        for (name, labels), (count, total, minimum, maximum) in self.distributions.items():
+            add(f'{_sanitize(name)}_count', 'counter', labels, count)
+            add(f'{_sanitize(name)}_sum', 'counter', labels, total)
+            add(f'{_sanitize(name)}_min', 'gauge', labels, minimum)
+            add(f'{_sanitize(name)}_max', 'gauge', labels, maximum)
+
+        lines = list()
+        for metric_name in sorted(families):
+            metric_type, samples = families[metric_name]
+            full_name = f'{PROMETHEUS_PREFIX}_{metric_name}'
+
+            lines.append(f'# TYPE {full_name} {metric_type}')
+            for labels, value in samples:
+                label_str = ','.join(f'{_sanitize(label)}="{_escape(str(label_value))}"'
+                                     for label, label_value in labels)
+                label_str = f'{{{label_str}}}' if label_str else ''
+                lines.append(f'{full_name}{label_str} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        '''
+        Write the recorded metrics as a Prometheus textfile
+        (atomically, as the collector may read it at any time)
+        '''
+
+        _write_atomic(path, self.to_prometheus())
+
+
+def _get_key(name: str, labels: Dict[str, Any]) -> Tuple[str, Tuple[Tuple[str, str]]]:
+    '''
+    Get the key of a metric from its name and labels
+    '''
+
+    if not labels:
+        return (name, ())
+
+    return (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+
+
+def _format_key(key: Tuple[str, Tuple[Tuple[str, str]]]) -> str:
+    '''
+    Format the key of a metric as 'name{label=value,...}'
+    '''
+
+    name, labels = key
+
+    if not labels:
+        return name
+
+    return name + '{' + ','.join(f'{label}={value}' for label, value in labels) + '}'
+
+
+def _sanitize(name: str) -> str:
+    '''
+    Sanitize a name for Prometheus (e.g., 'cfg.nodes' -> 'cfg_nodes')
+    '''
+
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def _escape(value: str) -> str:
+    '''
+    Escape a label value for Prometheus
+    '''
+
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _write_atomic(path: str, text: str) -> None:
+    '''
+    Write a text file through a temporary file and a rename
+    '''
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+# the metrics of the current process, recorded into by all the subsystems
+metrics = Metrics()
@@ -1,35 +1,95 @@
+'''
+The Java Wrapper Module
+
+Starts the JVM (with the APRON jars on its class path) and exposes the APRON and Java classes
+through the apron and java holders. The JVM is started once per process, on the first access
+to a class (or through start_jvm), under a lock, so that the analyses of concurrent threads
+share a single JVM (JPype releases the GIL during the Java calls).
+
+The APRON managers are not thread-safe, hence every thread gets its own (see get_manager).
+'''
+import os
+import threading
 import jpype
+from typing import Dict, List
 from jpype import startJVM, shutdownJVM, addClassPath, JClass, JInt
 
-startJVM(classpath=['/home/arnab/.apron_bin/apron.jar',
-                    '/home/arnab/.apron_bin/gmp.jar'])
+# the class path of the APRON jars, overridable through the SAFPY_APRON_CLASSPATH
+# environment variable (a list of jars separated by os.pathsep, i.e., ':' on unix)
+DEFAULT_CLASSPATH = ['/home/arnab/.apron_bin/apron.jar',
+                     '/home/arnab/.apron_bin/gmp.jar']
+
+CLASSPATH = os.environ['SAFPY_APRON_CLASSPATH'].split(os.pathsep) \
+    if os.environ.get('SAFPY_APRON_CLASSPATH', '') else DEFAULT_CLASSPATH
+
+# the lock serializing the start of the JVM and the loading of the classes
+_jvm_lock = threading.RLock()
 
+# the per thread state (i.e., the APRON manager of the thread)
+_thread_state = threading.local()
 
-class apron(object):
+
+def start_jvm(classpath: List[str] = None) -> None:
+    '''
+    Start the JVM with the given class path (the APRON jars, if not specified),
+    unless already started (by this or any other thread)
+    '''
+
+    with _jvm_lock:
+        if not jpype.isJVMStarted():
+            startJVM(classpath=classpath or CLASSPATH)
+
+
+class _ClassHolder(type):
+    '''
+    Metaclass of the class holders, loading a Java class on its first access
+    (starting the JVM if needed), and keeping it on the holder thereafter
+    '''
+
+    def __getattr__(cls, name: str):
+        java_name = cls.__dict__.get('_classes', dict()).get(name, None)
+        if java_name is None:
+            raise AttributeError(f'{cls.__name__} has no class {name}')
+
+        with _jvm_lock:
+            start_jvm()
+
+            java_class = JClass(java_name)
+            setattr(cls, name, java_class)
+
+        return java_class
+
+
+class apron(object, metaclass=_ClassHolder):
     '''
     Apron Wrapper Class
     '''
 
-    Abstract0 = jpype.JClass("apron.Abstract0")
-    Manager = jpype.JClass("apron.Manager")
-    Interval = jpype.JClass("apron.Interval")
-    Abstract0 = jpype.JClass("apron.Abstract0")
-    Box = jpype.JClass("apron.Box")
-    Octagon = jpype.JClass("apron.Octagon")
-    ApronException = jpype.JClass("apron.ApronException")
-    MpqScalar = jpype.JClass("apron.MpqScalar")
-    Linterm0 = jpype.JClass("apron.Linterm0")
-    Linexpr0 = jpype.JClass("apron.Linexpr0")
-    Texpr0BinNode = jpype.JClass("apron.Texpr0BinNode")
-    Texpr0CstNode = jpype.JClass("apron.Texpr0CstNode")
-    Texpr0Node = jpype.JClass("apron.Texpr0Node")
-    Texpr0Intern = jpype.JClass("apron.Texpr0Intern")
-    Texpr0DimNode = jpype.JClass("apron.Texpr0DimNode")
+    _classes: Dict[str, str] = {name: f'apron.{name}' for name in (
+        'Abstract0', 'Manager', 'Interval', 'Box', 'Octagon', 'ApronException', 'Scalar', 'MpqScalar',
+        'Linterm0', 'Linexpr0', 'Texpr0BinNode', 'Texpr0CstNode', 'Texpr0Node', 'Texpr0Intern',
+        'Texpr0DimNode', 'Tcons0')}
 
 
-class java(object):
+class java(object, metaclass=_ClassHolder):
     '''
     Java Utilitites Wrapper Class
     '''
 
-    Arrays = jpype.JClass("java.util.Arrays")
+    _classes: Dict[str, str] = {'Arrays': 'java.util.Arrays', 'BigInteger': 'java.math.BigInteger'}
+
+
+def get_manager() -> 'apron.Manager':
+    '''
+    Get the APRON manager (of the Box, i.e., the Interval Domain) of the current thread:
+    a manager is not thread-safe, hence the states of an analysis are only operated on in the
+    thread which created it, with the manager of that thread
+    '''
+
+    manager = getattr(_thread_state, 'manager', None)
+
+    if manager is None:
+        manager = apron.Box()
+        _thread_state.manager = manager
+
+    return manager
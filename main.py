@@ -4,6 +4,11 @@ from control_flow_graph import ControlFlowGraph
 # from static_analysis.dataflow_analysis.avl_expr import AvailableExpressionAnalysis
 from static_analysis.collecting_semantics import CollectingSemanticsAnalysis
 from static_analysis.abstract_collecting_semantics import AbstractCollectingSemanticsAnalysis
+from instrumentation import configure_logging
+from instrumentation.metrics import metrics
+
+# trace every subsystem (the development run)
+configure_logging('TRACE')
 
 source = '''
 pragma solidity ^0.4.0;
@@ -57,3 +62,6 @@ csem = AbstractCollectingSemanticsAnalysis(
 csem.constant_registry.register_variable('m', ('1', '3'))
 
 csem.compute()
+
+# report the timings and counters of the run
+metrics.to_json('./gen/metrics.json')
@@ -0,0 +1,243 @@
+'''
+The Analysis Pipeline
+
+Overlaps the compilation of the sources (solc subprocesses, IO bound) with their analysis
+(CFG construction and fixed point iterations, CPU bound), as an asyncio pipeline:
+
+    tasks -> [compile queue] -> compilers (threads) -> [analysis queue] -> analysers (processes) -> emit
+
+The stages are connected with bounded queues, so that a fast stage blocks on a full queue
+instead of running ahead of a slow one (backpressure), and the number of sources in flight
+(between being read and being emitted) is bounded by a window. The results of a source
+are emitted all at once, either as soon as the source is analysed (unordered), or in the
+order of the tasks (ordered, through a reorder buffer bounded by the window).
+'''
+import os
+import time
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Set
+from cli import ANALYSES, analyze_ast, compile_task, get_error_result
+from instrumentation import get_logger
+
+logger = get_logger('pipeline')
+
+# the item closing a queue, once every item before it is put
+_SENTINEL = None
+
+
+class AnalysisPipeline(object):
+    '''
+    Class running the analyses over the sources, compiling the next sources while analysing the previous ones
+    '''
+
+    def __init__(self, analyses: Iterable[str], compile_concurrency=4, processes=None, queue_size=16,
+                 ordered=False, options: Dict[str, Any] = None):
+        '''
+        Constructor
+        '''
+
+        for analysis in analyses:
+            if analysis not in ANALYSES:
+                raise Exception(f'Unknown analysis {analysis}!')
+
+        self.analyses = list(analyses)
+
+        # the number of concurrent compilations (solc subprocesses), and of analysis processes
+        self.compile_concurrency = compile_concurrency
+        self.processes = processes or os.cpu_count() or 1
+
+        # the capacity of the queues between the stages, and the number of sources in flight
+        # (every queue may be full while every worker holds a source)
+        self.queue_size = queue_size
+        self.window = 2 * queue_size + compile_concurrency + self.processes
+
+        # whether the results are emitted in the order of the tasks
+        self.ordered = ordered
+
+        # the options of the analyses (e.g., the constants, the budget, the memory ceiling)
+        self.options = options or dict()
+
+        # the number of sources and functions analysed, and of the failures
+        self.counts = {'sources': 0, 'functions': 0, 'errors': 0, 'skipped': 0}
+
+    def run_sync(self, tasks: Iterable[Dict[str, str]], emit: Callable[[List[Dict[str, Any]]], None],
+                 skip: Set[str] = None) -> Dict[str, int]:
+        '''
+        Run the pipeline in a new event loop (see run)
+        '''
+
+        return asyncio.run(self.run(tasks, emit, skip))
+
+    async def run(self, tasks: Iterable[Dict[str, str]], emit: Callable[[List[Dict[str, Any]]], None],
+                  skip: Set[str] = None) -> Dict[str, int]:
+        '''
+        Compile and analyse the sources, calling emit with the results of each source
+        (one result per function, see cli.analyze_ast); the sources with the ids in skip
+        are not analysed again
+        '''
+
+        skip = skip or set()
+
+        compile_queue = asyncio.Queue(self.queue_size)
+        analysis_queue = asyncio.Queue(self.queue_size)
+        result_queue = asyncio.Queue(self.queue_size)
+        window = asyncio.Semaphore(self.window)
+
+        with ThreadPoolExecutor(max_workers=self.compile_concurrency) as compile_executor, \
+                ProcessPoolExecutor(max_workers=self.processes) as analysis_executor:
+            compilers = [asyncio.ensure_future(self.__compile(compile_queue, analysis_queue, compile_executor))
+                         for _ in range(self.compile_concurrency)]
+            analysers = [asyncio.ensure_future(self.__analyse(analysis_queue, result_queue, analysis_executor))
+                         for _ in range(self.processes)]
+
+            stages = [
+                asyncio.ensure_future(self.__read(
+                    tasks, skip, compile_queue, window)),
+                asyncio.ensure_future(self.__close(
+                    compilers, analysis_queue, self.processes)),
+                asyncio.ensure_future(self.__close(analysers, result_queue, 1)),
+                asyncio.ensure_future(self.__emit(result_queue, window, emit))
+            ]
+
+            try:
+                await asyncio.gather(*stages, *compilers, *analysers)
+            except BaseException:
+                # a failing stage would leave the others blocked on their queues
+                for stage in stages + compilers + analysers:
+                    stage.cancel()
+                raise
+
+        return self.counts
+
+    async def __read(self, tasks: Iterable[Dict[str, str]], skip: Set[str], compile_queue: asyncio.Queue,
+                     window: asyncio.Semaphore) -> None:
+        '''
+        Put the tasks (with their sequence number) into the compile queue, as long as the window allows
+        '''
+
+        index = 0
+        for task in tasks:
+            if task['id'] in skip:
+                self.counts['skipped'] += 1
+                continue
+
+            await window.acquire()
+            await compile_queue.put((index, task))
+            index += 1
+
+        for _ in range(self.compile_concurrency):
+            await compile_queue.put(_SENTINEL)
+
+    async def __compile(self, compile_queue: asyncio.Queue, analysis_queue: asyncio.Queue,
+                        executor: ThreadPoolExecutor) -> None:
+        '''
+        Compile the sources of the compile queue (in a thread, as solc runs in a subprocess),
+        and put their ASTs (or the compilation errors) into the analysis queue
+        '''
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            item = await compile_queue.get()
+            if item is _SENTINEL:
+                return
+
+            index, task = item
+            start = time.perf_counter()
+
+            try:
+                source, ast = await loop.run_in_executor(executor, compile_task, task)
+            except Exception as e:
+                logger.info('Failed to compile %s: %s', task['id'], e)
+                await analysis_queue.put((index, task, None, get_error_result(task, e, time.perf_counter() - start)))
+                continue
+
+            await analysis_queue.put((index, task, (source, ast), None))
+
+    async def __analyse(self, analysis_queue: asyncio.Queue, result_queue: asyncio.Queue,
+                        executor: ProcessPoolExecutor) -> None:
+        '''
+        Analyse the compiled sources of the analysis queue (in a process), and put their results into the result queue
+        '''
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            item = await analysis_queue.get()
+            if item is _SENTINEL:
+                return
+
+            index, task, compiled, error = item
+            if error is not None:
+                await result_queue.put((index, [error]))
+                continue
+
+            source, ast = compiled
+            start = time.perf_counter()
+
+            try:
+                results = await loop.run_in_executor(executor, analyze_ast, task, source, ast,
+                                                     self.analyses, self.options)
+            except Exception as e:
+                # (e.g., the worker process died, or the task could not be sent to it)
+                logger.info('Failed to analyse %s: %s', task['id'], e)
+                results = [get_error_result(task, e, time.perf_counter() - start)]
+
+            await result_queue.put((index, results))
+
+    async def __close(self, workers: List[asyncio.Future], queue: asyncio.Queue, consumers: int) -> None:
+        '''
+        Close the queue (for each of its consumers) once the workers feeding it are done
+        '''
+
+        await asyncio.gather(*workers)
+
+        for _ in range(consumers):
+            await queue.put(_SENTINEL)
+
+    async def __emit(self, result_queue: asyncio.Queue, window: asyncio.Semaphore,
+                     emit: Callable[[List[Dict[str, Any]]], None]) -> None:
+        '''
+        Emit the results of the analysed sources, as they come or in the order of the tasks,
+        releasing their places in the window
+        '''
+
+        # the results of the sources analysed ahead of the next one to emit (in order)
+        reorder_buffer = dict()
+        next_index = 0
+
+        while True:
+            item = await result_queue.get()
+            if item is _SENTINEL:
+                break
+
+            if not self.ordered:
+                self.__emit_results(item[1], emit)
+                window.release()
+                continue
+
+            index, results = item
+            reorder_buffer[index] = results
+
+            while next_index in reorder_buffer:
+                self.__emit_results(reorder_buffer.pop(next_index), emit)
+                window.release()
+                next_index += 1
+
+        if reorder_buffer:
+            raise Exception(f'Sources {sorted(reorder_buffer)} not emitted, as {next_index} is missing!')
+
+    def __emit_results(self, results: List[Dict[str, Any]], emit: Callable[[List[Dict[str, Any]]], None]) -> None:
+        '''
+        Emit the results of a source and count them
+        '''
+
+        emit(results)
+
+        self.counts['sources'] += 1
+        for result in results:
+            if result['function'] is not None:
+                self.counts['functions'] += 1
+            if result['status'] != 'ok':
+                self.counts['errors'] += 1
@@ -1,11 +1,23 @@
 '''
 The Collecting Semantics Analysis in the Interval Abstract Domain
 '''
-from java_wrapper import apron, java
+import time
+import logging
+from typing import List, Tuple, Union
+from java_wrapper import java, get_manager
 from control_flow_graph import ControlFlowGraph
-from static_analysis.abstract_collecting_semantics.objects import VariableRegistry, PointState
+from control_flow_graph.node_processor import Node
+from control_flow_graph.analysis.objects import WTOComponent
+from static_analysis.abstract_collecting_semantics.objects import VariableRegistry, PointState, ExpressionCache
 import static_analysis.abstract_collecting_semantics.builder as builder
-from time import sleep
+import static_analysis.abstract_collecting_semantics.builder.acceleration as acceleration
+from static_analysis.loop_acceleration import LoopAccelerator
+from static_analysis.loop_acceleration.objects import AffineLoop
+from static_analysis.dataflow_analysis.live_variables import LiveVariablesAnalysis
+from instrumentation import get_logger, TRACE
+from instrumentation.metrics import metrics
+
+logger = get_logger('abstract')
 
 
 class AbstractCollectingSemanticsAnalysis(object):
@@ -13,18 +25,66 @@ class AbstractCollectingSemanticsAnalysis(object):
     Class defining the collecting semantics analysis on the Interval Abstract Domain
     '''
 
-    def __init__(self, cfg: ControlFlowGraph, starting_node: str, ending_node: str, _java_class_path: str, _java_lib_path=None):
+    def __init__(self, cfg: ControlFlowGraph, starting_node: str, ending_node: str, _java_class_path: str, _java_lib_path=None,
+                 prune_dead_variables=False, observed_variables=None, tracer=None, profiler=None, budget=None,
+                 cache_expressions=True, widening_delay=3, narrowing_rounds=2, checkpointer=None,
+                 accelerate_loops=False):
         '''
         Constructor
         '''
 
-        # Import APRON Classes
-        self.manager = apron.Box()
+        # the APRON manager of the current thread (the analysis is computed in the thread creating it,
+        # the analyses of several threads sharing the JVM but not the managers)
+        self.manager = get_manager()
 
         self.cfg = cfg
         self.starting_node = starting_node
         self.ending_node = ending_node
 
+        # if enabled, the dead variables are forgotten from the states at each node
+        self.prune_dead_variables = prune_dead_variables
+
+        # the variables kept live at the ending node (all variables, if not specified)
+        self.observed_variables = observed_variables
+
+        # the (optional) convergence tracer, recording every evaluation of the nodes
+        self.tracer = tracer
+
+        # the (optional) memory profiler, enforcing its memory ceiling after every round
+        self.profiler = profiler
+
+        # the (optional) budget of the analysis, checked on every node evaluation
+        # (raising BudgetExceeded, see static_analysis.budget)
+        self.budget = budget
+
+        # the number of rounds of a loop head before its entry state is widened (never, if None),
+        # and the number of descending (narrowing) rounds of a loop after its fixed point;
+        # as the guards refine the states soundly, the loops only stabilize through widening
+        self.widening_delay = widening_delay
+        self.narrowing_rounds = narrowing_rounds
+
+        # if enabled, the APRON expression tree of each node is translated (and interned) once,
+        # on its first evaluation, instead of on every evaluation
+        self.expression_cache = ExpressionCache() if cache_expressions else None
+
+        # the (optional) checkpointer, saving the progress of the fixed point computation
+        # at the start of the rounds (see static_analysis.checkpoint), and restoring it on resume
+        self.checkpointer = checkpointer
+
+        # if enabled, the affine loops (see static_analysis.loop_acceleration) are summarized in closed form
+        # at their head instead of iterated (and widened), unless their trip count is unbounded
+        self.accelerate_loops = accelerate_loops
+
+        # mapping of the heads of the affine loops to the loops, and to their latest
+        # (entering states, summary), reused while the loop is entered with the same states
+        self.affine_loops = dict()
+        self.loop_summaries = dict()
+
+        # the frames of the components (loops) of the WTO being iterated, and the ones
+        # of the checkpoint being resumed from (till its position is reached)
+        self.wto_path = list()
+        self.resume_path = None
+
         self.variable_registry = VariableRegistry()
         self.constant_registry = VariableRegistry()
         self.point_state = PointState(
@@ -35,21 +95,54 @@ class AbstractCollectingSemanticsAnalysis(object):
         Compute the collecting semantics analysis
         '''
 
+        if self.budget is not None:
+            self.budget.start()
+
+        # the constants (baked into the cached expressions) may have changed since the last run
+        if self.expression_cache is not None:
+            self.expression_cache.clear()
+
         # first compute on the expression statements
         # obtain the variables to track the state of
-        self.__compute_variables()
-        print(self.variable_registry.variable_table.keys())
+        with metrics.phase('abstract.variables'):
+            self.__compute_variables()
+        logger.debug('Variables %s', list(
+            self.variable_registry.variable_table.keys()))
+
+        # run the live variables pre-pass to find the dimensions to forget
+        if self.prune_dead_variables:
+            with metrics.phase('abstract.liveness'):
+                self.__compute_live_variables()
+
+        # recognize the affine loops to summarize
+        if self.accelerate_loops:
+            with metrics.phase('abstract.loops'):
+                self.affine_loops = LoopAccelerator(
+                    self.cfg, self.starting_node, self.ending_node).compute()
+            self.loop_summaries = dict()
 
         # compute the abstract collecting semantics in the Interval Abstract Domain
-        self.__compute_abstract_collecting_semantics()
-
-        # print the output for all the iterations
-        for node in self.point_state.node_states.keys():
-            for i in range(1, self.point_state.iteration+1):
-                print('ENTRY', i, node, java.Arrays.toString(self.point_state.get_node_state_set(
-                    node, i, True).toBox(self.manager)))
-                # print('EXIT', i, node, self.point_state.get_node_state_set(
-                #     node, i, False))
+        with metrics.phase('abstract.fixpoint'):
+            self.__compute_abstract_collecting_semantics()
+
+        if self.expression_cache is not None:
+            metrics.increment('abstract.expression_cache',
+                              self.expression_cache.hits, result='hit')
+            metrics.increment('abstract.expression_cache',
+                              self.expression_cache.misses, result='miss')
+
+        if self.profiler is not None:
+            self.profiler.record_point_state('abstract', self.point_state)
+
+        # log the output for all the iterations
+        # (formatting the boxes crosses the JVM boundary, hence only done if enabled)
+        if logger.isEnabledFor(logging.DEBUG):
+            # (only the retained iterations, the past ones may be released under memory pressure)
+            for node, states in self.point_state.node_states.items():
+                for i in sorted(states['entry']):
+                    if i > 0:
+                        logger.debug('ENTRY %d %s %s', i, node, java.Arrays.toString(
+                            states['entry'][i].toBox(self.manager)))
 
     def __compute_variables(self) -> None:
         '''
@@ -80,7 +173,7 @@ class AbstractCollectingSemanticsAnalysis(object):
             for variable in variables:
                 self.variable_registry.register_variable(variable)
 
-            print("VARIABLE-REGISTRY", node_id, variables)
+            logger.log(TRACE, 'VARIABLE-REGISTRY %s %s', node_id, variables)
 
             if node_id != self.ending_node:
                 for child_id in node.next_nodes:
@@ -92,62 +185,272 @@ class AbstractCollectingSemanticsAnalysis(object):
 
         self.point_state.init_node_states()
 
+    def __compute_live_variables(self) -> None:
+        '''
+        Compute the variables live at the entry of each node
+        '''
+
+        observed_variables = self.observed_variables if self.observed_variables is not None \
+            else self.variable_registry.variable_table.keys()
+
+        liveness = LiveVariablesAnalysis(
+            self.cfg, self.starting_node, self.ending_node, observed_variables)
+        liveness.compute()
+
+        self.point_state.set_live_variables(
+            {node_id: liveness.get_entry(node_id) for node_id in liveness.nodes})
+
     def __compute_abstract_collecting_semantics(self) -> None:
         '''
-        Compute the Collecting Semantics
+        Compute the Collecting Semantics, following the weak topological ordering (WTO)
+        of the CFG: the nodes outside the loops are evaluated exactly once, in topological order,
+        and each loop (component) is iterated on its own till it stabilizes
         '''
 
-        def traverse(node_id, visited: set, cfg: ControlFlowGraph):
-            '''
-            Traverse the Graph and Compute the Collecting Semantics
-            '''
+        analysis = self.cfg.get_analysis(self.starting_node, self.ending_node)
 
-            if node_id in visited:
-                return
+        # resume from the latest checkpoint, if any
+        self.wto_path = list()
+        self.resume_path = None
+        if self.checkpointer is not None:
+            self.checkpointer.start()
+            self.resume_path = self.checkpointer.load(self.point_state)
 
-            # add to visited set
-            visited.add(node_id)
+        self.__compute_wto_elements(analysis.get_wto())
 
-            print("COLLSEM-TRV", node_id)
+        if self.checkpointer is not None:
+            self.checkpointer.complete()
 
-            # get node instance / object
-            node = cfg.cfg_metadata.get_node(node_id)
+    def __compute_wto_elements(self, elements: List[Union[str, WTOComponent]]) -> None:
+        '''
+        Compute the Collecting Semantics over the elements of the WTO, in order
+        (on resume, from the component being iterated at the checkpoint)
+        '''
 
-            # get the previous nodes list of the node
-            prev_nodes = list(node.prev_nodes.keys())
+        start = self.resume_path[len(self.wto_path)][0] if self.resume_path is not None else 0
 
-            # 1. udpate the entry state set for the node
-            self.point_state.update_node_entry_state(node_id, prev_nodes)
-            entry_set = self.point_state.get_node_state_set(
-                node_id, self.point_state.iteration)
+        for index in range(start, len(elements)):
+            element = elements[index]
 
-            # 1.1 Obtain the exit set of previous iteration
-            exit_sets = self.point_state.get_node_state_set(
-                node_id, self.point_state.iteration-1, False, '*', True)
+            if isinstance(element, WTOComponent):
+                self.__compute_wto_component(element, index)
+            else:
+                self.__compute_node(element)
 
-            # 2. process the node semantics and generate the exit state sets for it's next nodes
-            exit_sets = builder.generate_exit_sets(
-                node, entry_set, exit_sets, self.variable_registry, self.constant_registry, self.manager)
+    def __compute_wto_component(self, component: WTOComponent, index: int) -> None:
+        '''
+        Iterate over a component (loop) of the WTO till the states of its nodes stabilize,
+        the nested components are stabilized on every iteration of the enclosing one
+        '''
 
-            # 3. udpate the exit state set for the node
-            # (EDGE CASE: for ending node, we will use the next node as '*')
-            for next_node_id, exit_set in exit_sets.items():
-                self.point_state.update_node_exit_state(
-                    node_id, next_node_id, exit_set)
+        nodes = component.get_nodes()
+        descending, in_progress = self.__enter_wto_component(index)
 
-            if node_id != self.ending_node:
-                for child_id in node.next_nodes:
-                    child_node = cfg.cfg_metadata.get_node(child_id)
+        # the ascending rounds, widening the entry state of the head after the delay
+        if descending is None:
+            while True:
+                logger.debug('Start Iter: %s %d', component.head,
+                             self.point_state.get_node_iteration(component.head) + 1)
 
-                    traverse(child_node.cfg_id, visited, cfg)
+                fixed_point_reached = self.__compute_wto_round(
+                    component, nodes, True, in_progress)
+                in_progress = False
+
+                if fixed_point_reached:
+                    break
+
+            descending = 0
+
+        # the descending rounds, refining the bounds lost to widening
+        # (iterating from a post fixed point without widening stays above the least fixed point)
+        if self.widening_delay is not None:
+            for descending in range(descending, self.narrowing_rounds):
+                self.wto_path[-1][1] = descending
+
+                fixed_point_reached = self.__compute_wto_round(
+                    component, nodes, False, in_progress)
+                in_progress = False
+
+                if fixed_point_reached:
+                    break
+
+        self.wto_path.pop()
+
+    def __enter_wto_component(self, index: int) -> Tuple[Union[int, None], bool]:
+        '''
+        Enter a component of the WTO (the index-th of its parent elements), getting the descending
+        round to resume it from (None for the ascending rounds), and whether its round is in progress
+        (i.e., it encloses the component being iterated at the checkpoint resumed from)
+        '''
+
+        depth = len(self.wto_path)
+        self.wto_path.append([index, None])
 
-        while True:
-            visited = set()
-            self.point_state.start_computation_round()
-            print('Start Iter:', self.point_state.iteration)
-            traverse(self.starting_node, visited, self.cfg)
+        if self.resume_path is None:
+            return None, False
+
+        descending = self.resume_path[depth][1]
+
+        # the position of the checkpoint is reached, the round of the component starts as saved
+        if depth == len(self.resume_path) - 1:
+            self.resume_path = None
+            return descending, False
+
+        return descending, True
+
+    def __compute_wto_round(self, component: WTOComponent, nodes: List[str], widen: bool,
+                            in_progress=False) -> bool:
+        '''
+        Compute a round of a component (loop) of the WTO, and check if its nodes are stable
+        (the round being in progress on resume, its head is not computed again)
+        '''
+
+        if not in_progress and self.checkpointer is not None and self.checkpointer.is_due():
+            self.checkpointer.save(self.point_state, self.wto_path)
+
+        allocations = self.point_state.allocations
+
+        if self.tracer is not None:
+            self.tracer.start_round(component.head)
+
+        with metrics.phase('abstract.round'):
+            if not in_progress:
+                # (the descending rounds refine the widened entry state of the head,
+                # hence never reuse it for the same exit states of its previous nodes)
+                self.__compute_node(component.head, widen, not widen)
+            self.__compute_wto_elements(component.elements)
+
+            fixed_point_reached = self.point_state.is_fixed_point_reached(nodes)
+
+        if self.tracer is not None:
+            self.tracer.end_round()
+
+        metrics.observe('abstract.round_allocations',
+                        self.point_state.allocations - allocations)
+
+        if self.profiler is not None:
+            self.profiler.check(self.point_state)
+
+        return fixed_point_reached
+
+    def __compute_node(self, node_id: str, widen=False, narrow=False) -> None:
+        '''
+        Compute the Collecting Semantics of a node,
+        widening its entry state (if a loop head) after the widening delay,
+        or narrowing it (if a loop head in a descending round)
+        '''
+
+        logger.log(TRACE, 'COLLSEM-TRV %s', node_id)
+
+        # get node instance / object
+        node = self.cfg.cfg_metadata.get_node(node_id)
+
+        # get the previous nodes list of the node
+        prev_nodes = list(node.prev_nodes.keys())
+
+        # 1. udpate the entry state set for the node
+        self.point_state.update_node_entry_state(node_id, prev_nodes, not narrow)
+        iteration = self.point_state.get_node_iteration(node_id)
+
+        # the head of an affine loop is summarized instead of widened
+        # (the summary being stable for the same entering states)
+        accelerated = node_id in self.affine_loops and self.__accelerate_loop(
+            self.affine_loops[node_id])
+
+        if widen and not accelerated and self.widening_delay is not None and iteration > self.widening_delay:
+            self.point_state.widen_node_entry_state(node_id)
+        entry_set = self.point_state.get_node_state_set(node_id, iteration)
+
+        if self.budget is not None:
+            self.budget.check(self.point_state.iteration)
+
+        # the same entry state as in the previous evaluation yields the same exit states
+        # (the first evaluation is always computed, as the exit states of the 0th iteration are placeholders)
+        if iteration > 1 and not self.point_state.is_entry_state_changed(node_id):
+            self.point_state.share_exit_states(node_id)
+            metrics.increment('abstract.skipped', node_type=node.node_type)
+
+            if self.tracer is not None:
+                self.__trace_node(node, 0.0)
+            return
+
+        # 1.1 Obtain the exit set of previous iteration
+        prev_exit_sets = self.point_state.get_node_state_set(
+            node_id, iteration-1, False, '*', True)
+
+        metrics.increment('abstract.transfer', node_type=node.node_type)
+
+        # 2. process the node semantics and generate the exit state sets for it's next nodes
+        transfer_start = time.perf_counter() if self.tracer is not None else 0.0
+
+        exit_sets = builder.generate_exit_sets(
+            node, entry_set, prev_exit_sets, self.variable_registry, self.constant_registry, self.manager,
+            self.expression_cache)
+
+        # count the states allocated by the transfer function
+        # (the exit states neither shared with the entry state nor with the previous exit states)
+        shared = {id(entry_set)} | {id(state) for state in prev_exit_sets.values()}
+        self.point_state.count_allocations('transfer', len({id(state) for state in exit_sets.values()
+                                                            if id(state) not in shared}))
+
+        if self.tracer is not None:
+            self.__trace_node(node, time.perf_counter() - transfer_start)
+
+        # 3. udpate the exit state set for the node
+        # (EDGE CASE: for ending node, we will use the next node as '*')
+        for next_node_id, exit_set in exit_sets.items():
+            self.point_state.update_node_exit_state(
+                node_id, next_node_id, exit_set)
+
+    def __accelerate_loop(self, loop: AffineLoop) -> bool:
+        '''
+        Replace the entry state of the head of an affine loop with the summary of the loop,
+        computed from the states entering the loop, and get whether summarized
+        (not if its trip count is unbounded, the loop being iterated as usual)
+        '''
+
+        entry_states = [self.point_state.get_node_state_set(
+            node_id, self.point_state.get_node_iteration(node_id), False, loop.head)
+            for node_id in loop.entering_nodes]
+
+        # the same entering states as in the latest summary, hence the same summary
+        inputs, summary = self.loop_summaries.get(loop.head, (None, None))
+        if inputs is not None and len(inputs) == len(entry_states) \
+                and all(state is input_state for state, input_state in zip(entry_states, inputs)):
+            metrics.increment('abstract.acceleration', result='reused')
+            if summary is None:
+                return False
+
+            self.point_state.set_node_entry_state(loop.head, summary, pruned=True)
+            return True
+
+        summary = acceleration.generate_summary_state(
+            loop, entry_states, self.variable_registry, self.constant_registry, self.manager,
+            self.expression_cache)
+
+        if summary is None:
+            self.loop_summaries[loop.head] = (entry_states, None)
+            metrics.increment('abstract.acceleration', result='unbounded')
+            return False
+
+        # (the summary is a new state, unless the loop is never entered)
+        owned = all(summary is not state for state in entry_states)
+        if owned:
+            self.point_state.count_allocations('acceleration')
+
+        self.point_state.set_node_entry_state(loop.head, summary, owned)
+        self.loop_summaries[loop.head] = (entry_states, self.point_state.get_node_state_set(
+            loop.head, self.point_state.get_node_iteration(loop.head)))
+        metrics.increment('abstract.acceleration', result='summary')
+
+        return True
+
+    def __trace_node(self, node: Node, transfer_time: float) -> None:
+        '''
+        Record the evaluation of a node on the convergence tracer
+        '''
 
-            sleep(0.2)
+        size, width = self.point_state.get_entry_state_measures(node.cfg_id)
 
-            if self.point_state.is_fixed_point_reached():
-                break
+        self.tracer.record(node.cfg_id, node.node_type, self.point_state.is_entry_state_changed(node.cfg_id),
+                           size, width, transfer_time)
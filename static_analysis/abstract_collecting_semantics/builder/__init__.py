@@ -1,13 +1,14 @@
 '''
 The Builder Module for Collecting Semantics
 '''
+from __future__ import annotations
 
 from typing import Set, Tuple, Any, Dict
 from copy import deepcopy
 from java_wrapper import apron
 from control_flow_graph.node_processor import Node
 import static_analysis.abstract_collecting_semantics.builder.nodes as nodes
-from static_analysis.abstract_collecting_semantics.objects import VariableRegistry
+from static_analysis.abstract_collecting_semantics.objects import VariableRegistry, ExpressionCache
 
 
 def get_variables(node: Node) -> Set[str]:
@@ -25,7 +26,7 @@ def get_variables(node: Node) -> Set[str]:
 
 def generate_exit_sets(node: Node, entry_set: apron.Abstract0, exit_sets: Dict[str, apron.Abstract0],
                        var_registry: VariableRegistry, const_registry: VariableRegistry,
-                       manager: apron.Manager) -> Dict[str, apron.Abstract0]:
+                       manager: apron.Manager, expression_cache: ExpressionCache = None) -> Dict[str, apron.Abstract0]:
     '''
     Function to compute the exit set(s) from the given entry set and node semantics
     '''
@@ -33,6 +34,8 @@ def generate_exit_sets(node: Node, entry_set: apron.Abstract0, exit_sets: Dict[s
     node_module = getattr(nodes, node.node_type, None)
 
     if node_module is None:
-        return {'*': apron.Abstract0(manager, entry_set)}
+        # (the stored states are never modified, hence shared instead of copied)
+        return {'*': entry_set}
 
-    return node_module.generate_exit_sets(node, entry_set, exit_sets, var_registry, const_registry, manager)
+    return node_module.generate_exit_sets(node, entry_set, exit_sets, var_registry, const_registry, manager,
+                                         expression_cache)
@@ -0,0 +1,128 @@
+'''
+The Summaries of the Affine Loops (see static_analysis.loop_acceleration)
+'''
+from __future__ import annotations
+from typing import Any, List, Tuple, Union
+from java_wrapper import apron
+from static_analysis.abstract_collecting_semantics.objects import VariableRegistry, ExpressionCache, _export_scalar
+from static_analysis.abstract_collecting_semantics.builder.common import compute_expression_object, compute_constraints
+from static_analysis.loop_acceleration.objects import AffineLoop
+from instrumentation.metrics import metrics
+
+
+def generate_summary_state(loop: AffineLoop, entry_states: List[apron.Abstract0], var_registry: VariableRegistry,
+                           const_registry: VariableRegistry, manager: apron.Manager,
+                           expression_cache: ExpressionCache = None) -> Union[apron.Abstract0, None]:
+    '''
+    Compute the state of the head of an affine loop over all its trips, from the states entering the loop:
+    with n the largest trip count over the bounds of the counter and the bound, the states after
+    1 to n trips are within the hull of the entering state shifted by 1 and n steps (the updates
+    being affine in the trip), and satisfy the guard before their last trip.
+    None if the trip count is unbounded (an infinite bound of the counter or the bound),
+    the loop being iterated instead.
+
+    The summary is a new state, unless the loop is never entered
+    (the entering state, if a single one)
+    '''
+
+    # the join of the states entering the loop
+    entry_state = entry_states[0]
+    if len(entry_states) > 1:
+        entry_state = entry_state.joinCopy(manager, entry_states[1])
+        for state in entry_states[2:]:
+            entry_state.join(manager, state)
+
+        metrics.increment('abstract.apron_calls', operation='joinCopy')
+        metrics.increment('abstract.apron_calls', len(entry_states) - 2, operation='join')
+
+    if entry_state.isBottom(manager):
+        return entry_state
+
+    counter, bound, guard = compute_loop_expressions(
+        loop, var_registry, const_registry, entry_state, manager, expression_cache)
+
+    metrics.increment('abstract.apron_calls', 2, operation='getBound')
+
+    trips = loop.get_max_trips(get_interval_bounds(entry_state.getBound(manager, counter)),
+                               get_interval_bounds(entry_state.getBound(manager, bound)))
+    if trips is None:
+        return None
+    if trips == 0:
+        return entry_state
+
+    # the hull of the states after the first and the last trips
+    summary = shift_state(loop, entry_state, 1, var_registry, manager)
+    if trips > 1:
+        summary.join(manager, shift_state(loop, entry_state, trips, var_registry, manager))
+        metrics.increment('abstract.apron_calls', operation='join')
+
+    # refined with the guard before the last trip, and joined with the states never entering the loop
+    summary.meet(manager, guard)
+    summary.join(manager, entry_state)
+    metrics.increment('abstract.apron_calls', operation='meet')
+    metrics.increment('abstract.apron_calls', operation='join')
+
+    return summary
+
+
+def compute_loop_expressions(loop: AffineLoop, var_registry: VariableRegistry, const_registry: VariableRegistry,
+                             abstract_state: apron.Abstract0, manager: apron.Manager,
+                             expression_cache: ExpressionCache = None) -> Tuple[Any, Any, Any]:
+    '''
+    Compute the interned expressions of the counter and the bound of an affine loop,
+    and the constraint of its guard before the last trip (i.e., on 'counter - step + offset'),
+    translated once per analysis if an expression cache is given
+    '''
+
+    counter_id = var_registry.get_id(loop.counter)
+
+    def translate_counter() -> apron.Texpr0Intern:
+        return apron.Texpr0Intern(apron.Texpr0DimNode(counter_id))
+
+    def translate_bound() -> apron.Texpr0Intern:
+        return apron.Texpr0Intern(compute_expression_object(
+            loop.bound, var_registry, const_registry, abstract_state, manager))
+
+    def translate_guard() -> Any:
+        counter = apron.Texpr0BinNode(apron.Texpr0BinNode.OP_ADD, apron.Texpr0DimNode(counter_id),
+                                      apron.Texpr0CstNode(apron.MpqScalar(loop.offset - loop.steps[loop.counter])))
+        bound = compute_expression_object(
+            loop.bound, var_registry, const_registry, abstract_state, manager)
+
+        return compute_constraints(counter, bound, loop.operator, True)
+
+    if expression_cache is None:
+        return translate_counter(), translate_bound(), translate_guard()
+
+    return (expression_cache.get_expression(loop.head, 'counter', translate_counter),
+            expression_cache.get_expression(loop.head, 'bound', translate_bound),
+            expression_cache.get_expression(loop.head, 'guard', translate_guard))
+
+
+def shift_state(loop: AffineLoop, abstract_state: apron.Abstract0, trips: int,
+                var_registry: VariableRegistry, manager: apron.Manager) -> apron.Abstract0:
+    '''
+    Compute the state after the given number of trips from a state, i.e., every updated variable
+    v assigned v + trips * step(v), regardless of the guard
+    '''
+
+    for variable, step in loop.steps.items():
+        variable_index = var_registry.get_id(variable)
+
+        expr = apron.Texpr0Intern(apron.Texpr0BinNode(
+            apron.Texpr0BinNode.OP_ADD, apron.Texpr0DimNode(variable_index),
+            apron.Texpr0CstNode(apron.MpqScalar(trips * step))))
+
+        abstract_state = abstract_state.assignCopy(manager, variable_index, expr, None)
+
+    metrics.increment('abstract.apron_calls', len(loop.steps), operation='assignCopy')
+
+    return abstract_state
+
+
+def get_interval_bounds(interval: apron.Interval) -> Tuple[Any, Any]:
+    '''
+    Get the (inf, sup) bounds of an interval as python numbers
+    '''
+
+    return _export_scalar(interval.inf()), _export_scalar(interval.sup())
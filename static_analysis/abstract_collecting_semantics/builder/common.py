@@ -1,7 +1,27 @@
-from typing import Tuple, Any, Union
+from __future__ import annotations
+from typing import Tuple, Any, Union, Dict
 from java_wrapper import java, apron
-from static_analysis.abstract_collecting_semantics.objects import VariableRegistry
+from static_analysis.abstract_collecting_semantics.objects import VariableRegistry, ExpressionCache
 from control_flow_graph.node_processor import Node
+from instrumentation import get_logger, TRACE
+from instrumentation.metrics import metrics
+
+logger = get_logger('abstract')
+
+# the operators of the comparisons (evaluated to True, False or 'any' on the abstract state)
+COMPARISON_OPERATORS = ('==', '!=', '<', '<=', '>', '>=')
+
+# the constraints of the comparisons on their (true, false) branches, as
+# (swap the sides, is strict, constraint kind) of the constraint 'left - right kind 0'
+# (the kinds are named, and resolved on the Tcons0 class on use, as loading it starts the JVM)
+GUARD_CONSTRAINTS = {
+    '<': ((True, True, 'SUPEQ'), (False, False, 'SUPEQ')),
+    '<=': ((True, False, 'SUPEQ'), (False, True, 'SUPEQ')),
+    '>': ((False, True, 'SUPEQ'), (True, False, 'SUPEQ')),
+    '>=': ((False, False, 'SUPEQ'), (True, True, 'SUPEQ')),
+    '==': ((False, False, 'EQ'), (False, False, 'DISEQ')),
+    '!=': ((False, False, 'DISEQ'), (False, False, 'EQ'))
+}
 
 
 def traverse_expression_object(node: Node, identifiers: set) -> str:
@@ -46,11 +66,11 @@ def compute_expression_object(node: Node, var_registry: VariableRegistry, const_
             const_value = const_registry.get_value(node.name)
             if isinstance(const_value, str):
                 if const_value == 'top':
-                    print('EXEC TOP')
                     interval = apron.Interval()
                     interval.setTop()
                     node = apron.Texpr0CstNode(interval)
-                    print(node.toString())
+                    if logger.isEnabledFor(TRACE):
+                        logger.log(TRACE, 'EXEC TOP %s', node.toString())
                     return node
                 else:
                     return apron.Texpr0CstNode(apron.MpqScalar(int(const_value)))
@@ -104,21 +124,142 @@ def compute_binary_operation(left: apron.Texpr0Node, right: apron.Texpr0Node, op
     if operator in arithmetic_op_mapping:
         return apron.Texpr0BinNode(arithmetic_op_mapping[operator], left, right)
     elif operator in logical_op_mapping:
-        # Evaluate expressions to get their intervals within the abstract state
-        interval_left = abstract_state.getBound(
-            manager, apron.Texpr0Intern(left))
-        interval_right = abstract_state.getBound(
-            manager, apron.Texpr0Intern(right))
+        return compare_expressions(apron.Texpr0Intern(left), apron.Texpr0Intern(right), operator,
+                                   abstract_state, manager)
+    else:
+        raise ValueError(f"Unsupported operator: {operator}")
+
+
+def compare_expressions(left: apron.Texpr0Intern, right: apron.Texpr0Intern, operator: str,
+                        abstract_state: apron.Abstract0, manager: apron.Manager) -> Union[bool, str]:
+    '''
+    Compare the (interned) expressions of a comparison, within the abstract state
+    '''
 
-        # Perform comparison based on the operator
-        comparison_result = compare_intervals(
-            interval_left, interval_right, operator)
+    # Evaluate expressions to get their intervals within the abstract state
+    interval_left = abstract_state.getBound(manager, left)
+    interval_right = abstract_state.getBound(manager, right)
 
-        print("COMP INTER", interval_left, interval_right, comparison_result)
+    # Perform comparison based on the operator
+    comparison_result = compare_intervals(
+        interval_left, interval_right, operator)
 
-        return comparison_result
-    else:
-        raise ValueError(f"Unsupported operator: {operator}")
+    logger.log(TRACE, 'COMP INTER %s %s %s',
+               interval_left, interval_right, comparison_result)
+
+    return comparison_result
+
+
+def compute_expression_intern(node_id: str, expression: Node, var_registry: VariableRegistry,
+                              const_registry: VariableRegistry, abstract_state: apron.Abstract0,
+                              manager: apron.Manager, expression_cache: ExpressionCache = None) -> apron.Texpr0Intern:
+    '''
+    Compute the interned expression tree of the (arithmetic) expression of a node,
+    translated once per analysis if an expression cache is given
+    '''
+
+    def translate() -> apron.Texpr0Intern:
+        return apron.Texpr0Intern(compute_expression_object(
+            expression, var_registry, const_registry, abstract_state, manager))
+
+    if expression_cache is None:
+        return translate()
+
+    return expression_cache.get_expression(node_id, 'expression', translate)
+
+
+def compute_guards(node_id: str, condition: Node, var_registry: VariableRegistry,
+                   const_registry: VariableRegistry, abstract_state: apron.Abstract0, manager: apron.Manager,
+                   expression_cache: ExpressionCache = None) -> Union[Tuple[Any, Any], None]:
+    '''
+    Compute the constraints (as Tcons0 arrays, to meet the states with) of the condition of a node
+    on its true and false branches, translated once per analysis if an expression cache is given
+    (None if the condition is not a comparison)
+    '''
+
+    if condition.node_type != 'BinaryOperation' or condition.operator not in COMPARISON_OPERATORS:
+        return None
+
+    def translate(branch: bool) -> Any:
+        left = compute_expression_object(
+            condition.leftExpression, var_registry, const_registry, abstract_state, manager)
+        right = compute_expression_object(
+            condition.rightExpression, var_registry, const_registry, abstract_state, manager)
+
+        return compute_constraints(left, right, condition.operator, branch)
+
+    if expression_cache is None:
+        return translate(True), translate(False)
+
+    return (expression_cache.get_expression(node_id, 'true', lambda: translate(True)),
+            expression_cache.get_expression(node_id, 'false', lambda: translate(False)))
+
+
+def compute_constraints(left: apron.Texpr0Node, right: apron.Texpr0Node, operator: str, branch: bool) -> Any:
+    '''
+    Compute the constraint (as a Tcons0 array, to meet the states with) of the comparison
+    of the given sides on its true or false branch
+    '''
+
+    # the comparison on the branch, as (difference of the sides, is strict, constraint kind)
+    swap, strict, kind = GUARD_CONSTRAINTS[operator][0 if branch else 1]
+
+    if swap:
+        left, right = right, left
+
+    expr = apron.Texpr0BinNode(apron.Texpr0BinNode.OP_SUB, left, right)
+
+    # the variables are integers, hence a strict comparison (d > 0) is d - 1 >= 0
+    if strict:
+        expr = apron.Texpr0BinNode(apron.Texpr0BinNode.OP_SUB, expr,
+                                   apron.Texpr0CstNode(apron.MpqScalar(1)))
+
+    constraints = apron.Tcons0[1]
+    constraints[0] = apron.Tcons0(getattr(apron.Tcons0, kind), apron.Texpr0Intern(expr))
+
+    return constraints
+
+
+def compute_branch_states(node_id: str, condition: Node, true_branch: str, false_branch: str,
+                          var_registry: VariableRegistry, const_registry: VariableRegistry,
+                          abstract_state: apron.Abstract0, manager: apron.Manager,
+                          expression_cache: ExpressionCache = None) -> Union[Dict[str, apron.Abstract0], None]:
+    '''
+    Compute the states of the true and false branches of a node, refining the state with the guard
+    of each branch (the bottom state, if the branch is infeasible), or None if the condition is not a comparison
+    '''
+
+    guards = compute_guards(node_id, condition, var_registry, const_registry,
+                            abstract_state, manager, expression_cache)
+    if guards is None:
+        return None
+
+    true_guard, false_guard = guards
+
+    metrics.increment('abstract.apron_calls', 2, operation='meetCopy')
+
+    return {true_branch: abstract_state.meetCopy(manager, true_guard),
+            false_branch: abstract_state.meetCopy(manager, false_guard)}
+
+
+def compute_condition(node_id: str, condition: Node, var_registry: VariableRegistry,
+                      const_registry: VariableRegistry, abstract_state: apron.Abstract0,
+                      manager: apron.Manager, expression_cache: ExpressionCache = None) -> Union[bool, str]:
+    '''
+    Compute the value (True, False or 'any') of the condition of a node, the sides of
+    a comparison being translated once per analysis if an expression cache is given
+    '''
+
+    if expression_cache is None or condition.node_type != 'BinaryOperation' \
+            or condition.operator not in COMPARISON_OPERATORS:
+        return compute_expression_object(condition, var_registry, const_registry, abstract_state, manager)
+
+    left = expression_cache.get_expression(node_id, 'left', lambda: apron.Texpr0Intern(compute_expression_object(
+        condition.leftExpression, var_registry, const_registry, abstract_state, manager)))
+    right = expression_cache.get_expression(node_id, 'right', lambda: apron.Texpr0Intern(compute_expression_object(
+        condition.rightExpression, var_registry, const_registry, abstract_state, manager)))
+
+    return compare_expressions(left, right, condition.operator, abstract_state, manager)
 
 
 def compare_intervals(interval_left: apron.Interval, interval_right: apron.Interval, operator: str) -> bool:
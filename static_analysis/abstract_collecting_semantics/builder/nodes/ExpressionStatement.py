@@ -1,12 +1,16 @@
 '''
 ExpressionStatement Expression Handlers
 '''
+from __future__ import annotations
 from typing import Set, Tuple, Any, Dict
 from copy import deepcopy
 from java_wrapper import java, apron
-from static_analysis.abstract_collecting_semantics.objects import VariableRegistry
+from static_analysis.abstract_collecting_semantics.objects import VariableRegistry, ExpressionCache
 from control_flow_graph.node_processor.nodes import ExpressionStatement
-from static_analysis.abstract_collecting_semantics.builder.common import traverse_expression_object, compute_expression_object
+from static_analysis.abstract_collecting_semantics.builder.common import traverse_expression_object, compute_expression_intern
+from instrumentation import get_logger, TRACE
+
+logger = get_logger('abstract')
 
 
 def get_variables(node: ExpressionStatement) -> Set[str]:
@@ -41,7 +45,7 @@ def get_variables(node: ExpressionStatement) -> Set[str]:
 
 def generate_exit_sets(node: ExpressionStatement, entry_set: apron.Abstract0, exit_sets: Dict[str, apron.Abstract0],
                        var_registry: VariableRegistry, const_registry: VariableRegistry,
-                       manager: apron.Manager) -> Dict[str, apron.Abstract0]:
+                       manager: apron.Manager, expression_cache: ExpressionCache = None) -> Dict[str, apron.Abstract0]:
     '''
     Function to compute the exit set(s) from the given entry set and node semantics
     '''
@@ -49,18 +53,16 @@ def generate_exit_sets(node: ExpressionStatement, entry_set: apron.Abstract0, ex
     # obtain the expression property
     expression = node.expression
 
-    print(entry_set)
+    logger.log(TRACE, '%s entry %s', node.cfg_id, entry_set)
 
     # init symbol sets
     left_symbol = get_variables(node).pop()
 
     #   1. based on the state values, compute the expression
-    expr = compute_expression_object(
-        expression.rightHandSide, var_registry, const_registry,
-        entry_set, manager)
-
-    # Assuming parsed_expression returns a Texpr0Node or similar
-    expr = apron.Texpr0Intern(expr)
+    # (the interned expression tree, translated once per analysis if cached)
+    expr = compute_expression_intern(
+        node.cfg_id, expression.rightHandSide, var_registry, const_registry,
+        entry_set, manager, expression_cache)
 
     #   2. replace the computed variable (lhs) value in this particular state
     variable_index = var_registry.get_id(left_symbol)
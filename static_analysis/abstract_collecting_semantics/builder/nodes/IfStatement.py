@@ -1,12 +1,13 @@
 '''
 WhileStatement Expression Handlers
 '''
+from __future__ import annotations
 from typing import Set, Tuple, Any, Dict
 from copy import deepcopy
 from java_wrapper import java, apron
-from static_analysis.abstract_collecting_semantics.objects import VariableRegistry
+from static_analysis.abstract_collecting_semantics.objects import VariableRegistry, ExpressionCache
 from control_flow_graph.node_processor.nodes import IfStatement
-from static_analysis.abstract_collecting_semantics.builder.common import compute_expression_object, generate_bottom_state
+from static_analysis.abstract_collecting_semantics.builder.common import compute_branch_states, compute_condition, generate_bottom_state
 
 
 def get_variables(node: IfStatement) -> Set[str]:
@@ -22,7 +23,7 @@ def get_variables(node: IfStatement) -> Set[str]:
 
 def generate_exit_sets(node: IfStatement, entry_set: apron.Abstract0, exit_sets: Dict[str, apron.Abstract0],
                        var_registry: VariableRegistry, const_registry: VariableRegistry,
-                       manager: apron.Manager) -> Dict[str, apron.Abstract0]:
+                       manager: apron.Manager, expression_cache: ExpressionCache = None) -> Dict[str, apron.Abstract0]:
     '''
     Function to compute the exit set(s) from the given entry set and node semantics
     '''
@@ -34,17 +35,27 @@ def generate_exit_sets(node: IfStatement, entry_set: apron.Abstract0, exit_sets:
     true_branch = node.true_body_next
     false_branch = node.false_body_next
 
-    # init exit_set ('*') as empty set
-    exit_dict = {true_branch: apron.Abstract0(manager, entry_set),
-                 false_branch: apron.Abstract0(manager, entry_set)}
+    # refine the entry state with the guard of each branch, if the condition is a comparison
+    # (a single meetCopy per branch, the infeasible branch getting the bottom state)
+    refined_exit_dict = compute_branch_states(
+        node.cfg_id, condition, true_branch, false_branch, var_registry, const_registry,
+        entry_set, manager, expression_cache)
+    if refined_exit_dict is not None:
+        return refined_exit_dict
+
+    # otherwise, evaluate the condition on the entry state
+    # init exit_set ('*') as the entry set
+    # (the stored states are never modified, hence shared instead of copied)
+    exit_dict = {true_branch: entry_set,
+                 false_branch: entry_set}
     if '*' not in exit_sets:
         exit_dict = {true_branch: exit_sets[true_branch],
                      false_branch: exit_sets[false_branch]}
 
     #   1. based on the state values, compute the expression
-    expr_value = compute_expression_object(
-        condition, var_registry, const_registry,
-        entry_set, manager)
+    expr_value = compute_condition(
+        node.cfg_id, condition, var_registry, const_registry,
+        entry_set, manager, expression_cache)
 
     #   2. based on the computed expression,
     # if expr_value is True, add state to true branch
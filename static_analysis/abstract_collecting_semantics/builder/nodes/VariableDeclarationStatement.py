@@ -1,12 +1,13 @@
 '''
 VariableDeclarationStatement Expression Handlers
 '''
+from __future__ import annotations
 from typing import Set, Tuple, Any, Dict
 from copy import deepcopy
 from java_wrapper import java, apron
-from static_analysis.abstract_collecting_semantics.objects import VariableRegistry
+from static_analysis.abstract_collecting_semantics.objects import VariableRegistry, ExpressionCache
 from control_flow_graph.node_processor.nodes import VariableDeclarationStatement
-from static_analysis.abstract_collecting_semantics.builder.common import compute_expression_object
+from static_analysis.abstract_collecting_semantics.builder.common import compute_expression_intern
 
 
 def get_variables(node: VariableDeclarationStatement) -> Set[str]:
@@ -26,7 +27,7 @@ def get_variables(node: VariableDeclarationStatement) -> Set[str]:
 
 def generate_exit_sets(node: VariableDeclarationStatement, entry_set: apron.Abstract0, exit_sets: Dict[str, apron.Abstract0],
                        var_registry: VariableRegistry, const_registry: VariableRegistry,
-                       manager: apron.Manager) -> Dict[str, apron.Abstract0]:
+                       manager: apron.Manager, expression_cache: ExpressionCache = None) -> Dict[str, apron.Abstract0]:
     '''
     Function to compute the exit set(s) from the given entry set and node semantics
     '''
@@ -36,15 +37,14 @@ def generate_exit_sets(node: VariableDeclarationStatement, entry_set: apron.Abst
 
     # EDGE CASE: if the variable is not declared with any values
     if node.initialValue is None:
-        return {'*': apron.Abstract0(manager, entry_set)}
+        # (the stored states are never modified, hence shared instead of copied)
+        return {'*': entry_set}
 
     #   1. based on the state values, compute the expression
-    expr = compute_expression_object(
-        node.initialValue, var_registry, const_registry,
-        entry_set, manager)
-
-    # Assuming parsed_expression returns a Texpr0Node or similar
-    expr = apron.Texpr0Intern(expr)
+    # (the interned expression tree, translated once per analysis if cached)
+    expr = compute_expression_intern(
+        node.cfg_id, node.initialValue, var_registry, const_registry,
+        entry_set, manager, expression_cache)
 
     #   2. replace the computed variable (lhs) value in this particular state
     variable_index = var_registry.get_id(left_symbol)
@@ -1,8 +1,16 @@
 '''
 Auxiliary Objects Module
 '''
-from typing import Any, Tuple, Union, List, Set, Dict
+from __future__ import annotations
+from typing import Any, Callable, Iterable, Tuple, Union, List, Set, Dict
+from fractions import Fraction
+from jpype import JArray, JInt
 from java_wrapper import apron, java
+from instrumentation import get_logger, TRACE
+from instrumentation.metrics import metrics
+from static_analysis.checkpoint import check_checkpoint
+
+logger = get_logger('abstract')
 
 
 class VariableRegistry(object):
@@ -58,6 +66,49 @@ class VariableRegistry(object):
         self.variable_table[variable]['value'] = value
 
 
+class ExpressionCache(object):
+    '''
+    Class caching the interned APRON expression trees (and the guard constraints) of the nodes:
+    the expression of a node (with the values of the constants baked in) never changes between
+    the fixed point rounds, hence it is translated into a Texpr0Intern once per analysis, on its first evaluation
+    '''
+
+    def __init__(self):
+        # mapping of the (node id, role) to the interned expression tree (or the constraints),
+        # the role telling apart the expressions of a node (e.g., the guards of the branches)
+        self.expressions = dict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_expression(self, node_id: str, role: str,
+                       translate: Callable[[], Any]) -> Any:
+        '''
+        Get the interned expression (or the constraints) of a node, translating it if not cached yet
+        '''
+
+        key = (node_id, role)
+
+        expression = self.expressions.get(key, None)
+        if expression is None:
+            expression = translate()
+            self.expressions[key] = expression
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return expression
+
+    def clear(self) -> None:
+        '''
+        Drop the cached expressions (e.g., when the values of the constants change)
+        '''
+
+        self.expressions.clear()
+        self.hits = 0
+        self.misses = 0
+
+
 class PointState(object):
     '''
     Class representing the state of variables at a program point
@@ -75,8 +126,52 @@ class PointState(object):
         self.node_states = dict()
 
         # the iteration counter variable to keet record of the iterations taken
+        # (i.e., the highest number of times any node has been evaluated)
         self.iteration = 0
 
+        # the latest iteration of each node, as the nodes are only re-evaluated
+        # while the loop (component) containing them has not stabilized
+        self.node_iterations = dict()
+
+        # mapping of node id to the dimensions of the variables dead at the entry of the node
+        # (only populated if the liveness-driven projection is enabled)
+        self.dead_dimensions = dict()
+
+        # the states are never modified once stored (hence shared between the iterations, the branches
+        # and the nodes), only the state allocated by the latest entry update is owned, i.e., can be
+        # modified in place (the destructive APRON operations) till the next update
+        self.owned_state = None
+
+        # the number of abstract states allocated (on the JVM heap)
+        self.allocations = 0
+
+        # the nodes whose latest entry state changed (or which were never evaluated), and the ones
+        # whose latest entry state is a new object, not compared yet with the previous one
+        # (the others are unchanged, their entry state being the previous object),
+        # so that the fixed point check only compares the states of these nodes
+        self.changed_nodes = set()
+        self.pending_nodes = set()
+
+        # mapping of node id to the exit states its latest entry state was joined from
+        # (if the same state objects come in again, the entry state is unchanged)
+        self.entry_inputs = dict()
+
+    def set_live_variables(self, live_variables: Dict[str, Set[str]]) -> None:
+        '''
+        Set the variables live at the entry of each node,
+        the dimensions of the remaining variables are forgotten in the entry states of the node
+        '''
+
+        all_variables = set(self.variable_registry.variable_table.keys())
+
+        for node_id, variables in live_variables.items():
+            dead = sorted(self.variable_registry.get_id(variable)
+                          for variable in all_variables - variables)
+
+            # store the dimensions as a java int[], to avoid converting it on every round
+            if len(dead) > 0:
+                self.dead_dimensions[node_id] = JArray(JInt)(dead)
+
     def register_node(self, node_id: str) -> None:
         '''
         Register a node and initialize the state
@@ -100,17 +195,35 @@ class PointState(object):
         # in this case, if we don't need to specify a next node, we use the wildcard '*'
         self.node_states[node_id]['exit'][0] = {'*': None}
 
+        self.node_iterations[node_id] = 0
+
+    def get_node_iteration(self, node_id: str) -> int:
+        '''
+        Get the latest iteration of a node
+        '''
+
+        return self.node_iterations[node_id]
+
     def init_node_states(self) -> None:
         '''
         Initialize the node states to default values or the bottom state at the 0th iteration
         '''
 
+        # the nodes are not stable till evaluated
+        self.changed_nodes = set(self.node_states.keys())
+        self.pending_nodes = set()
+        self.entry_inputs = dict()
+
+        # the bottom state is shared by all the nodes
+        bottom_state = self.__generate_bottom_state_tuple()
+        self.count_allocations('init', 2)
+
         for node_id in self.node_states:
             # generate a default state based on the type of node
             # if the node is the starting node, then it needs to be 0 interval
             # else for all other nodes it needs to be bottom interval
             default_state = self.__generate_default_state_tuple() if node_id == self.starting_node \
-                else self.__generate_bottom_state_tuple()
+                else bottom_state
 
             # initialize the state table for the entry and exit points
             self.node_states[node_id]['entry'][0] = default_state
@@ -129,6 +242,9 @@ class PointState(object):
         if node_id not in self.node_states:
             raise Exception(f"Node with id {node_id} is not registered!")
 
+        # the state of a node does not change after its latest iteration
+        iteration = min(iteration, self.node_iterations[node_id])
+
         if iteration not in self.node_states[node_id][point]:
             raise Exception(
                 f"State for Iteration {iteration} is not available for node {node_id}!")
@@ -137,7 +253,8 @@ class PointState(object):
         if not is_entry:
             if get_all:
                 return self.node_states[node_id][point][iteration]
-            print("CHK-EXIT", self.node_states[node_id][point][iteration])
+            logger.log(TRACE, 'CHK-EXIT %s',
+                       self.node_states[node_id][point][iteration])
             if next_node not in self.node_states[node_id][point][iteration]:
                 if '*' in self.node_states[node_id][point][iteration]:
                     return self.node_states[node_id][point][iteration]['*']
@@ -148,72 +265,301 @@ class PointState(object):
 
         return self.node_states[node_id][point][iteration]
 
-    def start_computation_round(self) -> None:
+    def start_node_round(self, node_id: str) -> None:
         '''
-        Start the computation round by imcrementing the iteration counter
+        Start the computation round of a node by incrementing its iteration counter
         '''
 
-        self.iteration += 1
+        self.node_iterations[node_id] += 1
+        self.iteration = max(self.iteration, self.node_iterations[node_id])
 
-    def is_fixed_point_reached(self) -> bool:
+    def is_fixed_point_reached(self, nodes: Iterable[str] = None) -> bool:
         '''
-        Check if the fixed point is reached or not
+        Check if the fixed point is reached or not,
+        over the given nodes (i.e., a component of the CFG) or all the nodes
         '''
 
-        # base case
-        # if the iteration is 0, return False
-        if self.iteration < 1:
-            return False
+        if nodes is None:
+            nodes = self.node_states.keys()
+        elif not isinstance(nodes, (set, frozenset)):
+            nodes = set(nodes)
 
-        # iterate over all the nodes, and check their exit states
-        for node_id in self.node_states:
-            current_state = self.node_states[node_id]['entry'][self.iteration]
-            prev_state = self.node_states[node_id]['entry'][self.iteration - 1]
-
-            # EDGE CASE: prev state is None
-            if prev_state is None:
-                return False
+        # the unchanged nodes (the same entry state object) are not compared,
+        # hence the check only costs as much as the number of changed nodes
+        if any(node_id in nodes for node_id in self.changed_nodes):
+            return False
 
-            # if the current state is not equal to the previous state,
-            # then the fixed point has not been reached
-            # in this case we use the apron method isEqual to check the similarity
-            if not current_state.isEqual(self.manager, prev_state):
+        for node_id in [node_id for node_id in self.pending_nodes if node_id in nodes]:
+            if self.__resolve_entry_change(node_id):
                 return False
 
         # if everything passes, return True
         return True
 
-    def update_node_entry_state(self, node_id: str, prev_nodes: List[str]) -> None:
+    def is_entry_state_changed(self, node_id: str) -> bool:
+        '''
+        Check if the entry state of a node changed in its latest iteration
+        '''
+
+        if self.node_iterations[node_id] < 1:
+            return False
+
+        if node_id in self.pending_nodes:
+            return self.__resolve_entry_change(node_id)
+
+        return node_id in self.changed_nodes
+
+    def is_entry_state_unchanged(self, node_id: str) -> bool:
         '''
-        Update state ordered-pair for the current iteration
+        Check if the entry state of a node is known to be unchanged in its latest iteration,
+        without comparing the states (i.e., it is the previous state object)
+        '''
+
+        return self.node_iterations[node_id] >= 1 and node_id not in self.changed_nodes \
+            and node_id not in self.pending_nodes
+
+    def get_entry_state_measures(self, node_id: str) -> Tuple[int, float]:
+        '''
+        Get the size (the number of bounded dimensions) and the width
+        (the widest interval, infinite if any dimension is unbounded)
+        of the latest entry state of a node
+        '''
+
+        state = self.node_states[node_id]['entry'][self.node_iterations[node_id]]
+
+        if state is None or state.isBottom(self.manager):
+            return 0, 0
+
+        size = 0
+        width = 0
+        for interval in state.toBox(self.manager):
+            inf, sup = _export_scalar(interval.inf()), _export_scalar(interval.sup())
+            interval_width = float(sup - inf)
+
+            if interval_width != float('inf'):
+                size += 1
+            width = max(width, interval_width)
+
+        return size, width
+
+    def update_node_entry_state(self, node_id: str, prev_nodes: List[str], reuse_inputs=True) -> None:
+        '''
+        Update state ordered-pair for the next iteration
         of a given node at it's entry point.
+        (the previous entry state is reused for the same exit states of the previous nodes,
+        if enabled and the previous entry state is their join, i.e., not widened)
         '''
 
+        self.start_node_round(node_id)
+        iteration = self.node_iterations[node_id]
+
         # edge case: node is the starting node
         # here we do nothing and return
         if node_id == self.starting_node:
             prev_nodes = list()
 
-        # obtain the exit state ordered-pair sets from the previous nodes
+        # obtain the latest exit state ordered-pair sets from the previous nodes
+        # (the previous nodes of the same component may already be at this iteration)
         prev_states = []
         for prev_node in prev_nodes:
             prev_state = self.get_node_state_set(
-                prev_node, self.iteration - 1, is_entry=False, next_node=node_id)
+                prev_node, self.node_iterations[prev_node], is_entry=False, next_node=node_id)
             prev_states.append(prev_state)
 
+        # whether the entry state is allocated here (hence modifiable in place)
+        # or shared (the previous entry state, or the exit state of the single previous node)
+        owned = False
+
+        # the same exit states as in the previous iteration, hence the same entry state
+        # (without joining them again, nor comparing the entry states)
+        # (kept as a tuple, as the list of the previous states is consumed by the join below)
+        inputs = self.entry_inputs.get(node_id, None) if reuse_inputs else None
+        self.entry_inputs[node_id] = tuple(prev_states)
+        if inputs is not None and len(inputs) == len(prev_states) \
+                and all(state is input_state for state, input_state in zip(prev_states, inputs)):
+            self.node_states[node_id]['entry'][iteration] = self.node_states[node_id]['entry'][iteration-1]
+            self.owned_state = None
+            self.changed_nodes.discard(node_id)
+            self.pending_nodes.discard(node_id)
+            metrics.increment('abstract.change_checks', result='inputs')
+            return
+
         # if previous states is empty, then generate a new state
         if len(prev_states) == 0:
-            abs_state = self.node_states[node_id]['entry'][self.iteration-1]
+            abs_state = self.node_states[node_id]['entry'][iteration-1]
         else:
             # set the union as the entry set at the current iteration
             abs_state = prev_states.pop()
-            for state in prev_states:
-                # use the apron method to join (union of) the two states
-                abs_state = abs_state.joinCopy(self.manager, state)
+            if len(prev_states) > 0:
+                # use the apron method to join (union of) the two states,
+                # allocating the entry state with the first join, and joining in place with the rest
+                abs_state = abs_state.joinCopy(self.manager, prev_states[0])
+                for state in prev_states[1:]:
+                    abs_state.join(self.manager, state)
+                owned = True
+
+                self.count_allocations('joinCopy')
+                metrics.increment('abstract.apron_calls', operation='joinCopy')
+                metrics.increment('abstract.apron_calls', len(prev_states) - 1,
+                                  operation='join')
+
+            metrics.increment('abstract.joins', len(prev_states))
+
+        # forget the dead dimensions (the state of a dead variable is never read,
+        # and forgetting it stops its changes from delaying the fixed point)
+        if node_id in self.dead_dimensions:
+            if owned:
+                abs_state.forget(
+                    self.manager, self.dead_dimensions[node_id], False)
+                metrics.increment('abstract.apron_calls',
+                                  operation='forget')
+            else:
+                abs_state = abs_state.forgetCopy(
+                    self.manager, self.dead_dimensions[node_id], False)
+                owned = True
+
+                self.count_allocations('forgetCopy')
+                metrics.increment('abstract.apron_calls',
+                                  operation='forgetCopy')
+
+        self.node_states[node_id]['entry'][iteration] = abs_state
+        self.owned_state = abs_state if owned else None
 
-        self.node_states[node_id]['entry'][self.iteration] = abs_state
+        self.__update_entry_change(node_id)
 
-        print("ABSTATE", java.Arrays.toString(abs_state.toBox(self.manager)))
+        # formatting the box crosses the JVM boundary, hence only done if traced
+        if logger.isEnabledFor(TRACE):
+            logger.log(TRACE, 'ABSTATE %s %s', node_id,
+                       java.Arrays.toString(abs_state.toBox(self.manager)))
+
+    def set_node_entry_state(self, node_id: str, abs_state: apron.Abstract0, owned=False, pruned=False) -> None:
+        '''
+        Replace the entry state of a node at its current iteration (e.g., with the summary of a loop,
+        at its head), the state being modifiable in place if owned, and its dead dimensions
+        forgotten unless already pruned (e.g., a previous entry state of the node)
+        '''
+
+        iteration = self.node_iterations[node_id]
+
+        if node_id in self.dead_dimensions and not pruned:
+            if owned:
+                abs_state.forget(
+                    self.manager, self.dead_dimensions[node_id], False)
+                metrics.increment('abstract.apron_calls',
+                                  operation='forget')
+            else:
+                abs_state = abs_state.forgetCopy(
+                    self.manager, self.dead_dimensions[node_id], False)
+                owned = True
+
+                self.count_allocations('forgetCopy')
+                metrics.increment('abstract.apron_calls',
+                                  operation='forgetCopy')
+
+        self.node_states[node_id]['entry'][iteration] = abs_state
+        self.owned_state = abs_state if owned else None
+
+        self.__update_entry_change(node_id)
+
+    def widen_node_entry_state(self, node_id: str) -> None:
+        '''
+        Widen the latest entry state of a node (a loop head) with its previous one
+        '''
+
+        iteration = self.node_iterations[node_id]
+
+        prev_state = self.node_states[node_id]['entry'][iteration - 1]
+        state = self.node_states[node_id]['entry'][iteration]
+        if prev_state is None or state is None:
+            return
+
+        # an unchanged state is not widened (the widening of a state with itself is the state)
+        if self.is_entry_state_unchanged(node_id):
+            return
+
+        # (the widening expects the previous state to be included in the next one,
+        # joined in place if the state is owned)
+        if state is self.owned_state:
+            state.join(self.manager, prev_state)
+            metrics.increment('abstract.apron_calls', operation='join')
+        else:
+            state = prev_state.joinCopy(self.manager, state)
+            self.count_allocations('joinCopy')
+            metrics.increment('abstract.apron_calls', operation='joinCopy')
+
+        self.node_states[node_id]['entry'][iteration] = prev_state.widening(
+            self.manager, state)
+        self.owned_state = self.node_states[node_id]['entry'][iteration]
+
+        # the widened state is not the join of the exit states of the previous nodes,
+        # hence not reused for the same exit states
+        self.entry_inputs.pop(node_id, None)
+
+        self.count_allocations('widening')
+        metrics.increment('abstract.apron_calls', operation='widening')
+
+        # (the widened state may be the previous one, if the state decreased)
+        self.__update_entry_change(node_id)
+
+    def share_exit_states(self, node_id: str) -> None:
+        '''
+        Share the exit states of the previous iteration of a node as the ones of its latest iteration
+        (the transfer function yields the same exit states for the same entry state)
+        '''
+
+        iteration = self.node_iterations[node_id]
+
+        self.node_states[node_id]['exit'][iteration] = dict(
+            self.node_states[node_id]['exit'][iteration - 1])
+
+    def __update_entry_change(self, node_id: str) -> None:
+        '''
+        Mark the latest entry state of a node as unchanged (the previous state object), changed,
+        or pending (a new object, compared with the previous one only when needed)
+        '''
+
+        iteration = self.node_iterations[node_id]
+
+        state = self.node_states[node_id]['entry'][iteration]
+        prev_state = self.node_states[node_id]['entry'][iteration - 1]
+
+        self.changed_nodes.discard(node_id)
+        self.pending_nodes.discard(node_id)
+
+        if state is prev_state:
+            metrics.increment('abstract.change_checks', result='identity')
+        elif prev_state is None or state is None:
+            self.changed_nodes.add(node_id)
+        else:
+            self.pending_nodes.add(node_id)
+
+    def __resolve_entry_change(self, node_id: str) -> bool:
+        '''
+        Compare the (pending) latest entry state of a node with the previous one, through the JVM
+        '''
+
+        iteration = self.node_iterations[node_id]
+
+        state = self.node_states[node_id]['entry'][iteration]
+        prev_state = self.node_states[node_id]['entry'][iteration - 1]
+
+        changed = not state.isEqual(self.manager, prev_state)
+        metrics.increment('abstract.change_checks', result='isEqual')
+        metrics.increment('abstract.apron_calls', operation='isEqual')
+
+        self.pending_nodes.discard(node_id)
+        if changed:
+            self.changed_nodes.add(node_id)
+
+        return changed
+
+    def count_allocations(self, operation: str, count=1) -> None:
+        '''
+        Count the abstract states allocated by an operation
+        '''
+
+        self.allocations += count
+        metrics.increment('abstract.allocations', count, operation=operation)
 
     def update_node_exit_state(self, node_id: str, next_node_id: str, exit_state: apron.Abstract0) -> None:
         '''
@@ -222,12 +568,172 @@ class PointState(object):
         This exit set might be different for different next nodes of the node
         '''
 
+        iteration = self.node_iterations[node_id]
+
         # check if the dictionary for the current iteration is initialized or not
-        if self.iteration not in self.node_states[node_id]['exit']:
-            self.node_states[node_id]['exit'][self.iteration] = dict()
+        if iteration not in self.node_states[node_id]['exit']:
+            self.node_states[node_id]['exit'][iteration] = dict()
 
         # write the exit state set for the next node at the current iteration
-        self.node_states[node_id]['exit'][self.iteration][next_node_id] = exit_state
+        self.node_states[node_id]['exit'][iteration][next_node_id] = exit_state
+
+    def get_memory_usage(self) -> Dict[str, Dict[str, Any]]:
+        '''
+        Get the number of live abstract states of every node (over all the retained iterations),
+        the states live on the JVM heap, hence their size is not estimated (see the JVM heap usage)
+        '''
+
+        usage = dict()
+        for node_id, states in self.node_states.items():
+            abstract_states = list(states['entry'].values())
+            for exit_states in states['exit'].values():
+                abstract_states.extend(exit_states.values())
+
+            # the same state may be shared by several iterations or successors
+            live_states = {id(state): state for state in abstract_states
+                           if state is not None}
+
+            usage[node_id] = {
+                'states': len(live_states),
+                'size': None
+            }
+
+        return usage
+
+    def release_history(self) -> None:
+        '''
+        Release the states of the past iterations of the nodes, keeping the latest two
+        (the fixed point check compares them, and the transfer functions read the latest ones)
+        '''
+
+        for node_id, states in self.node_states.items():
+            oldest = self.node_iterations[node_id] - 1
+
+            for point in ('entry', 'exit'):
+                for iteration in [iteration for iteration in states[point] if iteration < oldest]:
+                    del states[point][iteration]
+
+    def export_checkpoint(self) -> Dict[str, Any]:
+        '''
+        Export the latest two iterations of the states of the nodes (see static_analysis.checkpoint),
+        every abstract state as the list of the bounds of its dimensions (None for the bottom state),
+        exported once and referenced by its index, so that the shared states are restored as shared
+        (the change detection relies on the identity of the states)
+        '''
+
+        states = list()
+        indices = dict()
+
+        def export(state: apron.Abstract0) -> Union[int, None]:
+            if state is None:
+                return None
+
+            index = indices.get(id(state), None)
+            if index is None:
+                index = len(states)
+                indices[id(state)] = index
+                states.append(self.__export_box(state))
+
+            return index
+
+        nodes = dict()
+        for node_id, node_states in self.node_states.items():
+            oldest = self.node_iterations[node_id] - 1
+            nodes[node_id] = {
+                'entry': {iteration: export(state) for iteration, state in node_states['entry'].items()
+                          if iteration >= oldest},
+                'exit': {iteration: {next_node_id: export(state) for next_node_id, state in exit_states.items()}
+                         for iteration, exit_states in node_states['exit'].items() if iteration >= oldest}
+            }
+
+        return {
+            'kind': 'abstract',
+            'starting_node': self.starting_node,
+            'variables': list(self.variable_registry.variable_table.keys()),
+            'iteration': self.iteration,
+            'iterations': dict(self.node_iterations),
+            'changed_nodes': sorted(self.changed_nodes),
+            'pending_nodes': sorted(self.pending_nodes),
+            'states': states,
+            'nodes': nodes
+        }
+
+    def import_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        '''
+        Restore the states of the nodes from a checkpoint (of the same CFG)
+        '''
+
+        check_checkpoint(checkpoint, 'abstract', self)
+
+        states = [self.__import_box(box) for box in checkpoint['states']]
+        self.count_allocations('checkpoint', len(states))
+
+        def restore(index: Union[int, None]) -> apron.Abstract0:
+            return None if index is None else states[index]
+
+        for node_id, node_states in checkpoint['nodes'].items():
+            self.node_states[node_id] = {
+                'entry': {iteration: restore(index) for iteration, index in node_states['entry'].items()},
+                'exit': {iteration: {next_node_id: restore(index) for next_node_id, index in exit_states.items()}
+                         for iteration, exit_states in node_states['exit'].items()}
+            }
+
+        self.iteration = checkpoint['iteration']
+        self.node_iterations = dict(checkpoint['iterations'])
+
+        self.changed_nodes = set(checkpoint['changed_nodes'])
+        self.pending_nodes = set(checkpoint['pending_nodes'])
+
+        # (the exit states the entry states were joined from are not restored, hence joined again)
+        self.entry_inputs = dict()
+        self.owned_state = None
+
+    def export_results(self) -> Dict[str, Any]:
+        '''
+        Export the final entry and exit states of the nodes as plain python objects
+        (e.g., to persist them), each state being the list of the (inf, sup) bounds
+        of the variables, or None for the bottom state
+        '''
+
+        nodes = dict()
+        for node_id, states in self.node_states.items():
+            iteration = self.node_iterations[node_id]
+            nodes[node_id] = {
+                'entry': self.__export_box(states['entry'][iteration]),
+                'exit': {next_node_id: self.__export_box(state)
+                         for next_node_id, state in states['exit'][iteration].items()}
+            }
+
+        return {
+            'variables': list(self.variable_registry.variable_table.keys()),
+            'iterations': dict(self.node_iterations),
+            'nodes': nodes
+        }
+
+    def __export_box(self, state: apron.Abstract0) -> Union[List[Tuple[Any, Any]], None]:
+        '''
+        Export an abstract state as the list of the bounds of its dimensions
+        '''
+
+        if state is None or state.isBottom(self.manager):
+            return None
+
+        return [(_export_scalar(interval.inf()), _export_scalar(interval.sup()))
+                for interval in state.toBox(self.manager)]
+
+    def __import_box(self, box: Union[List[Tuple[Any, Any]], None]) -> apron.Abstract0:
+        '''
+        Import an abstract state from the list of the bounds of its dimensions (None for the bottom state)
+        '''
+
+        if box is None:
+            return self.__generate_bottom_state_tuple()
+
+        box_state = apron.Interval[len(box)]
+        for i, (inf, sup) in enumerate(box):
+            box_state[i] = apron.Interval(_import_scalar(inf), _import_scalar(sup))
+
+        return apron.Abstract0(self.manager, len(box), 0, box_state)
 
     def __generate_default_state_tuple(self) -> Tuple[Any]:
         '''
@@ -274,3 +780,34 @@ class PointState(object):
                                 real_variables_count, box_state)
 
         return state
+
+
+def _export_scalar(scalar: apron.Scalar) -> Union[int, float, Fraction]:
+    '''
+    Export an APRON scalar (bound) as a python number
+    '''
+
+    # isInfty returns the sign of the infinity, or 0 for finite scalars
+    sign = scalar.isInfty()
+    if sign != 0:
+        return sign * float('inf')
+
+    value = Fraction(str(scalar.toString()))
+
+    return int(value) if value.denominator == 1 else value
+
+
+def _import_scalar(value: Union[int, float, Fraction]) -> apron.Scalar:
+    '''
+    Import a python number (bound) as an APRON scalar
+    '''
+
+    scalar = apron.MpqScalar()
+
+    if value in (float('inf'), float('-inf')):
+        scalar.setInfty(1 if value > 0 else -1)
+        return scalar
+
+    value = Fraction(value)
+
+    return apron.MpqScalar(java.BigInteger(str(value.numerator)), java.BigInteger(str(value.denominator)))
@@ -0,0 +1,108 @@
+'''
+The Analysis Budget
+
+Bounds the resources an analysis of a function may use: the wall-clock time, the number of
+fixed point iterations, the size of the state sets and the memory the process grows by
+(over its resident memory when the budget is started, as the memory of the process is
+shared with the other analyses it ran before, e.g., the previous levels of the ladder). The engines
+check the budget inside their fixed point loops, and raise a BudgetExceeded exception as soon
+as a limit is crossed (see static_analysis.degradation for the ladder of cheaper analyses
+run in that case).
+'''
+import time
+from typing import Union
+from instrumentation.memory import get_process_memory
+
+
+class BudgetExceeded(Exception):
+    '''
+    Exception raised when an analysis exceeds a limit of its budget
+    '''
+
+    def __init__(self, resource: str, used: Union[int, float], limit: Union[int, float]):
+        super(BudgetExceeded, self).__init__(
+            f'Budget exceeded: {resource} {used} over the limit {limit}!')
+
+        # the exceeded resource ('wall_time', 'iterations', 'state_set_size' or 'memory')
+        self.resource = resource
+        self.used = used
+        self.limit = limit
+
+
+class AnalysisBudget(object):
+    '''
+    Class representing the budget of an analysis (every limit is optional)
+    '''
+
+    def __init__(self, wall_time: float = None, iterations: int = None, state_set_size: int = None,
+                 memory: int = None, memory_check_interval=256):
+        '''
+        Constructor
+        '''
+
+        # the limits: seconds, iterations (of any node), state tuples (in a state set)
+        # and bytes (over the memory of the process when started)
+        self.wall_time = wall_time
+        self.iterations = iterations
+        self.state_set_size = state_set_size
+        self.memory = memory
+
+        # the memory is only measured every few checks, as it is costlier than the other limits
+        self.memory_check_interval = memory_check_interval
+
+        self.start_time = None
+        self.memory_baseline = None
+        self.checks = 0
+
+    def copy(self) -> 'AnalysisBudget':
+        '''
+        Get a fresh (not started) budget with the same limits
+        '''
+
+        return AnalysisBudget(self.wall_time, self.iterations, self.state_set_size,
+                              self.memory, self.memory_check_interval)
+
+    def start(self) -> None:
+        '''
+        Start the clock of the budget, and take the baseline of the memory (if limited)
+        '''
+
+        self.start_time = time.perf_counter()
+        self.memory_baseline = get_process_memory() if self.memory is not None else None
+        self.checks = 0
+
+    def get_elapsed_time(self) -> float:
+        '''
+        Get the wall-clock time elapsed since the budget was started
+        '''
+
+        return 0.0 if self.start_time is None else time.perf_counter() - self.start_time
+
+    def check(self, iteration: int = None, state_set_size: int = None) -> None:
+        '''
+        Check the budget, along with the current iteration and state set size (if given),
+        raising BudgetExceeded if any limit is crossed
+        '''
+
+        if self.start_time is None:
+            self.start()
+
+        if self.wall_time is not None:
+            elapsed = time.perf_counter() - self.start_time
+            if elapsed > self.wall_time:
+                raise BudgetExceeded('wall_time', elapsed, self.wall_time)
+
+        if self.iterations is not None and iteration is not None and iteration > self.iterations:
+            raise BudgetExceeded('iterations', iteration, self.iterations)
+
+        if self.state_set_size is not None and state_set_size is not None and state_set_size > self.state_set_size:
+            raise BudgetExceeded(
+                'state_set_size', state_set_size, self.state_set_size)
+
+        # (the memory is measured at the first check, then every interval checks)
+        if self.memory is not None and self.checks % self.memory_check_interval == 0:
+            used = get_process_memory() - self.memory_baseline
+            if used > self.memory:
+                raise BudgetExceeded('memory', used, self.memory)
+
+        self.checks += 1
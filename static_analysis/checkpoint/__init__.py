@@ -0,0 +1,137 @@
+'''
+The Analysis Checkpoints
+
+Periodically saves the progress of a fixed point computation, so that a preempted analysis
+resumes from its latest checkpoint instead of starting over. A checkpoint holds the latest two
+iterations of the states of every node (all the fixed point check and the transfer functions
+read), exported by the point state of the engine, along with the position of the computation
+in the weak topological ordering (WTO) of the CFG: the path of the components (loops) being
+iterated, saved at the start of a round of the innermost one.
+
+The position is the list of the frames of the enclosing components, from the outermost one,
+each frame being [the index of the component in the elements of its parent, the descending
+(narrowing) round being computed, or None for the ascending rounds]. On resume, the engine
+skips the elements before the path, and the head of the enclosing components, as their
+rounds were in progress when the checkpoint was saved.
+
+A checkpoint is only resumed from by the same analysis of the same CFG, with the same constants
+(the nodes and variables are checked, the constants are the responsibility of the caller, see
+cli.get_checkpointer). The checkpoints are zlib compressed pickles (see storage), written atomically.
+'''
+import os
+import time
+from typing import Any, Dict, List, Union
+from storage import serialize, deserialize
+from storage.objects import write_atomic
+from instrumentation.metrics import metrics
+
+# the version of the checkpoint format, the checkpoints of another format are not resumed from
+FORMAT_VERSION = 1
+
+
+class Checkpointer(object):
+    '''
+    Class saving and loading the checkpoints of a fixed point computation (in a single file)
+    '''
+
+    def __init__(self, path: str, interval=60.0, resume=True, keep=False):
+        '''
+        Constructor
+        '''
+
+        self.path = path
+
+        # the wall-clock time (seconds) between two checkpoints (at every round, if 0)
+        self.interval = interval
+
+        # whether a computation resumes from the checkpoint of the path (if any),
+        # and whether the checkpoint is kept once the computation completes
+        self.resume = resume
+        self.keep = keep
+
+        self.last_save = None
+        self.saves = 0
+
+    def start(self) -> None:
+        '''
+        Start the clock of the checkpoints
+        '''
+
+        self.last_save = time.perf_counter()
+
+    def is_due(self) -> bool:
+        '''
+        Check if a checkpoint is due (the interval elapsed since the latest one)
+        '''
+
+        if self.last_save is None:
+            self.start()
+
+        return time.perf_counter() - self.last_save >= self.interval
+
+    def save(self, point_state: Any, position: List[List[Union[int, None]]]) -> None:
+        '''
+        Save the states of the point state, along with the position of the computation in the WTO
+        '''
+
+        with metrics.phase('checkpoint.save'):
+            data = serialize({
+                'version': FORMAT_VERSION,
+                'position': [list(frame) for frame in position],
+                'state': point_state.export_checkpoint()
+            })
+
+            # (so that a preemption while writing never leaves a partial checkpoint)
+            write_atomic(self.path, data)
+
+        self.last_save = time.perf_counter()
+        self.saves += 1
+
+        metrics.increment('checkpoint.saves')
+        metrics.observe('checkpoint.size', len(data))
+
+    def load(self, point_state: Any) -> Union[List[List[Union[int, None]]], None]:
+        '''
+        Restore the states of the point state from the checkpoint (if resuming and saved),
+        and get the position of the computation in the WTO to resume from (None, if not restored)
+        '''
+
+        if not self.resume or not os.path.isfile(self.path):
+            return None
+
+        with metrics.phase('checkpoint.load'):
+            with open(self.path, 'rb') as f:
+                payload = deserialize(f.read())
+
+            if payload.get('version', None) != FORMAT_VERSION:
+                raise Exception(f'Checkpoint {self.path} has an unsupported format!')
+
+            point_state.import_checkpoint(payload['state'])
+
+        metrics.increment('checkpoint.resumes')
+
+        return payload['position']
+
+    def complete(self) -> None:
+        '''
+        Drop the checkpoint of a completed computation (unless kept),
+        so that a later run does not resume from it
+        '''
+
+        if not self.keep and os.path.isfile(self.path):
+            os.remove(self.path)
+
+
+def check_checkpoint(checkpoint: Dict[str, Any], kind: str, point_state: Any) -> None:
+    '''
+    Check that the states of a checkpoint were exported by the same kind of point state,
+    over the same CFG (the same nodes, starting node and variables), raising an exception otherwise
+    '''
+
+    if checkpoint['kind'] != kind:
+        raise Exception(f'Checkpoint of the {checkpoint["kind"]} states, not of the {kind} ones!')
+
+    if checkpoint['starting_node'] != point_state.starting_node \
+            or set(checkpoint['nodes'].keys()) != set(point_state.node_states.keys()) \
+            or checkpoint['variables'] != list(point_state.variable_registry.variable_table.keys()):
+        raise Exception('Checkpoint of another CFG!')
@@ -1,20 +1,34 @@
 '''
 The Collecting Semantics Analysis
 '''
-from typing import Union
+import time
+import logging
+from typing import List, Union
 from control_flow_graph import ControlFlowGraph
+from control_flow_graph.node_processor import Node
+from control_flow_graph.analysis.objects import WTOComponent
 from static_analysis.collecting_semantics.objects import VariableRegistry, PointState
 import static_analysis.collecting_semantics.builder as builder
+import static_analysis.collecting_semantics.builder.acceleration as acceleration
+from static_analysis.loop_acceleration import LoopAccelerator
+from static_analysis.loop_acceleration.objects import AffineLoop
+from static_analysis.dataflow_analysis.live_variables import LiveVariablesAnalysis
+from instrumentation import get_logger, TRACE
+from instrumentation.metrics import metrics
 # from static_analysis.dataflow_analysis.avl_expr.expr_builder import expr_builder
 # from static_analysis.dataflow_analysis.avl_expr.expr_builder.objects import Expression, ExpressionStatement
 
+logger = get_logger('semantics')
+
 
 class CollectingSemanticsAnalysis(object):
     '''
     Class defining the collecting semantics analysis
     '''
 
-    def __init__(self, cfg: ControlFlowGraph, starting_node: str, ending_node: str):
+    def __init__(self, cfg: ControlFlowGraph, starting_node: str, ending_node: str,
+                 prune_dead_variables=False, observed_variables=None, tracer=None, profiler=None, budget=None,
+                 checkpointer=None, accelerate_loops=False):
         '''
         Constructor
         '''
@@ -23,6 +37,40 @@ class CollectingSemanticsAnalysis(object):
         self.starting_node = starting_node
         self.ending_node = ending_node
 
+        # if enabled, the dead variables are projected out of the states at each node
+        self.prune_dead_variables = prune_dead_variables
+
+        # the variables kept live at the ending node (all variables, if not specified)
+        self.observed_variables = observed_variables
+
+        # the (optional) convergence tracer, recording every evaluation of the nodes
+        self.tracer = tracer
+
+        # the (optional) memory profiler, enforcing its memory ceiling after every round
+        self.profiler = profiler
+
+        # the (optional) budget of the analysis, checked on every node evaluation
+        # (raising BudgetExceeded, see static_analysis.budget)
+        self.budget = budget
+
+        # the (optional) checkpointer, saving the progress of the fixed point computation
+        # at the start of the rounds (see static_analysis.checkpoint), and restoring it on resume
+        self.checkpointer = checkpointer
+
+        # if enabled, the affine loops (see static_analysis.loop_acceleration) are summarized in closed form
+        # at their head instead of iterated, unless a value entering them is not an integer
+        self.accelerate_loops = accelerate_loops
+
+        # mapping of the heads of the affine loops to the loops, and to their latest
+        # (entering state sets, summary), reused while the loop is entered with the same state sets
+        self.affine_loops = dict()
+        self.loop_summaries = dict()
+
+        # the frames of the components (loops) of the WTO being iterated, and the ones
+        # of the checkpoint being resumed from (till its position is reached)
+        self.wto_path = list()
+        self.resume_path = None
+
         self.variable_registry = VariableRegistry()
         self.constant_registry = VariableRegistry()
         self.point_state = PointState(
@@ -33,18 +81,42 @@ class CollectingSemanticsAnalysis(object):
         Compute the collecting semantics analysis
         '''
 
+        if self.budget is not None:
+            self.budget.start()
+
         # first compute on the expression statements
         # obtain the variables to track the state of
-        self.__compute_variables()
-        print(self.variable_registry.variable_table.keys())
-
-        self.__compute_collecting_semantics()
-        for node in self.point_state.node_states.keys():
-            for i in range(self.point_state.iteration, self.point_state.iteration+1):
-                print('ENTRY', i, node, self.point_state.get_node_state_set(
-                    node, i, True))
-                print('EXIT', i, node, self.point_state.get_node_state_set(
-                    node, i, False))
+        with metrics.phase('semantics.variables'):
+            self.__compute_variables()
+        logger.debug('Variables %s', list(
+            self.variable_registry.variable_table.keys()))
+
+        # run the live variables pre-pass to find the variables to project out
+        if self.prune_dead_variables:
+            with metrics.phase('semantics.liveness'):
+                self.__compute_live_variables()
+
+        # recognize the affine loops to summarize
+        if self.accelerate_loops:
+            with metrics.phase('semantics.loops'):
+                self.affine_loops = LoopAccelerator(
+                    self.cfg, self.starting_node, self.ending_node).compute()
+            self.loop_summaries = dict()
+
+        with metrics.phase('semantics.fixpoint'):
+            self.__compute_collecting_semantics()
+
+        if self.profiler is not None:
+            self.profiler.record_point_state('semantics', self.point_state)
+
+        # log the final states of the nodes
+        if logger.isEnabledFor(logging.DEBUG):
+            for node in self.point_state.node_states.keys():
+                for i in range(self.point_state.iteration, self.point_state.iteration+1):
+                    logger.debug('ENTRY %d %s %s', i, node, self.point_state.get_node_state_set(
+                        node, i, True))
+                    logger.debug('EXIT %d %s %s', i, node, self.point_state.get_node_state_set(
+                        node, i, False))
 
     def __compute_variables(self) -> None:
         '''
@@ -75,7 +147,7 @@ class CollectingSemanticsAnalysis(object):
             for variable in variables:
                 self.variable_registry.register_variable(variable)
 
-            print("VARIABLE-REGISTRY", node_id, variables)
+            logger.log(TRACE, 'VARIABLE-REGISTRY %s %s', node_id, variables)
 
             if node_id != self.ending_node:
                 for child_id in node.next_nodes:
@@ -85,74 +157,192 @@ class CollectingSemanticsAnalysis(object):
 
         traverse(self.starting_node, visited, self.cfg)
 
-    def __compute_collecting_semantics(self) -> None:
+    def __compute_live_variables(self) -> None:
         '''
-        Compute the Collecting Semantics
+        Compute the variables live at the entry of each node
         '''
 
-        def traverse(node_id, visited: set, cfg: ControlFlowGraph):
-            '''
-            Traverse the Graph and Compute the Collecting Semantics
-            '''
+        observed_variables = self.observed_variables if self.observed_variables is not None \
+            else self.variable_registry.variable_table.keys()
 
-            if node_id in visited:
-                return
+        liveness = LiveVariablesAnalysis(
+            self.cfg, self.starting_node, self.ending_node, observed_variables)
+        liveness.compute()
 
-            # add to visited set
-            visited.add(node_id)
+        self.point_state.set_live_variables(
+            {node_id: liveness.get_entry(node_id) for node_id in liveness.nodes})
 
-            print("COLLSEM-TRV", node_id)
+    def __compute_collecting_semantics(self) -> None:
+        '''
+        Compute the Collecting Semantics, following the weak topological ordering (WTO)
+        of the CFG: the nodes outside the loops are evaluated exactly once, in topological order,
+        and each loop (component) is iterated on its own till it stabilizes
+        '''
 
-            # get node instance / object
-            node = cfg.cfg_metadata.get_node(node_id)
+        analysis = self.cfg.get_analysis(self.starting_node, self.ending_node)
 
-            # get the previous nodes list of the node
-            prev_nodes = list(node.prev_nodes.keys())
+        # resume from the latest checkpoint, if any
+        self.wto_path = list()
+        self.resume_path = None
+        if self.checkpointer is not None:
+            self.checkpointer.start()
+            self.resume_path = self.checkpointer.load(self.point_state)
 
-            # 1. udpate the entry state set for the node
-            self.point_state.update_node_entry_state(node_id, prev_nodes)
-            entry_set = self.point_state.get_node_state_set(
-                node_id, self.point_state.iteration)
+        self.__compute_wto_elements(analysis.get_wto())
 
-            # 2. process the node semantics and generate the exit state sets for it's next nodes
-            exit_sets = builder.generate_exit_sets(
-                node, entry_set, self.variable_registry, self.constant_registry)
+        if self.checkpointer is not None:
+            self.checkpointer.complete()
+
+    def __compute_wto_elements(self, elements: List[Union[str, WTOComponent]]) -> None:
+        '''
+        Compute the Collecting Semantics over the elements of the WTO, in order
+        (on resume, from the component being iterated at the checkpoint)
+        '''
 
-            # 3. udpate the exit state set for the node
-            # (EDGE CASE: for ending node, we will use the next node as '*')
-            for next_node_id, exit_set in exit_sets.items():
-                self.point_state.update_node_exit_state(
-                    node_id, next_node_id, exit_set)
+        start = self.resume_path[len(self.wto_path)][0] if self.resume_path is not None else 0
 
-            '''
-            This should work like, 
-            [DONE] first, we obtain the values of the existing variables from exit node of the previous nodes:
-                1. obtain the exit of the previous nodes
-                2. apply the meet operator to these exit states
-                3. set this new one as the entry of the current (update entry state)
-            [DONE] second, compute the expression (if any based on the entry state values)
-            [DONE] third, update the exit state of the current node based on the computed expression
-                1. check if exit node's current value is different from the evaluated expression
-                2. if yes, update the exit state of the current node
-                3. else continue to next nodes
-            '''
+        for index in range(start, len(elements)):
+            element = elements[index]
 
-            # print("COLlSEM-COMPUT", node_id)
+            if isinstance(element, WTOComponent):
+                self.__compute_wto_component(element, index)
+            else:
+                self.__compute_node(element)
 
-            if node_id != self.ending_node:
-                for child_id in node.next_nodes:
-                    child_node = cfg.cfg_metadata.get_node(child_id)
+    def __compute_wto_component(self, component: WTOComponent, index: int) -> None:
+        '''
+        Iterate over a component (loop) of the WTO till the states of its nodes stabilize,
+        the nested components are stabilized on every iteration of the enclosing one
+        '''
 
-                    traverse(child_node.cfg_id, visited, cfg)
+        nodes = component.get_nodes()
+        in_progress = self.__enter_wto_component(index)
 
         while True:
-            visited = set()
-            self.point_state.start_computation_round()
-            print('Start Iter:', self.point_state.iteration)
-            traverse(self.starting_node, visited, self.cfg)
+            logger.debug('Start Iter: %s %d', component.head,
+                         self.point_state.get_node_iteration(component.head) + 1)
 
-            # print(self.point_state.iteration, 'VariableDeclarationStatement_1', self.point_state.get_node_state_set(
-            #     'VariableDeclarationStatement_1', self.point_state.iteration, True))
+            if not in_progress and self.checkpointer is not None and self.checkpointer.is_due():
+                self.checkpointer.save(self.point_state, self.wto_path)
 
-            if self.point_state.is_fixed_point_reached():
+            if self.tracer is not None:
+                self.tracer.start_round(component.head)
+
+            with metrics.phase('semantics.round'):
+                # (the round being in progress on resume, its head is not computed again)
+                if not in_progress:
+                    self.__compute_node(component.head)
+                self.__compute_wto_elements(component.elements)
+
+                fixed_point_reached = self.point_state.is_fixed_point_reached(nodes)
+
+            if self.tracer is not None:
+                self.tracer.end_round()
+
+            in_progress = False
+
+            if self.profiler is not None:
+                self.profiler.check(self.point_state)
+
+            if fixed_point_reached:
                 break
+
+        self.wto_path.pop()
+
+    def __enter_wto_component(self, index: int) -> bool:
+        '''
+        Enter a component of the WTO (the index-th of its parent elements), getting whether its round
+        is in progress (i.e., it encloses the component being iterated at the checkpoint resumed from)
+        '''
+
+        depth = len(self.wto_path)
+        self.wto_path.append([index, None])
+
+        if self.resume_path is None:
+            return False
+
+        # the position of the checkpoint is reached, the round of the component starts as saved
+        if depth == len(self.resume_path) - 1:
+            self.resume_path = None
+            return False
+
+        return True
+
+    def __compute_node(self, node_id: str) -> None:
+        '''
+        Compute the Collecting Semantics of a node
+        '''
+
+        logger.log(TRACE, 'COLLSEM-TRV %s', node_id)
+
+        # get node instance / object
+        node = self.cfg.cfg_metadata.get_node(node_id)
+
+        # get the previous nodes list of the node
+        prev_nodes = list(node.prev_nodes.keys())
+
+        # 1. udpate the entry state set for the node
+        self.point_state.update_node_entry_state(node_id, prev_nodes)
+        if node_id in self.affine_loops:
+            self.__accelerate_loop(self.affine_loops[node_id])
+        entry_set = self.point_state.get_node_state_set(
+            node_id, self.point_state.get_node_iteration(node_id))
+
+        if self.budget is not None:
+            self.budget.check(self.point_state.iteration, len(entry_set))
+
+        metrics.increment('semantics.transfer', node_type=node.node_type)
+        metrics.observe('semantics.state_set_size', len(entry_set))
+
+        # 2. process the node semantics and generate the exit state sets for it's next nodes
+        transfer_start = time.perf_counter() if self.tracer is not None else 0.0
+
+        exit_sets = builder.generate_exit_sets(
+            node, entry_set, self.variable_registry, self.constant_registry)
+
+        if self.tracer is not None:
+            self.__trace_node(node, time.perf_counter() - transfer_start)
+
+        # 3. udpate the exit state set for the node
+        # (EDGE CASE: for ending node, we will use the next node as '*')
+        for next_node_id, exit_set in exit_sets.items():
+            self.point_state.update_node_exit_state(
+                node_id, next_node_id, exit_set)
+
+    def __accelerate_loop(self, loop: AffineLoop) -> None:
+        '''
+        Replace the entry state set of the head of an affine loop with the summary of the loop,
+        computed from the state sets entering the loop (unless not computable for them,
+        the loop being iterated as usual)
+        '''
+
+        entry_sets = [self.point_state.get_node_state_set(
+            node_id, self.point_state.get_node_iteration(node_id), False, loop.head)
+            for node_id in loop.entering_nodes]
+
+        # the same entering state sets as in the latest summary, hence the same summary
+        inputs, summary = self.loop_summaries.get(loop.head, (None, None))
+        if inputs is not None and len(inputs) == len(entry_sets) \
+                and all(state_set is input_set for state_set, input_set in zip(entry_sets, inputs)):
+            metrics.increment('semantics.acceleration', result='reused')
+        else:
+            # (the budget is exceeded as soon as the summary grows past the state set size)
+            summary = acceleration.generate_summary_set(
+                loop, entry_sets, self.variable_registry, self.constant_registry,
+                self.budget.state_set_size if self.budget is not None else None)
+            self.loop_summaries[loop.head] = (entry_sets, summary)
+            metrics.increment('semantics.acceleration',
+                              result='summary' if summary is not None else 'fallback')
+
+        if summary is not None:
+            self.point_state.set_node_entry_state(loop.head, summary)
+
+    def __trace_node(self, node: Node, transfer_time: float) -> None:
+        '''
+        Record the evaluation of a node on the convergence tracer
+        '''
+
+        size, width = self.point_state.get_entry_state_measures(node.cfg_id)
+
+        self.tracer.record(node.cfg_id, node.node_type, self.point_state.is_entry_state_changed(node.cfg_id),
+                           size, width, transfer_time)
@@ -0,0 +1,56 @@
+'''
+The Summaries of the Affine Loops (see static_analysis.loop_acceleration)
+'''
+from typing import Set, Tuple, Any, List, Union
+from static_analysis.collecting_semantics.objects import VariableRegistry
+from static_analysis.collecting_semantics.builder.common import compute_expression_object, set_var_registry_state
+from static_analysis.loop_acceleration.objects import AffineLoop
+from static_analysis.budget import BudgetExceeded
+
+
+def generate_summary_set(loop: AffineLoop, entry_sets: List[Set[Tuple[Any]]], var_registry: VariableRegistry,
+                         const_registry: VariableRegistry, max_states: int = None) -> Union[Set[Tuple[Any]], None]:
+    '''
+    Compute the states of the head of an affine loop over all its trips, from the states entering the loop:
+    a state entering with the counter x and the bound B (evaluated on the state) is at the head
+    after k trips, for k from 0 to the trip count of (x, B), with every variable v at v + k * step(v).
+    None if the trip count is not computable (i.e., a value of the counter, the bound or an updated
+    variable is not an integer), the loop being iterated instead.
+
+    Raises BudgetExceeded as soon as the summary exceeds the given number of states (if any),
+    as the state set of the head would exceed the budget of the analysis anyway
+    '''
+
+    counter_id = var_registry.get_id(loop.counter)
+    updates = [(var_registry.get_id(variable), step) for variable, step in loop.steps.items()]
+
+    summary = set()
+
+    for state_tuple in set().union(*entry_sets):
+        # the bound, evaluated on the state (the variables of the bound are not updated by the loop)
+        set_var_registry_state(state_tuple, var_registry)
+        bound = compute_expression_object(loop.bound, var_registry, const_registry)
+
+        if not is_integer(bound) or not all(is_integer(state_tuple[index]) for index, _ in updates):
+            return None
+
+        # the states of the head after every trip, from the entering state
+        trips = loop.get_trips(state_tuple[counter_id], bound)
+        for trip in range(trips + 1):
+            state = list(state_tuple)
+            for index, step in updates:
+                state[index] = state_tuple[index] + trip * step
+            summary.add(tuple(state))
+
+            if max_states is not None and len(summary) > max_states:
+                raise BudgetExceeded('state_set_size', len(summary), max_states)
+
+    return summary
+
+
+def is_integer(value: Any) -> bool:
+    '''
+    Check if a value of a state is an integer (neither undefined, a range nor a boolean)
+    '''
+
+    return isinstance(value, int) and not isinstance(value, bool)
@@ -6,6 +6,9 @@ from copy import deepcopy
 from static_analysis.collecting_semantics.objects import VariableRegistry
 from control_flow_graph.node_processor.nodes import WhileStatement
 from static_analysis.collecting_semantics.builder.common import update_state_tuple, compute_expression_object, set_var_registry_state
+from instrumentation import get_logger, TRACE
+
+logger = get_logger('semantics')
 
 
 def get_variables(node: WhileStatement) -> Set[str]:
@@ -44,7 +47,7 @@ def generate_exit_sets(node: WhileStatement, entry_set: Set[Tuple[Any]],
         expr_value = compute_expression_object(
             condition, var_registry, const_registry)
 
-        print(node.cfg_id, expr_value, state_tuple)
+        logger.log(TRACE, '%s %s %s', node.cfg_id, expr_value, state_tuple)
 
         #   2. based on the computed expression,
         # if expr_value is True, add state to true branch
@@ -57,6 +60,6 @@ def generate_exit_sets(node: WhileStatement, entry_set: Set[Tuple[Any]],
             raise Exception(
                 f'Invalid expression value {expr_value} for while statement!')
 
-    print("EXIT DICT", exit_dict)
+    logger.log(TRACE, 'EXIT DICT %s', exit_dict)
 
     return exit_dict
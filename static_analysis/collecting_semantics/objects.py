@@ -1,8 +1,11 @@
 '''
 Auxiliary Objects Module
 '''
-from typing import Any, Tuple, Union, List, Set, Dict
+from typing import Any, Iterable, Tuple, Union, List, Set, Dict
 from enum import Enum
+from instrumentation.metrics import metrics
+from instrumentation.memory import estimate_state_set_size
+from static_analysis.checkpoint import check_checkpoint
 
 
 class VariableRegistry(object):
@@ -81,8 +84,30 @@ class PointState(object):
         self.node_states = dict()
 
         # the iteration counter variable to keet record of the iterations taken
+        # (i.e., the highest number of times any node has been evaluated)
         self.iteration = 0
 
+        # the latest iteration of each node, as the nodes are only re-evaluated
+        # while the loop (component) containing them has not stabilized
+        self.node_iterations = dict()
+
+        # mapping of node id to the ids of the variables dead at the entry of the node
+        # (only populated if the liveness-driven projection is enabled)
+        self.dead_variables = dict()
+
+    def set_live_variables(self, live_variables: Dict[str, Set[str]]) -> None:
+        '''
+        Set the variables live at the entry of each node,
+        the remaining variables are projected out of the entry states of the node
+        '''
+
+        all_variables = set(self.variable_registry.variable_table.keys())
+
+        for node_id, variables in live_variables.items():
+            dead = all_variables - variables
+            self.dead_variables[node_id] = frozenset(
+                self.variable_registry.get_id(variable) for variable in dead)
+
     def register_node(self, node_id: str) -> None:
         '''
         Register a node and initialize the state
@@ -106,6 +131,15 @@ class PointState(object):
         # in this case, if we don't need to specify a next node, we use the wildcard '*'
         self.node_states[node_id]['exit'][0] = {'*': set()}
 
+        self.node_iterations[node_id] = 0
+
+    def get_node_iteration(self, node_id: str) -> int:
+        '''
+        Get the latest iteration of a node
+        '''
+
+        return self.node_iterations[node_id]
+
     def get_node_state_set(self, node_id: str, iteration: int, is_entry=True, next_node='*') -> Union[Set[Tuple[int]], Dict[str, Set[Tuple[int]]]]:
         '''
         get the entry of a variable's state for a given node
@@ -116,6 +150,9 @@ class PointState(object):
         if node_id not in self.node_states:
             raise Exception(f"Node with id {node_id} is not registered!")
 
+        # the state of a node does not change after its latest iteration
+        iteration = min(iteration, self.node_iterations[node_id])
+
         if iteration not in self.node_states[node_id][point]:
             raise Exception(
                 f"State for Iteration {iteration} is not available for node {node_id}!")
@@ -132,27 +169,34 @@ class PointState(object):
 
         return self.node_states[node_id][point][iteration]
 
-    def start_computation_round(self) -> None:
+    def start_node_round(self, node_id: str) -> None:
         '''
-        Start the computation round by imcrementing the iteration counter
+        Start the computation round of a node by incrementing its iteration counter
         '''
 
-        self.iteration += 1
+        self.node_iterations[node_id] += 1
+        self.iteration = max(self.iteration, self.node_iterations[node_id])
 
-    def is_fixed_point_reached(self) -> bool:
+    def is_fixed_point_reached(self, nodes: Iterable[str] = None) -> bool:
         '''
-        Check if the fixed point is reached or not
+        Check if the fixed point is reached or not,
+        over the given nodes (i.e., a component of the CFG) or all the nodes
         '''
 
-        # base case
-        # if the iteration is 0, return False
-        if self.iteration < 1:
-            return False
+        if nodes is None:
+            nodes = self.node_states.keys()
 
-        # iterate over all the nodes, and check their exit states
-        for node_id in self.node_states:
-            current_state = self.node_states[node_id]['entry'][self.iteration]
-            prev_state = self.node_states[node_id]['entry'][self.iteration - 1]
+        # iterate over the nodes, and compare their latest two entry states
+        for node_id in nodes:
+            iteration = self.node_iterations[node_id]
+
+            # base case
+            # if the node was never evaluated, return False
+            if iteration < 1:
+                return False
+
+            current_state = self.node_states[node_id]['entry'][iteration]
+            prev_state = self.node_states[node_id]['entry'][iteration - 1]
 
             # if the current state is not equal to the previous state,
             # then the fixed point has not been reached
@@ -162,28 +206,69 @@ class PointState(object):
         # if everything passes, return True
         return True
 
+    def is_entry_state_changed(self, node_id: str) -> bool:
+        '''
+        Check if the entry state of a node changed in its latest iteration
+        '''
+
+        iteration = self.node_iterations[node_id]
+
+        if iteration < 1:
+            return False
+
+        return self.node_states[node_id]['entry'][iteration] != self.node_states[node_id]['entry'][iteration - 1]
+
+    def get_entry_state_measures(self, node_id: str) -> Tuple[int, int]:
+        '''
+        Get the size (the number of state tuples) and the width (the largest number
+        of distinct values of a variable) of the latest entry state of a node
+        '''
+
+        state_set = self.node_states[node_id]['entry'][self.node_iterations[node_id]]
+        width = max((len(set(values))
+                    for values in zip(*state_set)), default=0)
+
+        return len(state_set), width
+
     def update_node_entry_state(self, node_id: str, prev_nodes: List[str]) -> None:
         '''
-        Update state ordered-pair for the current iteration
+        Update state ordered-pair for the next iteration
         of a given node at it's entry point.
         '''
 
+        self.start_node_round(node_id)
+        iteration = self.node_iterations[node_id]
+
         # edge case: node is the starting node
         if node_id == self.starting_node:
             self.__init_start_node(node_id)
 
             return
 
-        # obtain the exit state ordered-pair sets from the previous nodes
+        # obtain the latest exit state ordered-pair sets from the previous nodes
+        # (the previous nodes of the same component may already be at this iteration)
         prev_states = []
         for prev_node in prev_nodes:
             prev_state = self.get_node_state_set(
-                prev_node, self.iteration - 1, is_entry=False, next_node=node_id)
+                prev_node, self.node_iterations[prev_node], is_entry=False, next_node=node_id)
             prev_states.append(prev_state)
 
+        metrics.increment('semantics.joins', len(prev_states) - 1)
+
         # set the union as the entry set at the current iteration
-        self.node_states[node_id]['entry'][self.iteration] = set.union(
-            *prev_states)
+        self.node_states[node_id]['entry'][iteration] = self.__project_state_set(
+            node_id, set.union(*prev_states))
+
+    def set_node_entry_state(self, node_id: str, state_set: Set[Tuple[Any]]) -> None:
+        '''
+        Replace the entry state set of a node at its current iteration
+        (e.g., with the summary of a loop, at its head)
+        '''
+
+        iteration = self.node_iterations[node_id]
+
+        self.node_states[node_id]['entry'][iteration] = self.__project_state_set(
+            node_id, state_set)
 
     def update_node_exit_state(self, node_id: str, next_node_id: str, exit_state_set: Set[Tuple[Any]]) -> None:
         '''
@@ -192,12 +277,117 @@ class PointState(object):
         This exit set might be different for different next nodes of the node
         '''
 
+        iteration = self.node_iterations[node_id]
+
         # check if the dictionary for the current iteration is initialized or not
-        if self.iteration not in self.node_states[node_id]['exit']:
-            self.node_states[node_id]['exit'][self.iteration] = dict()
+        if iteration not in self.node_states[node_id]['exit']:
+            self.node_states[node_id]['exit'][iteration] = dict()
 
         # write the exit state set for the next node at the current iteration
-        self.node_states[node_id]['exit'][self.iteration][next_node_id] = exit_state_set
+        self.node_states[node_id]['exit'][iteration][next_node_id] = exit_state_set
+
+    def get_memory_usage(self) -> Dict[str, Dict[str, int]]:
+        '''
+        Get the number of live state tuples of every node (over all the retained iterations),
+        along with their estimated size in bytes
+        '''
+
+        usage = dict()
+        for node_id, states in self.node_states.items():
+            state_sets = list(states['entry'].values())
+            for exit_sets in states['exit'].values():
+                state_sets.extend(exit_sets.values())
+
+            usage[node_id] = {
+                'states': sum(len(state_set) for state_set in state_sets),
+                'size': sum(estimate_state_set_size(state_set) for state_set in state_sets)
+            }
+
+        return usage
+
+    def release_history(self) -> None:
+        '''
+        Release the states of the past iterations of the nodes, keeping the latest two
+        (the fixed point check compares them, and the transfer functions read the latest ones)
+        '''
+
+        for node_id, states in self.node_states.items():
+            oldest = self.node_iterations[node_id] - 1
+
+            for point in ('entry', 'exit'):
+                for iteration in [iteration for iteration in states[point] if iteration < oldest]:
+                    del states[point][iteration]
+
+    def export_checkpoint(self) -> Dict[str, Any]:
+        '''
+        Export the latest two iterations of the states of the nodes (see static_analysis.checkpoint),
+        the state sets being kept as they are (sets of tuples, pickled compactly)
+        '''
+
+        nodes = dict()
+        for node_id, states in self.node_states.items():
+            oldest = self.node_iterations[node_id] - 1
+            nodes[node_id] = {point: {iteration: state for iteration, state in states[point].items()
+                                      if iteration >= oldest}
+                              for point in ('entry', 'exit')}
+
+        return {
+            'kind': 'semantics',
+            'starting_node': self.starting_node,
+            'variables': list(self.variable_registry.variable_table.keys()),
+            'iteration': self.iteration,
+            'iterations': dict(self.node_iterations),
+            'nodes': nodes
+        }
+
+    def import_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        '''
+        Restore the states of the nodes from a checkpoint (of the same CFG)
+        '''
+
+        check_checkpoint(checkpoint, 'semantics', self)
+
+        for node_id, states in checkpoint['nodes'].items():
+            self.node_states[node_id] = states
+
+        self.iteration = checkpoint['iteration']
+        self.node_iterations = dict(checkpoint['iterations'])
+
+    def export_results(self) -> Dict[str, Any]:
+        '''
+        Export the final entry and exit states of the nodes as plain python objects
+        (e.g., to persist them), along with the order of the variables in the state tuples
+        '''
+
+        nodes = dict()
+        for node_id, states in self.node_states.items():
+            iteration = self.node_iterations[node_id]
+            nodes[node_id] = {
+                'entry': states['entry'][iteration],
+                'exit': states['exit'][iteration]
+            }
+
+        return {
+            'variables': list(self.variable_registry.variable_table.keys()),
+            'iterations': dict(self.node_iterations),
+            'nodes': nodes
+        }
+
+    def __project_state_set(self, node_id: str, state_set: Set[Tuple[Any]]) -> Set[Tuple[Any]]:
+        '''
+        Project the dead variables out of the state set of a node,
+        by resetting them to the undefined value (the state tuples of the node
+        which differ only in dead variables collapse into one)
+        '''
+
+        dead = self.dead_variables.get(node_id, None)
+
+        # nothing to project, if liveness is not computed or all variables are live
+        if not dead:
+            return state_set
+
+        return set(tuple('btm' if i in dead else value for i, value in enumerate(state_tuple))
+                   for state_tuple in state_set)
 
     def __init_start_node(self, node_id: str) -> None:
         '''
@@ -209,7 +399,7 @@ class PointState(object):
         state_tuple_set.add(self.__generate_state_tuple())
 
         # set the state_tuple_set
-        self.node_states[node_id]['entry'][self.iteration] = state_tuple_set
+        self.node_states[node_id]['entry'][self.node_iterations[node_id]] = state_tuple_set
 
     def __generate_state_tuple(self) -> Tuple[Any]:
         '''
@@ -5,6 +5,9 @@ from typing import Union
 from control_flow_graph import ControlFlowGraph
 from static_analysis.dataflow_analysis.avl_expr.expr_builder import expr_builder
 from static_analysis.dataflow_analysis.avl_expr.expr_builder.objects import Expression, ExpressionStatement
+from instrumentation import get_logger, TRACE
+
+logger = get_logger('dataflow')
 
 
 class AvailableExpressionAnalysis(object):
@@ -156,15 +159,15 @@ class AvailableExpressionAnalysis(object):
         '''
 
         self.__compute_expressions()
-        print(self.expr_table.keys())
+        logger.debug('Expressions %s', self.expr_table.keys())
 
         self.__compute_gen_kill()
-        print(self.GEN)
-        print(self.KILL)
+        logger.debug('GEN %s', self.GEN)
+        logger.debug('KILL %s', self.KILL)
 
         self.__compute_avl_expr()
-        print(self.ENTRY)
-        print(self.EXIT)
+        logger.debug('ENTRY %s', self.ENTRY)
+        logger.debug('EXIT %s', self.EXIT)
 
     def __compute_expressions(self) -> None:
         '''
@@ -196,7 +199,7 @@ class AvailableExpressionAnalysis(object):
                 if len(expr.right_symbols) > 0:
                     self.set_expr(expr.right_str, expr.right_symbols)
 
-            print("EXPR-SEARCH", node_id)
+            logger.log(TRACE, 'EXPR-SEARCH %s', node_id)
 
             if node_id != self.ending_node:
                 for child_id in node.next_nodes:
@@ -246,7 +249,7 @@ class AvailableExpressionAnalysis(object):
                     for expression in self.get_exprs_with_symbol(symbol):
                         self.add_kill(node_id, expression)
 
-            print("GEN-KILL", node_id)
+            logger.log(TRACE, 'GEN-KILL %s', node_id)
 
             if node_id != self.ending_node:
                 for child_id in node.next_nodes:
@@ -270,7 +273,7 @@ class AvailableExpressionAnalysis(object):
         while len(worklist) != 0:
             node_id = worklist.pop()
 
-            print('WORKLIST PROCESS', node_id)
+            logger.log(TRACE, 'WORKLIST PROCESS %s', node_id)
 
             entries, exit_set = list(), set()
 
@@ -0,0 +1,225 @@
+'''
+The Monotone Dataflow Analysis Framework
+
+An analysis declares its direction, meet operator and GEN / KILL sets
+(or overrides the transfer function), and is solved by the shared worklist solver.
+Sets of facts are represented as bitsets over the universe of the analysis.
+'''
+import heapq
+from typing import Any, Dict, List, Set, Tuple
+from collections import defaultdict
+from control_flow_graph import ControlFlowGraph
+from control_flow_graph.node_processor import Node
+from control_flow_graph.helpers import get_successors, get_predecessors_map, get_reverse_post_order
+from static_analysis.dataflow_analysis.framework.objects import Direction, Meet, BitSetUniverse
+
+
+class DataflowAnalysis(object):
+    '''
+    Base class of the monotone dataflow analyses
+    '''
+
+    # the direction and meet operator of the analysis (to be set by the analyses)
+    direction = Direction.Forward
+    meet = Meet.Union
+
+    def __init__(self, cfg: ControlFlowGraph, starting_node: str, ending_node: str):
+        '''
+        Constructor
+        '''
+
+        self.cfg = cfg
+        self.starting_node = starting_node
+        self.ending_node = ending_node
+
+        # the universe of the dataflow facts
+        self.universe = BitSetUniverse()
+
+        # GEN and KILL bitsets of the nodes
+        self.GEN = dict()
+        self.KILL = dict()
+
+        # ENTRY and EXIT bitsets of the nodes (in program order, for either direction)
+        self.ENTRY = dict()
+        self.EXIT = dict()
+
+        # per-node convergence counters, i.e., the number of times
+        # the transfer function of the node was evaluated by the solver
+        self.node_visits = defaultdict(int)
+
+        # the nodes of the analysed sub-graph, in the iteration order of the solver
+        self.nodes = list()
+        self.successors = dict()
+        self.predecessors = dict()
+
+    def register_facts(self, node_id: str, node: Node) -> None:
+        '''
+        Register the dataflow facts produced by a node to the universe
+        '''
+
+        raise NotImplementedError
+
+    def get_gen_kill(self, node_id: str, node: Node) -> Tuple[Set[Any], Set[Any]]:
+        '''
+        Get the GEN and KILL sets of facts of a node
+        '''
+
+        raise NotImplementedError
+
+    def get_boundary_value(self) -> int:
+        '''
+        Get the bitset at the boundary (entry of the starting node for forward analyses,
+        exit of the ending node for backward analyses)
+        '''
+
+        return 0
+
+    def get_initial_value(self) -> int:
+        '''
+        Get the bitset every other point is initialized with (the top of the lattice)
+        '''
+
+        return self.universe.get_full_set() if self.meet == Meet.Intersection else 0
+
+    def transfer(self, node_id: str, bitset: int) -> int:
+        '''
+        The transfer function of a node, by default: GEN ∪ (IN - KILL)
+        '''
+
+        return (bitset & ~self.KILL[node_id]) | self.GEN[node_id]
+
+    def compute(self) -> None:
+        '''
+        Compute the dataflow analysis
+        '''
+
+        self.__compute_graph()
+        self.__compute_gen_kill()
+        self.__solve()
+
+    def get_entry(self, node_id: str) -> Set[Any]:
+        '''
+        Get the set of facts at the entry of a node
+        '''
+
+        return self.universe.to_set(self.ENTRY[node_id])
+
+    def get_exit(self, node_id: str) -> Set[Any]:
+        '''
+        Get the set of facts at the exit of a node
+        '''
+
+        return self.universe.to_set(self.EXIT[node_id])
+
+    def get_results(self) -> Dict[str, Dict[str, Set[Any]]]:
+        '''
+        Get the sets of facts at the entry and exit of every node
+        '''
+
+        return {node_id: {'entry': self.get_entry(node_id), 'exit': self.get_exit(node_id)}
+                for node_id in self.nodes}
+
+    def __compute_graph(self) -> None:
+        '''
+        Compute the analysed sub-graph and the iteration order of the solver
+        '''
+
+        metadata = self.cfg.cfg_metadata
+
+        # reverse post-order for the forward analyses,
+        # and post-order for the backward analyses
+        self.nodes = get_reverse_post_order(
+            metadata, self.starting_node, self.ending_node)
+        if self.direction == Direction.Backward:
+            self.nodes.reverse()
+
+        self.predecessors = get_predecessors_map(
+            metadata, self.starting_node, self.ending_node)
+        self.successors = {node_id: get_successors(metadata, node_id, self.ending_node)
+                           for node_id in self.nodes}
+
+    def __compute_gen_kill(self) -> None:
+        '''
+        Compute the GEN and KILL bitsets for all the nodes
+        '''
+
+        metadata = self.cfg.cfg_metadata
+
+        # the universe needs to be complete before the KILL sets can be computed
+        for node_id in self.nodes:
+            self.register_facts(node_id, metadata.get_node(node_id))
+
+        for node_id in self.nodes:
+            gen, kill = self.get_gen_kill(node_id, metadata.get_node(node_id))
+            self.GEN[node_id] = self.universe.to_bitset(gen)
+            self.KILL[node_id] = self.universe.to_bitset(kill)
+
+    def __solve(self) -> None:
+        '''
+        Solve the dataflow equations with a priority worklist,
+        ordered by the RPO (forward) or post-order (backward) position of the nodes
+        '''
+
+        forward = self.direction == Direction.Forward
+
+        # the inputs and outputs of the nodes with respect to the direction of the analysis
+        inputs, outputs = (self.ENTRY, self.EXIT) if forward else (
+            self.EXIT, self.ENTRY)
+        sources, targets = (self.predecessors, self.successors) if forward else (
+            self.successors, self.predecessors)
+        boundary_node = self.starting_node if forward else self.ending_node
+
+        # initialize every point with the top of the lattice
+        initial_value = self.get_initial_value()
+        for node_id in self.nodes:
+            inputs[node_id] = initial_value
+            outputs[node_id] = initial_value
+
+        # the position of a node in the iteration order is its priority
+        priority = {node_id: i for i, node_id in enumerate(self.nodes)}
+        worklist = list(range(len(self.nodes)))
+        in_worklist = set(self.nodes)
+
+        while len(worklist) != 0:
+            node_id = self.nodes[heapq.heappop(worklist)]
+            in_worklist.discard(node_id)
+
+            self.node_visits[node_id] += 1
+
+            #######################
+            # 1. compute the input set by applying the meet over the sources
+            bitset = self.__meet([outputs[source_id] for source_id in sources[node_id]],
+                                 initial_value)
+            if node_id == boundary_node:
+                bitset = self.__meet(
+                    [bitset, self.get_boundary_value()], initial_value) \
+                    if len(sources[node_id]) > 0 else self.get_boundary_value()
+            inputs[node_id] = bitset
+
+            #######################
+            # 2. compute the output set by applying the transfer function
+            bitset = self.transfer(node_id, bitset)
+
+            #######################
+            # 3. if the output set has changed, re-schedule the dependent nodes
+            if bitset != outputs[node_id]:
+                outputs[node_id] = bitset
+
+                for target_id in targets[node_id]:
+                    if target_id not in in_worklist:
+                        in_worklist.add(target_id)
+                        heapq.heappush(worklist, priority[target_id])
+
+    def __meet(self, bitsets: List[int], initial_value: int) -> int:
+        '''
+        Apply the meet operator over a list of bitsets
+        '''
+
+        if len(bitsets) == 0:
+            return initial_value
+
+        result = bitsets[0]
+        for bitset in bitsets[1:]:
+            result = result | bitset if self.meet == Meet.Union else result & bitset
+
+        return result
@@ -0,0 +1,49 @@
+'''
+The Builder Module for the Dataflow Framework
+
+Extracts the variables defined and used, and the expressions evaluated by a CFG node.
+'''
+
+from typing import Set, Dict
+from control_flow_graph.node_processor import Node
+import static_analysis.dataflow_analysis.framework.builder.nodes as nodes
+
+
+def get_definitions(node: Node) -> Set[str]:
+    '''
+    Function to obtain the variables defined (written) node-wise
+    '''
+
+    node_module = getattr(nodes, node.node_type, None)
+
+    if node_module is None:
+        return set()
+
+    return node_module.get_definitions(node)
+
+
+def get_uses(node: Node) -> Set[str]:
+    '''
+    Function to obtain the variables used (read) node-wise
+    '''
+
+    node_module = getattr(nodes, node.node_type, None)
+
+    if node_module is None:
+        return set()
+
+    return node_module.get_uses(node)
+
+
+def get_expressions(node: Node) -> Dict[str, Set[str]]:
+    '''
+    Function to obtain the expressions evaluated node-wise,
+    as a mapping of the rendered expression to the symbols it reads
+    '''
+
+    node_module = getattr(nodes, node.node_type, None)
+
+    if node_module is None:
+        return dict()
+
+    return node_module.get_expressions(node)
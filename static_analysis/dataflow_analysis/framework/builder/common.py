@@ -0,0 +1,68 @@
+from typing import Dict, Set
+from control_flow_graph.node_processor import Node
+
+
+def traverse_expression_object(node: Node, identifiers: set) -> str:
+    '''
+    Recursively traverse the expression node and generate the expression
+    '''
+
+    # base case: if node type is a Literal, return the value
+    if node.node_type == 'Literal':
+        return str(node.value)
+
+    # base case: if node type is a Identifier, return the name
+    if node.node_type == 'Identifier':
+        identifiers.add(node.name)
+        return node.name
+
+    # handle if node type is Assignment
+    if node.node_type == 'Assignment':
+        return f'{traverse_expression_object(node.leftHandSide, identifiers)} {node.operator} {traverse_expression_object(node.rightHandSide, identifiers)}'
+
+    # handle if node type is BinaryOperation
+    if node.node_type == 'BinaryOperation':
+        return f'{traverse_expression_object(node.leftExpression, identifiers)} {node.operator} {traverse_expression_object(node.rightExpression, identifiers)}'
+
+    # handle if node type is UnaryOperation
+    if node.node_type == 'UnaryOperation':
+        return f'{node.operator}{traverse_expression_object(node.subExpression, identifiers)}'
+
+    # handle if node type is FunctionCall (only the arguments are evaluated locally)
+    if node.node_type == 'FunctionCall':
+        arguments = ', '.join(traverse_expression_object(argument, identifiers)
+                              for argument in node.arguments)
+        return f'{traverse_expression_object(node.expression, identifiers)}({arguments})'
+
+    return ''
+
+
+def collect_expressions(node: Node, expressions: Dict[str, Set[str]]) -> None:
+    '''
+    Recursively collect the (non-trivial) binary expressions evaluated by an expression node,
+    as a mapping of the rendered expression to the symbols it reads
+    '''
+
+    if node is None:
+        return
+
+    if node.node_type == 'BinaryOperation':
+        symbols = set()
+        expr_str = traverse_expression_object(node, symbols)
+
+        # only expressions reading variables can be killed, hence are of interest
+        if len(symbols) > 0:
+            expressions[expr_str] = symbols
+
+        collect_expressions(node.leftExpression, expressions)
+        collect_expressions(node.rightExpression, expressions)
+
+    elif node.node_type == 'Assignment':
+        collect_expressions(node.rightHandSide, expressions)
+
+    elif node.node_type == 'UnaryOperation':
+        collect_expressions(node.subExpression, expressions)
+
+    elif node.node_type == 'FunctionCall':
+        for argument in node.arguments:
+            collect_expressions(argument, expressions)
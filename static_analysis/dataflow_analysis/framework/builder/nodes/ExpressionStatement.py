@@ -0,0 +1,63 @@
+'''
+ExpressionStatement Definition and Use Handlers
+'''
+from typing import Set, Dict
+from control_flow_graph.node_processor.nodes import ExpressionStatement
+from static_analysis.dataflow_analysis.framework.builder.common import traverse_expression_object, collect_expressions
+
+
+def get_definitions(node: ExpressionStatement) -> Set[str]:
+    '''
+    Obtain the variables written by the expression
+    '''
+
+    # obtain the expression property
+    expression = node.expression
+
+    # init symbol sets
+    left_symbols = set()
+
+    # handle assignment nodes
+    if expression.node_type == 'Assignment':
+        traverse_expression_object(expression.leftHandSide, left_symbols)
+
+    # handle UnaryOperation nodes (increment / decrement)
+    elif expression.node_type == 'UnaryOperation' and expression.operator in ('++', '--'):
+        traverse_expression_object(expression.subExpression, left_symbols)
+
+    return left_symbols
+
+
+def get_uses(node: ExpressionStatement) -> Set[str]:
+    '''
+    Obtain the variables read by the expression
+    '''
+
+    # obtain the expression property
+    expression = node.expression
+
+    # init symbol sets
+    right_symbols = set()
+
+    if expression.node_type == 'Assignment':
+        traverse_expression_object(expression.rightHandSide, right_symbols)
+
+        # compound assignments (e.g. +=) also read the left hand side
+        if expression.operator != '=':
+            traverse_expression_object(
+                expression.leftHandSide, right_symbols)
+    else:
+        traverse_expression_object(expression, right_symbols)
+
+    return right_symbols
+
+
+def get_expressions(node: ExpressionStatement) -> Dict[str, Set[str]]:
+    '''
+    Obtain the expressions evaluated by the expression statement
+    '''
+
+    expressions = dict()
+    collect_expressions(node.expression, expressions)
+
+    return expressions
@@ -0,0 +1,39 @@
+'''
+VariableDeclarationStatement Definition and Use Handlers
+'''
+from typing import Set, Dict
+from control_flow_graph.node_processor.nodes import VariableDeclarationStatement
+from static_analysis.dataflow_analysis.framework.builder.common import traverse_expression_object, collect_expressions
+
+
+def get_definitions(node: VariableDeclarationStatement) -> Set[str]:
+    '''
+    Obtain the variables declared by the statement
+    '''
+
+    return set(declaration.name for declaration in node.declarations)
+
+
+def get_uses(node: VariableDeclarationStatement) -> Set[str]:
+    '''
+    Obtain the variables read by the initial value of the declaration
+    '''
+
+    right_symbols = set()
+
+    # EDGE CASE: if the variable is not declared with any values
+    if node.initialValue is not None:
+        traverse_expression_object(node.initialValue, right_symbols)
+
+    return right_symbols
+
+
+def get_expressions(node: VariableDeclarationStatement) -> Dict[str, Set[str]]:
+    '''
+    Obtain the expressions evaluated by the initial value of the declaration
+    '''
+
+    expressions = dict()
+    collect_expressions(node.initialValue, expressions)
+
+    return expressions
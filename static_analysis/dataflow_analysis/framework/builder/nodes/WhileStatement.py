@@ -0,0 +1,36 @@
+'''
+WhileStatement Definition and Use Handlers
+'''
+from typing import Set, Dict
+from control_flow_graph.node_processor.nodes import WhileStatement
+from static_analysis.dataflow_analysis.framework.builder.common import traverse_expression_object, collect_expressions
+
+
+def get_definitions(node: WhileStatement) -> Set[str]:
+    '''
+    Obtain the variables written by the condition (none, as of now)
+    '''
+
+    return set()
+
+
+def get_uses(node: WhileStatement) -> Set[str]:
+    '''
+    Obtain the variables read by the condition
+    '''
+
+    right_symbols = set()
+    traverse_expression_object(node.condition, right_symbols)
+
+    return right_symbols
+
+
+def get_expressions(node: WhileStatement) -> Dict[str, Set[str]]:
+    '''
+    Obtain the expressions evaluated by the condition
+    '''
+
+    expressions = dict()
+    collect_expressions(node.condition, expressions)
+
+    return expressions
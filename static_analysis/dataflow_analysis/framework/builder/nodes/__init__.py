@@ -0,0 +1,9 @@
+'''
+Node wise Definition and Use Handlers
+'''
+from static_analysis.dataflow_analysis.framework.builder.nodes import ExpressionStatement
+from static_analysis.dataflow_analysis.framework.builder.nodes import VariableDeclarationStatement
+from static_analysis.dataflow_analysis.framework.builder.nodes import WhileStatement
+from static_analysis.dataflow_analysis.framework.builder.nodes import DoWhileStatement
+from static_analysis.dataflow_analysis.framework.builder.nodes import ForStatement
+from static_analysis.dataflow_analysis.framework.builder.nodes import IfStatement
@@ -0,0 +1,90 @@
+'''
+Auxiliary Objects Module for the Dataflow Framework
+'''
+from typing import Any, Iterable, Set
+from enum import Enum
+
+
+class Direction(Enum):
+    '''
+    Direction of the flow of information in a dataflow analysis
+    '''
+
+    Forward = 'Forward'
+    Backward = 'Backward'
+
+
+class Meet(Enum):
+    '''
+    Meet operator applied at the confluence points of the CFG
+    '''
+
+    # may analyses (reaching definitions, live variables)
+    Union = 'Union'
+
+    # must analyses (available expressions, very busy expressions)
+    Intersection = 'Intersection'
+
+
+class BitSetUniverse(object):
+    '''
+    Class representing the universe of dataflow facts of an analysis.
+    Every fact is assigned a bit position, so that a set of facts
+    is represented by a single (arbitrary precision) integer.
+    '''
+
+    def __init__(self):
+        self.fact_table = dict()
+        self.facts = list()
+
+    def register_fact(self, fact: Any) -> int:
+        '''
+        Register a fact and return its bit position
+        '''
+
+        if fact not in self.fact_table:
+            self.fact_table[fact] = len(self.facts)
+            self.facts.append(fact)
+
+        return self.fact_table[fact]
+
+    def get_id(self, fact: Any) -> int:
+        '''
+        Get the bit position of a fact
+        '''
+
+        return self.fact_table[fact] if fact in self.fact_table else -1
+
+    def get_full_set(self) -> int:
+        '''
+        Get the bitset containing all the registered facts (the top of a must analysis)
+        '''
+
+        return (1 << len(self.facts)) - 1
+
+    def to_bitset(self, facts: Iterable[Any]) -> int:
+        '''
+        Convert a set of facts to the corresponding bitset
+        '''
+
+        bitset = 0
+        for fact in facts:
+            if fact not in self.fact_table:
+                raise Exception(f'Fact {fact} not registered!')
+            bitset |= 1 << self.fact_table[fact]
+
+        return bitset
+
+    def to_set(self, bitset: int) -> Set[Any]:
+        '''
+        Convert a bitset back to the set of facts it contains
+        '''
+
+        facts = set()
+        while bitset:
+            # isolate the lowest set bit and obtain its position
+            low_bit = bitset & -bitset
+            facts.add(self.facts[low_bit.bit_length() - 1])
+            bitset ^= low_bit
+
+        return facts
@@ -0,0 +1,66 @@
+'''
+The Live Variables DataFlow Analysis
+'''
+from typing import Any, Set, Tuple, Iterable
+from control_flow_graph import ControlFlowGraph
+from control_flow_graph.node_processor import Node
+from static_analysis.dataflow_analysis.framework import DataflowAnalysis
+from static_analysis.dataflow_analysis.framework.objects import Direction, Meet
+import static_analysis.dataflow_analysis.framework.builder as builder
+
+
+class LiveVariablesAnalysis(DataflowAnalysis):
+    '''
+    Class defining the live variables data flow analysis.
+    A variable is live at a point, if it may be read before being written along some path.
+    '''
+
+    direction = Direction.Backward
+    meet = Meet.Union
+
+    def __init__(self, cfg: ControlFlowGraph, starting_node: str, ending_node: str, live_at_exit: Iterable[str] = None):
+        '''
+        Constructor
+        '''
+        super(LiveVariablesAnalysis, self).__init__(
+            cfg, starting_node, ending_node)
+
+        # the variables observed (hence live) after the ending node
+        self.live_at_exit = set(live_at_exit) if live_at_exit is not None else set()
+
+    def register_facts(self, node_id: str, node: Node) -> None:
+        '''
+        Register the variables defined or used by a node
+        '''
+
+        for variable in builder.get_definitions(node) | builder.get_uses(node):
+            self.universe.register_fact(variable)
+
+        # the observed variables are registered along with the ending node
+        if node_id == self.ending_node:
+            for variable in self.live_at_exit:
+                self.universe.register_fact(variable)
+
+    def get_boundary_value(self) -> int:
+        '''
+        The variables observed after the ending node are live at its exit
+        '''
+
+        return self.universe.to_bitset(self.live_at_exit)
+
+    def get_gen_kill(self, node_id: str, node: Node) -> Tuple[Set[Any], Set[Any]]:
+        '''
+        A node generates the variables it reads and kills the variables it writes
+        '''
+
+        return builder.get_uses(node), builder.get_definitions(node)
+
+    def is_live(self, node_id: str, variable: str, is_entry=True) -> bool:
+        '''
+        Check if a variable is live at the entry (or exit) of a node
+        '''
+
+        variables = self.get_entry(
+            node_id) if is_entry else self.get_exit(node_id)
+
+        return variable in variables
@@ -0,0 +1,60 @@
+'''
+The Reaching Definitions DataFlow Analysis
+'''
+from typing import Any, Set, Tuple
+from collections import defaultdict
+from control_flow_graph import ControlFlowGraph
+from control_flow_graph.node_processor import Node
+from static_analysis.dataflow_analysis.framework import DataflowAnalysis
+from static_analysis.dataflow_analysis.framework.objects import Direction, Meet
+import static_analysis.dataflow_analysis.framework.builder as builder
+
+
+class ReachingDefinitionsAnalysis(DataflowAnalysis):
+    '''
+    Class defining the reaching definitions data flow analysis.
+    A definition is the fact (node_id, variable).
+    '''
+
+    direction = Direction.Forward
+    meet = Meet.Union
+
+    def __init__(self, cfg: ControlFlowGraph, starting_node: str, ending_node: str):
+        '''
+        Constructor
+        '''
+        super(ReachingDefinitionsAnalysis, self).__init__(
+            cfg, starting_node, ending_node)
+
+        # mapping of variable to the definitions of the variable
+        self.variable_definitions = defaultdict(set)
+
+    def register_facts(self, node_id: str, node: Node) -> None:
+        '''
+        Register the definitions made by a node
+        '''
+
+        for variable in builder.get_definitions(node):
+            definition = (node_id, variable)
+            self.universe.register_fact(definition)
+            self.variable_definitions[variable].add(definition)
+
+    def get_gen_kill(self, node_id: str, node: Node) -> Tuple[Set[Any], Set[Any]]:
+        '''
+        A node generates its own definitions and kills all the other definitions of the same variables
+        '''
+
+        gen, kill = set(), set()
+        for variable in builder.get_definitions(node):
+            gen.add((node_id, variable))
+            kill.update(self.variable_definitions[variable])
+
+        return gen, kill - gen
+
+    def get_reaching_definitions(self, node_id: str, variable: str) -> Set[str]:
+        '''
+        Get the nodes whose definition of the variable reaches the entry of the given node
+        '''
+
+        return set(def_node for def_node, def_variable in self.get_entry(node_id)
+                   if def_variable == variable)
@@ -0,0 +1,55 @@
+'''
+The Very Busy Expressions DataFlow Analysis
+'''
+from typing import Any, Set, Tuple
+from collections import defaultdict
+from control_flow_graph import ControlFlowGraph
+from control_flow_graph.node_processor import Node
+from static_analysis.dataflow_analysis.framework import DataflowAnalysis
+from static_analysis.dataflow_analysis.framework.objects import Direction, Meet
+import static_analysis.dataflow_analysis.framework.builder as builder
+
+
+class VeryBusyExpressionAnalysis(DataflowAnalysis):
+    '''
+    Class defining the very busy expressions data flow analysis.
+    An expression is very busy at a point, if it is evaluated along every path
+    from the point before any of its operands is redefined.
+    '''
+
+    direction = Direction.Backward
+    meet = Meet.Intersection
+
+    def __init__(self, cfg: ControlFlowGraph, starting_node: str, ending_node: str):
+        '''
+        Constructor
+        '''
+        super(VeryBusyExpressionAnalysis, self).__init__(
+            cfg, starting_node, ending_node)
+
+        # mapping of symbol to the expressions reading the symbol
+        self.symbol_expressions = defaultdict(set)
+
+    def register_facts(self, node_id: str, node: Node) -> None:
+        '''
+        Register the expressions evaluated by a node
+        '''
+
+        for expr_str, symbols in builder.get_expressions(node).items():
+            self.universe.register_fact(expr_str)
+            for symbol in symbols:
+                self.symbol_expressions[symbol].add(expr_str)
+
+    def get_gen_kill(self, node_id: str, node: Node) -> Tuple[Set[Any], Set[Any]]:
+        '''
+        A node generates the expressions it evaluates and
+        kills the expressions reading any of the variables it writes
+        '''
+
+        gen = set(builder.get_expressions(node).keys())
+
+        kill = set()
+        for variable in builder.get_definitions(node):
+            kill.update(self.symbol_expressions[variable])
+
+        return gen, kill
@@ -0,0 +1,175 @@
+'''
+The Degradation Ladder
+
+Runs an analysis of a function under a budget, and when the budget is exceeded,
+falls back to the next (cheaper, less precise) level of the ladder of the analysis.
+The ladder of the concrete collecting semantics:
+
+    concrete          - the concrete collecting semantics (exact, but unbounded)
+    interval          - the sparse interval analysis (widening after a delay, then narrowing)
+    interval-widening - the sparse interval analysis widening right away, without narrowing
+
+and the ladder of the abstract (APRON) collecting semantics:
+
+    abstract          - the abstract collecting semantics (widening after a delay, then narrowing)
+    abstract-widening - the abstract collecting semantics widening right away, without narrowing
+
+The result of any level but the first is flagged as degraded. Every level gets a fresh budget
+(with the same limits), so the worst case of a function is bounded by the number of levels
+times the budget. The concrete ladder falls back on the sparse interval analysis, which
+is far cheaper than the APRON collecting semantics on the same intervals.
+
+The options of the collecting semantics (e.g., the memory profiler, the loop acceleration)
+are given to the levels running them.
+'''
+from typing import Any, Callable, Dict, List, Tuple
+from control_flow_graph import ControlFlowGraph
+from static_analysis.budget import AnalysisBudget, BudgetExceeded
+from static_analysis.collecting_semantics import CollectingSemanticsAnalysis
+from static_analysis.sparse_interval import SparseIntervalAnalysis
+from instrumentation import get_logger
+from instrumentation.metrics import metrics
+
+logger = get_logger('semantics')
+
+
+def create_concrete(cfg: ControlFlowGraph, starting_node: str, ending_node: str,
+                    budget: AnalysisBudget, options: Dict[str, Any]) -> CollectingSemanticsAnalysis:
+    return CollectingSemanticsAnalysis(cfg, starting_node, ending_node, budget=budget, **options)
+
+
+def create_interval(cfg: ControlFlowGraph, starting_node: str, ending_node: str,
+                    budget: AnalysisBudget, options: Dict[str, Any]) -> SparseIntervalAnalysis:
+    return SparseIntervalAnalysis(cfg, starting_node, ending_node, budget=budget)
+
+
+def create_aggressive_interval(cfg: ControlFlowGraph, starting_node: str, ending_node: str,
+                               budget: AnalysisBudget, options: Dict[str, Any]) -> SparseIntervalAnalysis:
+    return SparseIntervalAnalysis(cfg, starting_node, ending_node,
+                                  widening_delay=0, narrowing_rounds=0, budget=budget)
+
+
+def create_abstract(cfg: ControlFlowGraph, starting_node: str, ending_node: str,
+                    budget: AnalysisBudget, options: Dict[str, Any]) -> Any:
+    # imported lazily, as it needs jpype
+    from static_analysis.abstract_collecting_semantics import AbstractCollectingSemanticsAnalysis
+
+    return AbstractCollectingSemanticsAnalysis(cfg, starting_node, ending_node, None, budget=budget, **options)
+
+
+def create_aggressive_abstract(cfg: ControlFlowGraph, starting_node: str, ending_node: str,
+                               budget: AnalysisBudget, options: Dict[str, Any]) -> Any:
+    from static_analysis.abstract_collecting_semantics import AbstractCollectingSemanticsAnalysis
+
+    return AbstractCollectingSemanticsAnalysis(cfg, starting_node, ending_node, None, widening_delay=0,
+                                               narrowing_rounds=0, budget=budget, **options)
+
+
+# the levels of the ladders, from the most precise one: (name, analysis factory)
+LEVELS = [
+    ('concrete', create_concrete),
+    ('interval', create_interval),
+    ('interval-widening', create_aggressive_interval)
+]
+
+ABSTRACT_LEVELS = [
+    ('abstract', create_abstract),
+    ('abstract-widening', create_aggressive_abstract)
+]
+
+
+class BudgetedAnalysis(object):
+    '''
+    Class running an analysis under a budget, degrading along the ladder when it is exceeded
+    '''
+
+    def __init__(self, cfg: ControlFlowGraph, starting_node: str, ending_node: str, budget: AnalysisBudget,
+                 constants: Dict[str, Any] = None,
+                 levels: List[Tuple[str, Callable[[ControlFlowGraph, str, str, AnalysisBudget, Dict[str, Any]], Any]]] = None,
+                 options: Dict[str, Any] = None):
+        '''
+        Constructor
+        '''
+
+        self.cfg = cfg
+        self.starting_node = starting_node
+        self.ending_node = ending_node
+        self.budget = budget
+
+        # the values of the constants, registered on the analysis of every level
+        self.constants = constants or dict()
+
+        self.levels = levels if levels is not None else LEVELS
+
+        # the keyword arguments of the collecting semantics, given to the levels running them
+        self.options = options or dict()
+
+        # the analysis (and the name of its level) which completed within the budget
+        self.analysis = None
+        self.level = None
+
+        # the levels which exceeded the budget, with the exceeded resource
+        self.attempts = list()
+
+    def compute(self) -> Any:
+        '''
+        Run the levels of the ladder till one completes within its budget, and return its analysis
+        (raising the BudgetExceeded of the last level, if even that one exceeds its budget)
+        '''
+
+        for i, (level, create_analysis) in enumerate(self.levels):
+            analysis = create_analysis(self.cfg, self.starting_node,
+                                       self.ending_node, self.budget.copy(), self.options)
+
+            for name, value in self.constants.items():
+                analysis.constant_registry.register_variable(name, value)
+
+            try:
+                analysis.compute()
+            except BudgetExceeded as e:
+                self.attempts.append({
+                    'level': level,
+                    'resource': e.resource,
+                    'used': e.used,
+                    'limit': e.limit
+                })
+                metrics.increment('degradation.exceeded',
+                                  level=level, resource=e.resource)
+                logger.info('Budget of %s exceeded at level %s (%s), degrading',
+                            self.starting_node, level, e)
+
+                if i == len(self.levels) - 1:
+                    raise
+                continue
+
+            self.analysis = analysis
+            self.level = level
+
+            return analysis
+
+    def is_degraded(self) -> bool:
+        '''
+        Check if the result comes from a degraded (not the first) level of the ladder
+        '''
+
+        return self.level is not None and self.level != self.levels[0][0]
+
+    def export_results(self) -> Dict[str, Any]:
+        '''
+        Export the results of the completed level, flagged as degraded or not
+        '''
+
+        if self.analysis is None:
+            raise Exception('The analysis is not computed!')
+
+        if hasattr(self.analysis, 'point_state'):
+            results = self.analysis.point_state.export_results()
+        else:
+            results = self.analysis.get_results()
+
+        return {
+            'level': self.level,
+            'degraded': self.is_degraded(),
+            'attempts': self.attempts,
+            'results': results
+        }
@@ -0,0 +1,261 @@
+'''
+The Loop Acceleration Module
+
+Recognizes the loops of the CFG whose body only applies affine updates to the variables
+(x = x + c, x = x - c, with c an integer literal), and whose guard compares a counter
+(an updated variable) with a loop invariant bound (an expression of the variables not assigned
+in the loop, the literals and the constants), the counter moving toward the bound:
+
+    while (i < n) { i = i + 1; s = s + 2; }
+    for (k = 0; k <= 10; k = k + 2) { ... }
+    do { x = x - 3; } while (x > y);
+
+The trip count of such a loop is computed in closed form from the values of the counter and
+the bound, hence the collecting semantics replace the (iterated) entry state of its head with
+a summary of all its trips (see the builder.acceleration modules of the engines), and the loop
+stabilizes in two rounds, whatever the number of trips.
+
+Only straight-line loops (a WTO component without nested components, branches or other exits)
+are recognized; the rest are iterated as usual.
+'''
+from typing import Dict, List, Tuple, Union
+from control_flow_graph import ControlFlowGraph
+from control_flow_graph.node_processor import Node
+from control_flow_graph.analysis.objects import WTOComponent
+from static_analysis.loop_acceleration.objects import AffineLoop, SWAPPED_OPERATORS
+
+# the nodes of the loops without semantics (the heads and the continue points of the loops)
+STRUCTURAL_NODES = ('WhileLoopContinue', 'ForLoopContinue', 'DoWhileLoopEntry', 'DoWhileLoopContinue')
+
+# the nodes evaluating the guard of the loops
+GUARD_NODES = ('WhileStatement', 'ForStatement', 'DoWhileStatement')
+
+
+class LoopAccelerator(object):
+    '''
+    Class recognizing the affine loops of a CFG, between a starting and an ending node
+    '''
+
+    def __init__(self, cfg: ControlFlowGraph, starting_node: str, ending_node: str):
+        '''
+        Constructor
+        '''
+
+        self.cfg = cfg
+        self.starting_node = starting_node
+        self.ending_node = ending_node
+
+        # mapping of the heads of the recognized loops to the loops
+        self.loops: Dict[str, AffineLoop] = dict()
+
+    def compute(self) -> Dict[str, AffineLoop]:
+        '''
+        Recognize the affine loops among the components of the WTO of the CFG,
+        and get them by their head
+        '''
+
+        analysis = self.cfg.get_analysis(self.starting_node, self.ending_node)
+
+        self.loops = dict()
+        self.__visit_elements(analysis.get_wto())
+
+        return self.loops
+
+    def __visit_elements(self, elements: List[Union[str, WTOComponent]]) -> None:
+        '''
+        Visit the (nested) components of the WTO
+        '''
+
+        for element in elements:
+            if isinstance(element, WTOComponent):
+                loop = self.recognize(element)
+                if loop is not None:
+                    self.loops[element.head] = loop
+
+                self.__visit_elements(element.elements)
+
+    def recognize(self, component: WTOComponent) -> Union[AffineLoop, None]:
+        '''
+        Recognize the component (loop) of the WTO as an affine loop, or None if not one
+        '''
+
+        if any(isinstance(element, WTOComponent) for element in component.elements):
+            return None
+
+        nodes = component.get_nodes()
+        head = self.cfg.cfg_metadata.get_node(component.head)
+
+        # the chain of the nodes of the loop, from the head
+        chain = self.__get_chain(head, nodes)
+        if chain is None or len(chain) != len(nodes):
+            return None
+
+        # the total increment of the variables over a trip, and their increment before the guard
+        steps = dict()
+        offsets = dict()
+        guard = None
+
+        for node in chain:
+            if node.node_type in GUARD_NODES:
+                if guard is not None:
+                    return None
+                guard = node
+            elif node.node_type == 'ExpressionStatement':
+                update = get_affine_update(node)
+                if update is None:
+                    return None
+
+                variable, step = update
+                steps[variable] = steps.get(variable, 0) + step
+                if guard is None:
+                    offsets[variable] = offsets.get(variable, 0) + step
+            elif node.node_type not in STRUCTURAL_NODES:
+                return None
+
+        if guard is None:
+            return None
+
+        comparison = get_comparison(guard.condition, steps)
+        if comparison is None:
+            return None
+
+        counter, operator, bound = comparison
+
+        # the counter moves toward the bound (otherwise the loop does not terminate once entered)
+        if (steps[counter] > 0) != (operator in ('<', '<=')):
+            return None
+
+        entering_nodes = [node_id for node_id in head.prev_nodes.keys() if node_id not in nodes]
+
+        return AffineLoop(head.cfg_id, guard.cfg_id, entering_nodes, counter, operator, bound,
+                          {variable: step for variable, step in steps.items() if step != 0},
+                          offsets.get(counter, 0))
+
+    def __get_chain(self, head: Node, nodes: set) -> Union[List[Node], None]:
+        '''
+        Get the nodes of the loop as a chain from the head (None if the loop branches
+        elsewhere than at its guard, or its guard does not stay in the loop on its true branch)
+        '''
+
+        chain = [head]
+        node = head
+
+        while True:
+            next_nodes = list(node.next_nodes)
+
+            if node.node_type in GUARD_NODES:
+                # (the true branch of a do-while re-enters the loop, instead of entering its body)
+                next_node_id = node.loop_entry_node if node.node_type == 'DoWhileStatement' else node.body_next
+                if node.join_node in nodes or len(next_nodes) != 2:
+                    return None
+            elif len(next_nodes) == 1:
+                next_node_id = next_nodes[0]
+            else:
+                return None
+
+            if next_node_id not in nodes:
+                return None
+
+            if next_node_id == head.cfg_id:
+                return chain
+
+            node = self.cfg.cfg_metadata.get_node(next_node_id)
+            if len(node.prev_nodes) != 1 or node in chain:
+                return None
+
+            chain.append(node)
+
+
+def get_affine_update(node: Node) -> Union[Tuple[str, int], None]:
+    '''
+    Get the (variable, increment) of an affine update 'x = x + c', 'x = c + x' or 'x = x - c'
+    of an expression statement, or None if not one
+    '''
+
+    expression = node.expression
+
+    if expression.node_type != 'Assignment' or expression.operator != '=' \
+            or expression.leftHandSide.node_type != 'Identifier':
+        return None
+
+    variable = expression.leftHandSide.name
+    right = expression.rightHandSide
+
+    if right.node_type != 'BinaryOperation' or right.operator not in ('+', '-'):
+        return None
+
+    left_side, right_side = right.leftExpression, right.rightExpression
+
+    if is_identifier(left_side, variable):
+        step = get_integer(right_side)
+        if step is None:
+            return None
+        return variable, step if right.operator == '+' else -step
+
+    if right.operator == '+' and is_identifier(right_side, variable):
+        step = get_integer(left_side)
+        if step is None:
+            return None
+        return variable, step
+
+    return None
+
+
+def get_comparison(condition: Node, steps: Dict[str, int]) -> Union[Tuple[str, str, Node], None]:
+    '''
+    Get the guard of a loop as (counter, operator, bound), the counter (a variable updated
+    by the loop) on the left, or None if the guard is not such a comparison with a loop invariant bound
+    '''
+
+    if condition.node_type != 'BinaryOperation' or condition.operator not in SWAPPED_OPERATORS:
+        return None
+
+    left, right = condition.leftExpression, condition.rightExpression
+
+    if left.node_type == 'Identifier' and steps.get(left.name, 0) != 0 and is_invariant(right, steps):
+        return left.name, condition.operator, right
+
+    if right.node_type == 'Identifier' and steps.get(right.name, 0) != 0 and is_invariant(left, steps):
+        return right.name, SWAPPED_OPERATORS[condition.operator], left
+
+    return None
+
+
+def is_invariant(expression: Node, steps: Dict[str, int]) -> bool:
+    '''
+    Check if an (arithmetic) expression is invariant in the loop,
+    i.e., only made of literals and of the variables (and constants) not assigned in the loop
+    '''
+
+    if expression.node_type == 'Literal':
+        return get_integer(expression) is not None
+
+    if expression.node_type == 'Identifier':
+        return expression.name not in steps
+
+    if expression.node_type == 'BinaryOperation' and expression.operator in ('+', '-', '*'):
+        return is_invariant(expression.leftExpression, steps) and is_invariant(expression.rightExpression, steps)
+
+    return False
+
+
+def is_identifier(expression: Node, name: str) -> bool:
+    '''
+    Check if an expression is the identifier of the given name
+    '''
+
+    return expression.node_type == 'Identifier' and expression.name == name
+
+
+def get_integer(expression: Node) -> Union[int, None]:
+    '''
+    Get the value of an integer literal, or None if not one
+    '''
+
+    if expression.node_type != 'Literal':
+        return None
+
+    try:
+        return int(expression.value)
+    except (TypeError, ValueError):
+        return None
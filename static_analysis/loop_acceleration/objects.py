@@ -0,0 +1,81 @@
+'''
+Auxiliary Objects Module for the Loop Acceleration
+'''
+from typing import Any, Dict, List, Tuple, Union
+from control_flow_graph.node_processor import Node
+
+# the comparison with the sides swapped (e.g., 'm > a' is 'a < m')
+SWAPPED_OPERATORS = {'<': '>', '<=': '>=', '>': '<', '>=': '<='}
+
+
+class AffineLoop(object):
+    '''
+    Class representing a loop whose body only applies affine updates (x = x + c, x = x - c)
+    and whose guard compares a counter (an updated variable) with a loop invariant bound,
+    in the form 'counter operator bound', the counter moving toward the bound
+    '''
+
+    def __init__(self, head: str, guard: str, entering_nodes: List[str], counter: str, operator: str,
+                 bound: Node, steps: Dict[str, int], offset: int):
+        '''
+        Constructor
+        '''
+
+        # the head of the loop (of its WTO component), and the node evaluating the guard
+        self.head = head
+        self.guard = guard
+
+        # the predecessors of the head outside the loop (the states entering the loop)
+        self.entering_nodes = entering_nodes
+
+        # the guard 'counter operator bound', the bound being an expression of the loop invariant
+        # variables and constants
+        self.counter = counter
+        self.operator = operator
+        self.bound = bound
+
+        # mapping of the updated variables to their increment over a trip of the loop,
+        # and the increment of the counter between the head and the guard (e.g., the body of a do-while)
+        self.steps = steps
+        self.offset = offset
+
+    def get_trips(self, value: Any, bound: Any) -> int:
+        '''
+        Get the number of trips of the loop from a state of the head with the given values
+        of the counter and the bound (the number of consecutive guards holding)
+        '''
+
+        step = self.steps[self.counter]
+        value = value + self.offset
+
+        # a decreasing counter is mirrored, so that the counter increases toward the bound
+        if step < 0:
+            value, bound, step = -value, -bound, -step
+
+        # the trips while 'value + trips * step < bound' (or '<=') holds
+        if self.operator in ('<', '>'):
+            trips = -((value - bound) // step)
+        else:
+            trips = (bound - value) // step + 1
+
+        return max(0, int(trips))
+
+    def get_max_trips(self, values: Tuple[Any, Any], bounds: Tuple[Any, Any]) -> Union[int, None]:
+        '''
+        Get the largest number of trips of the loop from the states of the head with the counter
+        and the bound in the given (inf, sup) ranges, or None if unbounded
+        '''
+
+        # the furthest counter from the furthest bound
+        if self.steps[self.counter] > 0:
+            value, bound = values[0], bounds[1]
+        else:
+            value, bound = values[1], bounds[0]
+
+        if value in (float('inf'), float('-inf')) or bound in (float('inf'), float('-inf')):
+            return None
+
+        return self.get_trips(value, bound)
+
+    def __repr__(self) -> str:
+        return f'AffineLoop({self.head}, {self.counter} {self.operator} bound, steps={self.steps})'
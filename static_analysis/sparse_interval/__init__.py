@@ -0,0 +1,299 @@
+'''
+The Sparse Interval Analysis
+
+Computes the interval of every SSA value by propagating along the def-use chains
+of the SSA form, instead of the dense per-node states of the collecting semantics.
+The branch conditions refine the values through the pi functions of the e-SSA form.
+'''
+from typing import Dict
+from collections import defaultdict, deque
+from control_flow_graph import ControlFlowGraph
+from control_flow_graph.node_processor import Node
+from static_analysis.collecting_semantics.objects import VariableRegistry
+from static_analysis.ssa import SSAForm
+from static_analysis.sparse_interval.objects import Interval, INF
+
+
+class SparseIntervalAnalysis(object):
+    '''
+    Class defining the sparse interval analysis over the SSA form
+    '''
+
+    # the negation and the mirror (operands swapped) of the comparison operators
+    NEGATED_OPERATORS = {'<': '>=', '<=': '>', '>': '<=',
+                         '>=': '<', '==': '!=', '!=': '=='}
+    MIRRORED_OPERATORS = {'<': '>', '<=': '>=', '>': '<',
+                          '>=': '<=', '==': '==', '!=': '!='}
+
+    def __init__(self, cfg: ControlFlowGraph, starting_node: str, ending_node: str,
+                 widening_delay=3, narrowing_rounds=2, budget=None):
+        '''
+        Constructor
+        '''
+
+        self.cfg = cfg
+        self.starting_node = starting_node
+        self.ending_node = ending_node
+
+        # the values of the constants, either an int / str, a (lower, upper) tuple or 'top'
+        self.constant_registry = VariableRegistry()
+
+        # the number of updates of a phi value before widening is applied,
+        # and the number of descending (narrowing) rounds after the fixed point
+        self.widening_delay = widening_delay
+        self.narrowing_rounds = narrowing_rounds
+
+        # the (optional) budget of the analysis, checked on every evaluation of a value
+        # (the iterations being the updates of the phi value, see static_analysis.budget)
+        self.budget = budget
+
+        # the SSA form of the graph
+        self.ssa = SSAForm(cfg, starting_node, ending_node)
+
+        # mapping of the SSA value name to its interval
+        self.intervals = dict()
+
+        # mapping of the SSA value name to the values computed from it
+        self.dependents = defaultdict(set)
+
+        # per-value convergence counters
+        self.value_updates = defaultdict(int)
+
+    def compute(self) -> None:
+        '''
+        Compute the sparse interval analysis
+        '''
+
+        if self.budget is not None:
+            self.budget.start()
+
+        self.ssa.build()
+
+        # compute the dependents of the values, i.e., the reverse of the dependencies
+        for name in self.ssa.values:
+            self.intervals[name] = Interval.bottom()
+            for dependency in self.ssa.get_dependencies(name):
+                self.dependents[dependency].add(name)
+
+        self.__solve()
+        self.__narrow()
+
+    def get_value_interval(self, name: str) -> Interval:
+        '''
+        Get the interval of an SSA value
+        '''
+
+        return self.intervals[name]
+
+    def get_interval(self, node_id: str, variable: str) -> Interval:
+        '''
+        Get the interval of a variable at the entry of a node
+        '''
+
+        name = self.ssa.get_reaching_value(node_id, variable)
+        if name is None:
+            raise Exception(
+                f'Variable {variable} not found in the SSA form!')
+
+        return self.intervals[name]
+
+    def get_results(self) -> Dict[str, Dict[str, Interval]]:
+        '''
+        Get the intervals of all the variables at the entry of every node
+        '''
+
+        variables = set(value.variable for value in self.ssa.values.values())
+
+        return {node_id: {variable: self.get_interval(node_id, variable) for variable in variables}
+                for node_id in self.ssa.nodes}
+
+    def __solve(self) -> None:
+        '''
+        Propagate the intervals along the def-use chains till the fixed point,
+        widening the phi values (every cycle of the SSA graph passes through a phi)
+        '''
+
+        worklist = deque(self.ssa.values.keys())
+        in_worklist = set(worklist)
+
+        while len(worklist) != 0:
+            name = worklist.popleft()
+            in_worklist.discard(name)
+
+            interval = self.__evaluate(name)
+            old_interval = self.intervals[name]
+
+            if self.ssa.get_value(name).kind == 'phi':
+                self.value_updates[name] += 1
+                if self.value_updates[name] > self.widening_delay:
+                    interval = old_interval.widen(interval)
+
+            if self.budget is not None:
+                self.budget.check(self.value_updates.get(name, 0))
+
+            # if the interval has changed, re-schedule the dependent values
+            if interval != old_interval:
+                self.intervals[name] = interval
+
+                for dependent in self.dependents[name]:
+                    if dependent not in in_worklist:
+                        in_worklist.add(dependent)
+                        worklist.append(dependent)
+
+    def __narrow(self) -> None:
+        '''
+        Refine the widened intervals with a few descending rounds
+        '''
+
+        for _ in range(self.narrowing_rounds):
+            for name in self.ssa.values:
+                self.intervals[name] = self.__evaluate(name)
+
+    def __evaluate(self, name: str) -> Interval:
+        '''
+        Evaluate the definition of an SSA value with the current intervals
+        '''
+
+        value = self.ssa.get_value(name)
+
+        if value.kind == 'entry':
+            return self.__get_entry_interval(value.variable)
+
+        if value.kind == 'phi':
+            phi = self.ssa.phis[value.def_node][value.variable]
+
+            interval = Interval.bottom()
+            for argument in phi.arguments.values():
+                interval = interval.join(self.intervals[argument])
+            return interval
+
+        if value.kind == 'pi':
+            pi = self.ssa.pis[value.def_node][value.variable]
+            return self.intervals[pi.source].meet(self.__get_condition_interval(pi))
+
+        # plain definition, evaluate the statement of the defining node
+        node = self.cfg.cfg_metadata.get_node(value.def_node)
+        return self.__evaluate_definition(node, value.def_node, value.variable)
+
+    def __evaluate_definition(self, node: Node, node_id: str, variable: str) -> Interval:
+        '''
+        Evaluate the interval assigned to a variable by a statement node
+        '''
+
+        if node.node_type == 'VariableDeclarationStatement':
+            # uninitialized variables are zero in solidity
+            if node.initialValue is None:
+                return Interval(0, 0)
+            return self.__evaluate_expression(node.initialValue, node_id)
+
+        if node.node_type == 'ExpressionStatement':
+            expression = node.expression
+
+            if expression.node_type == 'Assignment':
+                value = self.__evaluate_expression(
+                    expression.rightHandSide, node_id)
+
+                # compound assignment, i.e., a += b is a = a + b
+                if expression.operator != '=':
+                    current = self.__evaluate_expression(
+                        expression.leftHandSide, node_id)
+                    value = current.binary_operation(
+                        value, expression.operator[:-1])
+
+                return value
+
+            if expression.node_type == 'UnaryOperation' and expression.operator in ('++', '--'):
+                current = self.__evaluate_expression(
+                    expression.subExpression, node_id)
+                return current.binary_operation(Interval(1, 1), expression.operator[0])
+
+        # statements not modelled by the analysis assign an unknown value
+        return Interval.top()
+
+    def __evaluate_expression(self, node: Node, node_id: str) -> Interval:
+        '''
+        Recursively evaluate an expression, with the values read by the node
+        '''
+
+        if node.node_type == 'Literal':
+            try:
+                value = int(node.value)
+            except (TypeError, ValueError):
+                return Interval.top()
+            return Interval(value, value)
+
+        if node.node_type == 'Identifier':
+            name = self.ssa.node_uses[node_id].get(node.name, None)
+            if name is None:
+                return self.__get_entry_interval(node.name)
+            return self.intervals[name]
+
+        if node.node_type == 'BinaryOperation':
+            left = self.__evaluate_expression(node.leftExpression, node_id)
+            right = self.__evaluate_expression(node.rightExpression, node_id)
+            return left.binary_operation(right, node.operator)
+
+        if node.node_type == 'UnaryOperation' and node.operator == '-':
+            operand = self.__evaluate_expression(node.subExpression, node_id)
+            return Interval(0, 0).binary_operation(operand, '-')
+
+        return Interval.top()
+
+    def __get_entry_interval(self, variable: str) -> Interval:
+        '''
+        Get the interval of a variable at the starting node,
+        i.e., the value of the constant if registered, else top
+        '''
+
+        if variable not in self.constant_registry.variable_table:
+            return Interval.top()
+
+        value = self.constant_registry.get_value(variable)
+
+        if isinstance(value, tuple) and len(value) == 2:
+            return Interval(int(value[0]), int(value[1]))
+        if value == 'top':
+            return Interval.top()
+        if isinstance(value, (int, str)):
+            return Interval(int(value), int(value))
+
+        raise Exception(
+            f'Illegal value for Constant {variable}! Value: {value}')
+
+    def __get_condition_interval(self, pi) -> Interval:
+        '''
+        Get the interval of the values satisfying the condition of a branch
+        (or its negation), for the variable renamed by a pi function
+        '''
+
+        condition = pi.condition
+        operator = condition.operator
+
+        # bring the variable to the left of the comparison
+        if condition.leftExpression.node_type == 'Identifier' and \
+                condition.leftExpression.name == pi.variable:
+            other = condition.rightExpression
+        else:
+            other = condition.leftExpression
+            operator = self.MIRRORED_OPERATORS[operator]
+
+        if not pi.outcome:
+            operator = self.NEGATED_OPERATORS[operator]
+
+        bound = self.__evaluate_expression(other, pi.branch_node)
+        if bound.is_bottom():
+            return Interval.bottom()
+
+        if operator == '<':
+            return Interval(-INF, bound.sup - 1)
+        if operator == '<=':
+            return Interval(-INF, bound.sup)
+        if operator == '>':
+            return Interval(bound.inf + 1, INF)
+        if operator == '>=':
+            return Interval(bound.inf, INF)
+        if operator == '==':
+            return bound
+
+        # the disequality only refines against a single value, which intervals cannot express
+        return Interval.top()
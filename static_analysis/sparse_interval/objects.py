@@ -0,0 +1,117 @@
+'''
+Auxiliary Objects Module for the Sparse Interval Analysis
+'''
+from typing import Union
+
+INF = float('inf')
+
+
+class Interval(object):
+    '''
+    Class representing an (immutable) interval of integers,
+    the bottom interval (empty set) has both the bounds as None
+    '''
+
+    __slots__ = ('inf', 'sup')
+
+    def __init__(self, inf: Union[int, float, None], sup: Union[int, float, None]):
+        '''
+        Constructor
+        '''
+
+        # normalize empty intervals to bottom
+        if inf is None or sup is None or inf > sup:
+            inf, sup = None, None
+
+        self.inf = inf
+        self.sup = sup
+
+    @staticmethod
+    def top() -> 'Interval':
+        return Interval(-INF, INF)
+
+    @staticmethod
+    def bottom() -> 'Interval':
+        return Interval(None, None)
+
+    def is_bottom(self) -> bool:
+        return self.inf is None
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Interval) and self.inf == other.inf and self.sup == other.sup
+
+    def __hash__(self) -> int:
+        return hash((self.inf, self.sup))
+
+    def __repr__(self) -> str:
+        if self.is_bottom():
+            return '[btm]'
+        return f'[{self.inf}, {self.sup}]'
+
+    def join(self, other: 'Interval') -> 'Interval':
+        '''
+        The least upper bound of two intervals
+        '''
+
+        if self.is_bottom():
+            return other
+        if other.is_bottom():
+            return self
+
+        return Interval(min(self.inf, other.inf), max(self.sup, other.sup))
+
+    def meet(self, other: 'Interval') -> 'Interval':
+        '''
+        The greatest lower bound of two intervals
+        '''
+
+        if self.is_bottom() or other.is_bottom():
+            return Interval.bottom()
+
+        return Interval(max(self.inf, other.inf), min(self.sup, other.sup))
+
+    def widen(self, other: 'Interval') -> 'Interval':
+        '''
+        The standard interval widening, pushing the unstable bounds to infinity
+        '''
+
+        if self.is_bottom():
+            return other
+        if other.is_bottom():
+            return self
+
+        inf = self.inf if other.inf >= self.inf else -INF
+        sup = self.sup if other.sup <= self.sup else INF
+
+        return Interval(inf, sup)
+
+    def binary_operation(self, other: 'Interval', operator: str) -> 'Interval':
+        '''
+        Compute the interval of an arithmetic binary operation
+        '''
+
+        if self.is_bottom() or other.is_bottom():
+            return Interval.bottom()
+
+        if operator == '+':
+            return Interval(self.inf + other.inf, self.sup + other.sup)
+        elif operator == '-':
+            return Interval(self.inf - other.sup, self.sup - other.inf)
+        elif operator == '*':
+            products = [_multiply(a, b) for a in (self.inf, self.sup)
+                        for b in (other.inf, other.sup)]
+            return Interval(min(products), max(products))
+        else:
+            # division, modulo, etc. are not tracked precisely (as of now)
+            return Interval.top()
+
+
+def _multiply(a: Union[int, float], b: Union[int, float]) -> Union[int, float]:
+    '''
+    Multiply two bounds, with 0 * inf = 0
+    '''
+
+    if a == 0 or b == 0:
+        return 0
+
+    return a * b
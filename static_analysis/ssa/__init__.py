@@ -0,0 +1,342 @@
+'''
+The Static Single Assignment (SSA) Form
+
+Builds the (pruned) SSA form over the CFG: phi functions are placed on the
+iterated dominance frontiers of the definitions (i.e., the If / While / For / DoWhile
+join nodes), pi functions rename the variables tested by a condition on the
+outgoing edges of the branch nodes, and the values are linked by def-use chains.
+'''
+from typing import Dict, List, Set, Union
+from collections import defaultdict
+from control_flow_graph import ControlFlowGraph
+from static_analysis.ssa.objects import SSAValue, PhiFunction, PiFunction
+from static_analysis.dataflow_analysis.live_variables import LiveVariablesAnalysis
+import static_analysis.dataflow_analysis.framework.builder as builder
+
+
+class SSAForm(object):
+    '''
+    Class defining the SSA form of the CFG between the starting and the ending nodes
+    '''
+
+    # the comparison operators, for which the branches get pi functions
+    COMPARISON_OPERATORS = ('<', '<=', '>', '>=', '==', '!=')
+
+    def __init__(self, cfg: ControlFlowGraph, starting_node: str, ending_node: str, pruned=True, refine_branches=True):
+        '''
+        Constructor
+        '''
+
+        self.cfg = cfg
+        self.starting_node = starting_node
+        self.ending_node = ending_node
+
+        # if pruned, the phi and pi functions are only placed where the variable is live
+        self.pruned = pruned
+
+        # if enabled, the pi functions are placed on the edges out of the branch nodes
+        self.refine_branches = refine_branches
+
+        # the nodes of the graph (in reverse post-order), and the dominator tree
+        self.nodes = list()
+        self.idom = dict()
+        self.dominator_children = dict()
+        self.frontiers = dict()
+        self.predecessors = dict()
+        self.successors = dict()
+
+        # mapping of the value name to the SSA value object
+        self.values = dict()
+
+        # mapping of the node id to its phi and pi functions (variable -> function)
+        self.phis = defaultdict(dict)
+        self.pis = defaultdict(dict)
+
+        # mapping of the node id to the values it reads and defines (variable -> value name)
+        self.node_uses = dict()
+        self.node_defs = dict()
+
+        # def-use chains: mapping of the value name to the nodes reading the value
+        self.def_use = defaultdict(set)
+
+        # the version counter of the variables
+        self.versions = defaultdict(int)
+
+    def build(self) -> None:
+        '''
+        Build the SSA form
+        '''
+
+        self.__compute_dominance()
+        definitions, variables = self.__compute_definitions()
+        live = self.__compute_live_variables(variables) if self.pruned else None
+
+        if self.refine_branches:
+            self.__place_pi_functions(definitions, variables, live)
+
+        self.__place_phi_functions(definitions, variables, live)
+        self.__rename(variables)
+
+    def get_value(self, name: str) -> SSAValue:
+        '''
+        Get the SSA value object from the value name
+        '''
+
+        return self.values[name]
+
+    def get_reaching_value(self, node_id: str, variable: str) -> Union[str, None]:
+        '''
+        Get the name of the value of the variable reaching the entry of a node
+        (after the phi and pi functions of the node)
+        '''
+
+        # the functions of the node itself are evaluated at its entry
+        if variable in self.pis[node_id]:
+            return self.pis[node_id][variable].target
+        if variable in self.phis[node_id]:
+            return self.phis[node_id][variable].target
+
+        # walk up the dominator tree till a definition of the variable is found
+        while node_id != self.starting_node:
+            node_id = self.idom[node_id]
+
+            if variable in self.node_defs[node_id]:
+                return self.node_defs[node_id][variable]
+            if variable in self.pis[node_id]:
+                return self.pis[node_id][variable].target
+            if variable in self.phis[node_id]:
+                return self.phis[node_id][variable].target
+
+        entry_name = f'{variable}_0'
+        return entry_name if entry_name in self.values else None
+
+    def get_dependencies(self, name: str) -> List[str]:
+        '''
+        Get the names of the values read by the definition of a value
+        '''
+
+        value = self.values[name]
+
+        if value.kind == 'phi':
+            return list(self.phis[value.def_node][value.variable].arguments.values())
+
+        if value.kind == 'pi':
+            pi = self.pis[value.def_node][value.variable]
+            return [pi.source] + list(self.node_uses[pi.branch_node].values())
+
+        if value.kind == 'def':
+            return list(self.node_uses[value.def_node].values())
+
+        return list()
+
+    def __compute_dominance(self) -> None:
+        '''
+        Obtain the dominator tree and the dominance frontiers from the (cached) CFG analysis
+        '''
+
+        analysis = self.cfg.get_analysis(self.starting_node, self.ending_node)
+
+        self.nodes = analysis.nodes
+        self.idom = analysis.idom
+        self.dominator_children = analysis.dominator_children
+        self.frontiers = analysis.frontiers
+        self.predecessors = analysis.predecessors
+        self.successors = analysis.successors
+
+    def __compute_definitions(self):
+        '''
+        Compute the definition sites of the variables
+        '''
+
+        metadata = self.cfg.cfg_metadata
+        definitions = defaultdict(set)
+        variables = set()
+
+        for node_id in self.nodes:
+            node = metadata.get_node(node_id)
+
+            for variable in builder.get_definitions(node):
+                definitions[variable].add(node_id)
+
+            variables.update(builder.get_definitions(node))
+            variables.update(builder.get_uses(node))
+
+        return definitions, variables
+
+    def __compute_live_variables(self, variables: Set[str]) -> Dict[str, Set[str]]:
+        '''
+        Compute the variables live at the entry of each node
+        (all the variables are considered observed after the ending node)
+        '''
+
+        liveness = LiveVariablesAnalysis(
+            self.cfg, self.starting_node, self.ending_node, variables)
+        liveness.compute()
+
+        return {node_id: liveness.get_entry(node_id) for node_id in liveness.nodes}
+
+    def __place_pi_functions(self, definitions: Dict[str, Set[str]], variables: Set[str],
+                             live: Union[Dict[str, Set[str]], None]) -> None:
+        '''
+        Place the pi functions on the successors of the branch nodes,
+        for the variables compared by the condition of the branch
+        '''
+
+        metadata = self.cfg.cfg_metadata
+
+        for node_id in self.nodes:
+            node = metadata.get_node(node_id)
+            condition = getattr(node, 'condition', None)
+
+            if condition is None or condition.node_type != 'BinaryOperation' \
+                    or condition.operator not in self.COMPARISON_OPERATORS:
+                continue
+
+            # the variables directly compared by the condition
+            compared = set(operand.name for operand in (condition.leftExpression, condition.rightExpression)
+                           if operand.node_type == 'Identifier' and operand.name in variables)
+
+            # obtain the successors on the true and false edges
+            for successor, outcome in self.__get_branch_successors(node):
+                # the pi function can only be placed if the edge is the only way into the successor
+                if successor is None or self.predecessors.get(successor, None) != [node_id]:
+                    continue
+
+                for variable in compared:
+                    if live is not None and variable not in live[successor]:
+                        continue
+
+                    self.pis[successor][variable] = PiFunction(
+                        variable, None, node_id, condition, outcome)
+                    definitions[variable].add(successor)
+
+    def __place_phi_functions(self, definitions: Dict[str, Set[str]], variables: Set[str],
+                              live: Union[Dict[str, Set[str]], None]) -> None:
+        '''
+        Place the phi functions on the iterated dominance frontiers of the definitions
+        '''
+
+        for variable in variables:
+            # the worklist of the definition sites of the variable
+            worklist = list(definitions[variable])
+            placed = set()
+
+            while len(worklist) != 0:
+                node_id = worklist.pop()
+
+                for frontier_id in self.frontiers[node_id]:
+                    if frontier_id in placed:
+                        continue
+                    placed.add(frontier_id)
+
+                    # pruned SSA: a phi function is only needed if the variable is live
+                    if live is not None and variable not in live[frontier_id]:
+                        continue
+
+                    self.phis[frontier_id][variable] = PhiFunction(
+                        variable, None)
+
+                    # the phi function is a new definition of the variable
+                    if frontier_id not in definitions[variable]:
+                        worklist.append(frontier_id)
+
+    def __rename(self, variables: Set[str]) -> None:
+        '''
+        Rename the variables, by traversing the dominator tree (iteratively)
+        '''
+
+        metadata = self.cfg.cfg_metadata
+        stacks = defaultdict(list)
+
+        # every variable has an entry value, defined at the starting node
+        for variable in variables:
+            stacks[variable].append(self.__new_value(
+                variable, self.starting_node, 'entry'))
+
+        # each stack frame holds the node id and whether the node is being entered
+        stack = [(self.starting_node, True)]
+        pushed = dict()
+
+        while len(stack) != 0:
+            node_id, entering = stack.pop()
+
+            # on the way out, pop the values defined by the node
+            if not entering:
+                for variable in pushed.pop(node_id):
+                    stacks[variable].pop()
+                continue
+
+            node = metadata.get_node(node_id)
+            pushed[node_id] = list()
+
+            # 1. the phi functions define new values at the entry of the node
+            for variable, phi in self.phis[node_id].items():
+                phi.target = self.__new_value(variable, node_id, 'phi')
+                stacks[variable].append(phi.target)
+                pushed[node_id].append(variable)
+
+            # 2. the pi functions rename the values incoming from the branch node
+            for variable, pi in self.pis[node_id].items():
+                pi.source = stacks[variable][-1]
+                pi.target = self.__new_value(variable, node_id, 'pi')
+                self.def_use[pi.source].add(node_id)
+                stacks[variable].append(pi.target)
+                pushed[node_id].append(variable)
+
+            # 3. the uses of the node read the current values
+            self.node_uses[node_id] = {variable: stacks[variable][-1]
+                                       for variable in builder.get_uses(node)}
+            for name in self.node_uses[node_id].values():
+                self.def_use[name].add(node_id)
+
+            # 4. the definitions of the node define new values
+            self.node_defs[node_id] = dict()
+            for variable in builder.get_definitions(node):
+                name = self.__new_value(variable, node_id, 'def')
+                self.node_defs[node_id][variable] = name
+                stacks[variable].append(name)
+                pushed[node_id].append(variable)
+
+            # 5. fill in the arguments of the phi functions of the successors
+            for child_id in self.successors[node_id]:
+                for variable, phi in self.phis[child_id].items():
+                    phi.arguments[node_id] = stacks[variable][-1]
+                    self.def_use[stacks[variable][-1]].add(child_id)
+
+            # visit the children in the dominator tree, and then leave the node
+            stack.append((node_id, False))
+            for child_id in reversed(self.dominator_children[node_id]):
+                stack.append((child_id, True))
+
+    def __new_value(self, variable: str, node_id: str, kind: str) -> str:
+        '''
+        Create a new value (version) of a variable
+        '''
+
+        version = self.versions[variable]
+        self.versions[variable] += 1
+
+        name = f'{variable}_{version}'
+        self.values[name] = SSAValue(name, variable, version, node_id, kind)
+
+        return name
+
+    @staticmethod
+    def __get_branch_successors(node) -> List[tuple]:
+        '''
+        Get the successors of a branch node on the true and false edges
+        '''
+
+        if node.node_type == 'IfStatement':
+            return [(getattr(node, 'true_body_next', None), True),
+                    (getattr(node, 'false_body_next', None), False)]
+
+        if node.node_type in ('WhileStatement', 'ForStatement'):
+            return [(getattr(node, 'body_next', None), True),
+                    (node.join_node, False)]
+
+        if node.node_type == 'DoWhileStatement':
+            return [(node.loop_entry_node, True),
+                    (node.join_node, False)]
+
+        return list()
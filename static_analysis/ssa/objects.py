@@ -0,0 +1,77 @@
+'''
+Auxiliary Objects Module for the SSA Form
+'''
+from control_flow_graph.node_processor import Node
+
+
+class SSAValue(object):
+    '''
+    Class representing a single static assignment of a variable
+    '''
+
+    def __init__(self, name: str, variable: str, version: int, def_node: str, kind: str):
+        '''
+        Constructor
+        '''
+
+        # the name of the value, of the form f'{variable}_{version}'
+        self.name = name
+        self.variable = variable
+        self.version = version
+
+        # the node defining the value
+        self.def_node = def_node
+
+        # the kind of the definition, one of 'entry', 'def', 'phi' or 'pi'
+        self.kind = kind
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+class PhiFunction(object):
+    '''
+    Class representing a phi function at a join node,
+    selecting the value of the variable depending on the incoming edge
+    '''
+
+    def __init__(self, variable: str, target: str):
+        '''
+        Constructor
+        '''
+
+        self.variable = variable
+        self.target = target
+
+        # mapping of the predecessor node id to the incoming value name
+        self.arguments = dict()
+
+    def __repr__(self) -> str:
+        arguments = ', '.join(
+            f'{prev_id}: {name}' for prev_id, name in self.arguments.items())
+        return f'{self.target} = phi({arguments})'
+
+
+class PiFunction(object):
+    '''
+    Class representing a pi function (e-SSA) on the edge out of a branch node,
+    renaming the variable tested by the condition so that the value can be
+    refined by the outcome of the condition along that edge
+    '''
+
+    def __init__(self, variable: str, target: str, branch_node: str, condition: Node, outcome: bool):
+        '''
+        Constructor
+        '''
+
+        self.variable = variable
+        self.target = target
+        self.source = None
+
+        # the branch node, its condition and the outcome of the condition along the edge
+        self.branch_node = branch_node
+        self.condition = condition
+        self.outcome = outcome
+
+    def __repr__(self) -> str:
+        return f'{self.target} = pi({self.source}, {self.outcome})'
@@ -0,0 +1,170 @@
+'''
+The Storage Module
+
+Persists the built CFGs and the final analysis results, so that a later run
+on the same source can reload them instead of compiling, building and computing
+the fixed point again. The entries are content-addressed, keyed by the hash of
+the AST (and of the analysis configuration, for the results), and serialized
+as zlib compressed pickles, in a directory or a SQLite file. The incremental CFG
+builder of a source is stored under the id of the source, so that its next version
+only rebuilds and re-analyses the changed functions.
+'''
+import json
+import zlib
+import pickle
+import hashlib
+from typing import Any, Union
+from control_flow_graph import ControlFlowGraph
+from storage.objects import DirectoryBackend, SQLiteBackend
+
+# the version of the serialization format, part of every key,
+# so that the entries of an older format are never read back
+FORMAT_VERSION = 1
+
+
+def get_ast_hash(ast: dict) -> str:
+    '''
+    Get the hash of the complete AST (source locations included,
+    as they are part of the CFG nodes)
+    '''
+
+    canonical = json.dumps(ast, sort_keys=True, separators=(',', ':'))
+
+    return hashlib.sha256(canonical.encode('utf8')).hexdigest()
+
+
+def serialize(payload: Any) -> bytes:
+    '''
+    Serialize a payload as a compressed pickle
+    '''
+
+    # favour speed over the compression ratio, the pickles are already compact
+    return zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+
+def deserialize(data: bytes) -> Any:
+    '''
+    Deserialize a payload from a compressed pickle
+    '''
+
+    return pickle.loads(zlib.decompress(data))
+
+
+class ResultStore(object):
+    '''
+    Class defining the persistent store of the CFGs and the analysis results
+    '''
+
+    def __init__(self, path: str, backend='directory'):
+        '''
+        Constructor
+        '''
+
+        if backend == 'directory':
+            self.backend = DirectoryBackend(path)
+        elif backend == 'sqlite':
+            self.backend = SQLiteBackend(path)
+        else:
+            raise Exception(f'Unknown storage backend {backend}!')
+
+    @staticmethod
+    def get_key(kind: str, ast_hash: str, config: dict = None) -> str:
+        '''
+        Get the content address of an entry, from its kind ('cfg' or an analysis name),
+        the hash of the AST and the configuration it was computed with
+        '''
+
+        config_str = json.dumps(config or dict(), sort_keys=True, default=str)
+        key_str = f'{FORMAT_VERSION}|{kind}|{ast_hash}|{config_str}'
+
+        return hashlib.sha256(key_str.encode('utf8')).hexdigest()
+
+    def save_cfg(self, cfg: ControlFlowGraph) -> str:
+        '''
+        Store a built CFG (the node table with the edges and the node attributes,
+        along with the built functions and the cached CFG analyses), and return its key
+        '''
+
+        key = self.get_key('cfg', get_ast_hash(cfg.ast))
+
+        payload = {
+            'source': cfg.source_code,
+            'ast': cfg.ast,
+            'cfg_metadata': cfg.cfg_metadata,
+            'entry_node': cfg.entry_node.cfg_id,
+            'exit_node': cfg.exit_node.cfg_id,
+            'function_cfgs': cfg.function_cfgs,
+            'analyses': cfg.analyses
+        }
+        self.backend.put(key, serialize(payload))
+
+        return key
+
+    def load_cfg(self, ast: dict) -> Union[ControlFlowGraph, None]:
+        '''
+        Load the CFG stored for an AST, if any
+        '''
+
+        data = self.backend.get(self.get_key('cfg', get_ast_hash(ast)))
+        if data is None:
+            return None
+
+        payload = deserialize(data)
+
+        # restore the graph over the stored node table
+        cfg = ControlFlowGraph(payload['source'], payload['ast'])
+        cfg.cfg_metadata = payload['cfg_metadata']
+        cfg.entry_node = cfg.cfg_metadata.get_node(payload['entry_node'])
+        cfg.exit_node = cfg.cfg_metadata.get_node(payload['exit_node'])
+        cfg.function_cfgs = payload['function_cfgs']
+        cfg.analyses = payload['analyses']
+
+        return cfg
+
+    def save_results(self, ast: dict, analysis: str, config: dict, results: Any) -> str:
+        '''
+        Store the (exported) results of an analysis, and return the key
+        '''
+
+        key = self.get_key(analysis, get_ast_hash(ast), config)
+        self.backend.put(key, serialize(results))
+
+        return key
+
+    def load_results(self, ast: dict, analysis: str, config: dict) -> Any:
+        '''
+        Load the results of an analysis stored for an AST and configuration, if any
+        '''
+
+        data = self.backend.get(self.get_key(
+            analysis, get_ast_hash(ast), config))
+
+        return None if data is None else deserialize(data)
+
+    def save_builder(self, source_id: str, builder: Any) -> str:
+        '''
+        Store the incremental CFG builder of a source (see control_flow_graph.functions.incremental),
+        holding the CFG and the function results of its latest version, and return the key
+        '''
+
+        # (keyed by the id of the source instead of its AST, as the next version has another AST)
+        key = self.get_key('builder', source_id)
+        self.backend.put(key, serialize(builder))
+
+        return key
+
+    def load_builder(self, source_id: str) -> Any:
+        '''
+        Load the incremental CFG builder stored for a source, if any
+        '''
+
+        data = self.backend.get(self.get_key('builder', source_id))
+
+        return None if data is None else deserialize(data)
+
+    def close(self) -> None:
+        '''
+        Close the storage backend
+        '''
+
+        self.backend.close()
@@ -0,0 +1,123 @@
+'''
+Auxiliary Objects Module for the Storage (the storage backends, and the atomic writes)
+'''
+import os
+import sqlite3
+import tempfile
+from typing import Union
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    '''
+    Write a binary file through a temporary file (in the same directory) and a rename,
+    so that the readers never see a partial file, even if the writer is killed while writing
+    '''
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class DirectoryBackend(object):
+    '''
+    Content-addressed directory backend, storing every blob as
+    a file at f'{path}/{key[:2]}/{key[2:]}'
+    '''
+
+    def __init__(self, path: str):
+        '''
+        Constructor
+        '''
+
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def get(self, key: str) -> Union[bytes, None]:
+        '''
+        Get the blob of a key, if stored
+        '''
+
+        try:
+            with open(self.__get_path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        '''
+        Store the blob of a key
+        '''
+
+        blob_path = self.__get_path(key)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+
+        write_atomic(blob_path, data)
+
+    def delete(self, key: str) -> None:
+        '''
+        Delete the blob of a key, if stored
+        '''
+
+        try:
+            os.remove(self.__get_path(key))
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        pass
+
+    def __get_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key[2:])
+
+
+class SQLiteBackend(object):
+    '''
+    SQLite backend, storing the blobs in a single table of a database file
+    '''
+
+    def __init__(self, path: str):
+        '''
+        Constructor
+        '''
+
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS blobs (key TEXT PRIMARY KEY, data BLOB NOT NULL)')
+        self.connection.commit()
+
+    def get(self, key: str) -> Union[bytes, None]:
+        '''
+        Get the blob of a key, if stored
+        '''
+
+        row = self.connection.execute(
+            'SELECT data FROM blobs WHERE key = ?', (key,)).fetchone()
+
+        return None if row is None else bytes(row[0])
+
+    def put(self, key: str, data: bytes) -> None:
+        '''
+        Store the blob of a key
+        '''
+
+        self.connection.execute(
+            'INSERT OR REPLACE INTO blobs (key, data) VALUES (?, ?)', (key, sqlite3.Binary(data)))
+        self.connection.commit()
+
+    def delete(self, key: str) -> None:
+        '''
+        Delete the blob of a key, if stored
+        '''
+
+        self.connection.execute('DELETE FROM blobs WHERE key = ?', (key,))
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
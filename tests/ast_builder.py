@@ -0,0 +1,58 @@
+'''
+Builders of the (solc compact JSON) ASTs of small Solidity programs,
+to construct the CFGs of the tests without the compiler
+'''
+from itertools import count
+from typing import Any, Dict, List
+
+# the ids of the AST nodes
+_ids = count(1)
+
+AST = Dict[str, Any]
+
+
+def node(node_type: str, **fields) -> AST:
+    return dict(nodeType=node_type, id=next(_ids), src='0:0:0', **fields)
+
+
+def ident(name: str) -> AST:
+    return node('Identifier', name=name)
+
+
+def lit(value: Any) -> AST:
+    return node('Literal', value=str(value))
+
+
+def binop(left: AST, operator: str, right: AST) -> AST:
+    return node('BinaryOperation', operator=operator, leftExpression=left, rightExpression=right)
+
+
+def assign(name: str, value: AST) -> AST:
+    return node('ExpressionStatement', expression=node(
+        'Assignment', operator='=', leftHandSide=ident(name), rightHandSide=value))
+
+
+def decl(name: str, value: AST) -> AST:
+    return node('VariableDeclarationStatement', declarations=[node('VariableDeclaration', name=name)],
+                initialValue=value)
+
+
+def while_(condition: AST, body: List[AST]) -> AST:
+    return node('WhileStatement', condition=condition, body={'statements': body})
+
+
+def if_(condition: AST, true_body: List[AST], false_body: List[AST] = None) -> AST:
+    return node('IfStatement', condition=condition, trueBody={'statements': true_body},
+                falseBody={'statements': false_body} if false_body else None)
+
+
+def func(name: str, statements: List[AST]) -> AST:
+    return node('FunctionDefinition', name=name, body={'statements': statements}, parameters={})
+
+
+def contract(name: str, functions: List[AST]) -> AST:
+    return node('ContractDefinition', name=name, nodes=functions)
+
+
+def unit(contracts: List[AST]) -> AST:
+    return node('SourceUnit', nodes=contracts)
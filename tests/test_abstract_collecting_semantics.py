@@ -0,0 +1,70 @@
+'''
+Tests of the Abstract Collecting Semantics
+'''
+import contextlib
+import io
+import pytest
+from tests.ast_builder import assign, binop, contract, decl, func, ident, lit, unit, while_
+
+from control_flow_graph import ControlFlowGraph
+from instrumentation.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def require_apron():
+    # (the engine and the APRON classes are loaded here, so that the tests are skipped,
+    # rather than failing to be collected, without jpype, a JVM or the APRON jars)
+    pytest.importorskip('jpype')
+
+    try:
+        from java_wrapper import apron
+        apron.Box
+    except Exception as e:
+        pytest.skip(f'APRON not available: {e}')
+
+
+def analyse_counter_loop(**kwargs) -> dict:
+    '''
+    Analyse 'i = 0; while (i < 10) { i = i + 1; } j = i;',
+    and get the entry states of the nodes by their type
+    '''
+
+    ast = unit([contract('c', [func('run', [
+        decl('i', lit(0)),
+        while_(binop(ident('i'), '<', lit(10)), [assign('i', binop(ident('i'), '+', lit(1)))]),
+        decl('j', ident('i'))])])])
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        cfg = ControlFlowGraph('', ast)
+        starting_node, ending_node = cfg.get_function_entry(list(cfg.index_functions().keys())[0])
+
+    from static_analysis.abstract_collecting_semantics import AbstractCollectingSemanticsAnalysis
+
+    analysis = AbstractCollectingSemanticsAnalysis(
+        cfg, starting_node, ending_node, None, widening_delay=1, **kwargs)
+    analysis.compute()
+
+    results = analysis.point_state.export_results()
+    return {cfg.cfg_metadata.get_node(node_id).node_type: states['entry']
+            for node_id, states in results['nodes'].items()}
+
+
+def test_unchanged_nodes_skipped():
+    metrics.reset()
+    analyse_counter_loop()
+
+    # the entry states of the same exit states of the previous nodes are reused,
+    # and the transfer functions of the nodes whose entry state did not change are skipped
+    assert metrics.get_counter('abstract.change_checks', result='inputs') > 0
+    assert metrics.get_counter('abstract.skipped', node_type='ExpressionStatement') > 0
+
+
+def test_narrowing_tightens_widened_head():
+    widened = analyse_counter_loop(narrowing_rounds=0)
+    narrowed = analyse_counter_loop()
+
+    # (the state of i, then j)
+    assert widened['WhileStatement'][0] == (0, float('inf'))
+    assert narrowed['WhileStatement'][0] == (0, 10)
+    assert narrowed['ExpressionStatement'][0] == (0, 9)
+    assert narrowed['FunctionExit'] == [(10, 10), (10, 10)]
@@ -0,0 +1,47 @@
+'''
+Tests of the Incremental CFG Builder, over the successive versions of a source analysed with a store
+'''
+import cli
+from storage import ResultStore
+from tests.ast_builder import assign, binop, contract, decl, func, ident, lit, unit, while_
+
+
+def get_task(value: int) -> dict:
+    '''
+    Get a compiled task of a contract with two functions, the second one declaring the value
+    '''
+
+    ast = unit([contract('c', [
+        func('run', [decl('a', lit(0)),
+                     while_(binop(ident('a'), '<', lit(3)), [assign('a', binop(ident('a'), '+', lit(1)))])]),
+        func('g', [decl('x', lit(value))])])])
+
+    return {'id': 'source', 'source': '', 'ast': ast}
+
+
+def test_only_the_changed_function_is_rebuilt(tmp_path, monkeypatch):
+    analysed = []
+    run_sparse_interval = cli.ANALYSES['sparse_interval']
+
+    def run_counted(cfg, starting_node, ending_node, options):
+        analysed.append(starting_node)
+        return run_sparse_interval(cfg, starting_node, ending_node, options)
+
+    monkeypatch.setitem(cli.ANALYSES, 'sparse_interval', run_counted)
+    options = {'store': str(tmp_path)}
+
+    first = cli.analyze_source(get_task(1), ['sparse_interval'], options)
+    second = cli.analyze_source(get_task(2), ['sparse_interval'], options)
+
+    store = ResultStore(str(tmp_path))
+    builder = store.load_builder('source')
+    store.close()
+
+    assert builder.get_changed_functions() == ['c.g']
+    assert builder.reused_functions == ['c.run']
+
+    # the unchanged function is not analysed again, and keeps its results
+    assert analysed == ['c.run:FunctionEntry_0', 'c.g:FunctionEntry_0', 'c.g:FunctionEntry_0']
+    assert [result['status'] for result in first + second] == ['ok'] * 4
+    assert second[0]['analyses'] == first[0]['analyses']
+    assert second[1]['analyses']['sparse_interval']['c.g:FunctionExit_0'] == {'x': [2, 2]}
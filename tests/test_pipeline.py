@@ -0,0 +1,40 @@
+'''
+Tests of the Analysis Pipeline
+'''
+from pipeline import AnalysisPipeline
+from tests.ast_builder import assign, binop, contract, decl, func, ident, lit, unit, while_
+
+
+def get_task(task_id: str) -> dict:
+    '''
+    Get a compiled task (see cli.collect_project) of a contract with two functions
+    '''
+
+    ast = unit([contract('c', [
+        func('run', [decl('a', lit(0)),
+                     while_(binop(ident('a'), '<', lit(3)), [assign('a', binop(ident('a'), '+', lit(1)))])]),
+        func('g', [decl('x', lit(1))])])])
+
+    return {'id': task_id, 'source': '', 'ast': ast}
+
+
+def run_pipeline(tasks: list, **kwargs) -> list:
+    results = []
+    AnalysisPipeline(['sparse_interval'], compile_concurrency=2, processes=2, **kwargs).run_sync(
+        tasks, results.extend)
+
+    return results
+
+
+def test_failing_sources_do_not_stop_the_others():
+    # an AST the CFG cannot be built from, and a task which cannot be sent to the analysis processes
+    malformed = {'id': 'malformed', 'source': '', 'ast': {'nodeType': 'SourceUnit', 'nodes': 5}}
+    unpicklable = dict(get_task('unpicklable'), callback=lambda: None)
+
+    results = run_pipeline([get_task('first'), malformed, unpicklable, get_task('last')], ordered=True)
+
+    assert [(result['id'], result['function'], result['status']) for result in results] == [
+        ('first', 'c.run', 'ok'), ('first', 'c.g', 'ok'),
+        ('malformed', None, 'error'),
+        ('unpicklable', None, 'error'),
+        ('last', 'c.run', 'ok'), ('last', 'c.g', 'ok')]